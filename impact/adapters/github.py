@@ -1,11 +1,22 @@
 import json
 import logging
+from collections import defaultdict
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Set
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+
+from pydantic import ValidationError
 
 from impact.adapters.base import ProviderAdapter
+from impact.domain.columnar import ColumnarBundle
+from impact.domain.identity import IdentityTable
 from impact.exceptions import DataValidationError, ManifestError, ParseError
+from impact.persistence.codec import loads, parse_timestamp
+from impact.persistence.compression import check_compression, dump_path as canonical_path, open_text
+from impact.persistence.filesystem import CANONICAL_FILES
+from impact.persistence.index import RECORD_FIELDS, epoch_seconds, load_index, read_spans
 
 log = logging.getLogger(__name__)
 from impact.domain.models import (
@@ -22,9 +33,208 @@ from impact.domain.models import (
     TimelineEvent,
     Branch,
     User,
-    UserType,
 )
 
+# Parallel parse: plain files are split into line-aligned chunks of about this size.
+PARALLEL_CHUNK_BYTES = 8 * 1024 * 1024
+# Top-level fields build_bundle reads from each kind of record; workers send back only these.
+COMPACT_FIELDS = {
+    "reviews.jsonl": ("id", "user", "body", "state", "submitted_at", "pull_request_url"),
+    "review_comments.jsonl": (
+        "id", "user", "body", "created_at", "updated_at", "pull_request_review_id",
+        "in_reply_to_id", "path", "position", "pull_request_url",
+    ),
+    "issue_comments.jsonl": ("id", "user", "body", "created_at", "updated_at", "issue_url"),
+    "commits.jsonl": ("sha", "author", "committer", "commit", "pull_request_number", "idx"),
+    "timeline.jsonl": (
+        "id", "node_id", "url", "event", "actor", "user", "created_at", "submitted_at", "commit_id",
+        "commit_url", "comment_id", "state", "html_url", "pull_request_number",
+    ),
+    "files.jsonl": ("sha", "filename", "additions", "deletions", "changes", "status", "pull_request_number"),
+}
+
+
+def _chunk_spans(path: Path, chunk_bytes: int) -> List[Tuple[int, int]]:
+    """(offset, end) byte ranges of about `chunk_bytes` covering the file, each ending on a line break."""
+    size = path.stat().st_size
+    spans = []
+    offset = 0
+    with path.open("rb") as f:
+        while offset < size:
+            f.seek(min(offset + chunk_bytes, size))
+            f.readline()
+            end = f.tell()
+            spans.append((offset, end))
+            offset = end
+    return spans
+
+
+def _decode_chunk(
+    path: str,
+    fname: str,
+    compression: Optional[str],
+    span: Optional[Tuple[int, int]],
+    pr_numbers: FrozenSet[int],
+    start: float,
+    end: float,
+    decoder: Callable[[str], Dict] = loads,
+) -> List[Dict]:
+    """
+    Worker: decode one chunk (or, for compressed files, all) of canonical file `fname`
+    with `decoder`, drop records build_bundle would drop for their PR or timestamp, and
+    compact the rest. Records whose timestamp is missing are passed on for build_bundle
+    to judge.
+    """
+    if span is None:
+        with open_text(Path(path), "r", compression) as f:
+            lines = list(f)
+    else:
+        with open(path, "rb") as f:
+            f.seek(span[0])
+            # Split as bytes: str.splitlines() would also break on U+2028 inside values.
+            lines = [line.decode("utf-8") for line in f.read(span[1] - span[0]).splitlines()]
+    fields = RECORD_FIELDS[fname]
+    keep = COMPACT_FIELDS[fname]
+    out = []
+    for line in lines:
+        item = decoder(line)
+        number, ts, _ = fields(item)
+        if number not in pr_numbers:
+            continue
+        ts = epoch_seconds(ts)
+        if ts is not None and not (start <= ts <= end):
+            continue
+        compact = {k: item[k] for k in keep if k in item}
+        if fname == "commits.jsonl":
+            meta = item.get("commit") or {}
+            compact["commit"] = {"author": meta.get("author"), "message": meta.get("message")}
+        out.append(compact)
+    return out
+
+
+# Trusted dumps: one record in this many is still built with full validation.
+TRUSTED_SAMPLE_EVERY = 100
+
+
+class RecordFactory:
+    """
+    Builds domain records. Normally every record goes through pydantic validation; for
+    trusted dumps (written by our own dump writers) records are assembled with
+    `model_construct`, and every `sample_every`-th one per model is validated as a
+    spot check. The adapter hands over correctly typed values (enums, datetimes) in
+    both modes, so the two produce the same records.
+    """
+
+    def __init__(self, trusted: bool = False, sample_every: int = TRUSTED_SAMPLE_EVERY):
+        self.trusted = trusted
+        self.sample_every = sample_every
+        self.counts: Dict[type, int] = {}
+        self.sampled = 0
+
+    def __call__(self, model: type, **fields):
+        if not self.trusted:
+            return model(**fields)
+        seen = self.counts.get(model, 0)
+        self.counts[model] = seen + 1
+        if self.sample_every and seen % self.sample_every == 0:
+            self.sampled += 1
+            try:
+                return model(**fields)
+            except ValidationError as e:
+                raise DataValidationError(
+                    f"Trusted dump failed spot validation of {model.__name__}: {e}", field=model.__name__
+                ) from e
+        return model.model_construct(**fields)
+
+
+@dataclass
+class ParsedDump:
+    """
+    A dump parsed once for several users: the records of every PR any of them kept,
+    plus, per login, the in-window PRs that user authored or acted on. view() cuts
+    out one user's bundle without decoding or validating anything again.
+    """
+
+    users: Dict[int, User]
+    repositories: Dict[int, Repository]
+    pull_requests: List[PullRequest]
+    commits: List[Commit]
+    reviews: List[ReviewRecord]
+    comments: List[CommentRecord]
+    files: List[FileRecord]
+    timeline: List[TimelineEvent]
+    acted: Dict[str, Set[int]]
+    trusted: bool = False
+
+    def logins(self) -> List[str]:
+        """Logins that kept at least one PR, sorted."""
+        return sorted(self.acted)
+
+    def kept_prs(self, login: str) -> Set[int]:
+        return set(self.acted.get(login, ()))
+
+    def _records(self, login: str) -> Dict[str, list]:
+        """The record lists of `login`'s view, as CanonicalBundle fields."""
+        kept = self.acted.get(login, set())
+        prs = [pr for pr in self.pull_requests if pr.number in kept]
+        commits = [c for c in self.commits if c.pull_request_number in kept]
+        reviews = [r for r in self.reviews if r.pull_request_number in kept]
+        comments = [c for c in self.comments if c.pull_request_number in kept]
+        files = [f for f in self.files if f.pull_request_number in kept]
+        timeline = [t for t in self.timeline if t.pull_request_number in kept]
+
+        # Users and repositories in the order build_base first meets them for this user alone.
+        referenced: Dict[int, User] = {}
+        for review in reviews:
+            referenced.setdefault(review.user.id, review.user)
+        for commit in commits:
+            referenced.setdefault(commit.author.id, commit.author)
+            referenced.setdefault(commit.committer.id, commit.committer)
+        for comment in comments:
+            referenced.setdefault(comment.user.id, comment.user)
+        for event in timeline:
+            referenced.setdefault(event.actor.id, event.actor)
+        repositories: Dict[int, Repository] = {}
+        for pr in prs:
+            for user in (pr.repository.owner, pr.base.user, pr.head.user, pr.merged_by, pr.user):
+                if user is not None:
+                    referenced.setdefault(user.id, user)
+            repositories.setdefault(pr.repository.id, pr.repository)
+
+        return dict(
+            users=list(referenced.values()),
+            repositories=list(repositories.values()),
+            pull_requests=prs,
+            commits=commits,
+            reviews=reviews,
+            comments=comments,
+            files=files,
+            timeline=timeline,
+        )
+
+    def view(self, login: str) -> CanonicalBundle:
+        """The bundle a single-user parse for `login` would produce, sharing this dump's records."""
+        # Records are already models; trusted dumps skip re-validating every list.
+        return (CanonicalBundle.model_construct if self.trusted else CanonicalBundle)(**self._records(login))
+
+    def columnar(self, login: Optional[str] = None) -> ColumnarBundle:
+        """
+        `login`'s view (None = every kept record) as a ColumnarBundle, for vectorized
+        queries and compact storage; metrics run on view(). Needs NumPy.
+        """
+        if login is not None:
+            return ColumnarBundle.from_records(**self._records(login))
+        return ColumnarBundle.from_records(
+            users=self.users.values(),
+            repositories=self.repositories.values(),
+            pull_requests=self.pull_requests,
+            commits=self.commits,
+            reviews=self.reviews,
+            comments=self.comments,
+            files=self.files,
+            timeline=self.timeline,
+        )
+
 
 class GitHubAdapter(ProviderAdapter):
     """
@@ -35,25 +245,246 @@ class GitHubAdapter(ProviderAdapter):
         commit, timeline event) on the PR.
     This trims noisy data (e.g., PRs where the user was merely assigned or
     requested as reviewer but never acted).
-    """
 
-    def parse_dump(self, dump_path: str) -> CanonicalBundle:
-        path = Path(dump_path)
+    When every canonical file has a valid sidecar index (plain JSONL dumps from
+    the live fetcher), the kept PRs are worked out from the indexes first and
+    only their lines are read and decoded.
+
+    Dumps whose manifest says "trusted" (the live fetcher's), or any dump when
+    `trusted=True`, skip per-record validation apart from sampled spot checks; see
+    RecordFactory. `trusted=False` forces full validation.
 
-        # Manifest drives user + date window
+    Without indexes, `streaming=True` makes a light first pass that keeps only each
+    PR's byte spans and whether the user acted on it, then decodes only the kept
+    PRs, so memory follows the kept set rather than the dump. Otherwise
+    `workers` > 1 parses in parallel: once the PR file has been read, the other
+    files are decoded and pre-filtered by a process pool in chunks, and the chunks
+    are consumed in file order, so the result is the same as a sequential parse.
+
+    parse_dump_for_users() parses a dump once for many users and returns a
+    ParsedDump whose view(login) is that user's bundle; subclasses for other
+    stores override parse_base().
+
+    A bundle's `users` are the users its kept records reference, in order of first reference.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        chunk_bytes: int = PARALLEL_CHUNK_BYTES,
+        decoder: Optional[Callable[[str], Dict]] = None,
+        trusted: Optional[bool] = None,
+        streaming: bool = False,
+    ):
+        self.workers = workers
+        self.trusted = trusted
+        self.streaming = streaming
+        self.chunk_bytes = chunk_bytes
+        # Line decoder; defaults to orjson when installed (see impact.persistence.codec).
+        # Parallel parses send it to the workers, so it must be picklable.
+        self.decoder = decoder or loads
+
+    @staticmethod
+    def _load_indexes(canonical: Path) -> Optional[Dict[str, List[Dict]]]:
+        indexes = {}
+        for fname in CANONICAL_FILES.values():
+            data_path = canonical / fname
+            if not data_path.exists():
+                continue
+            blocks = load_index(data_path)
+            if blocks is None:
+                return None
+            indexes[fname] = blocks
+        return indexes
+
+    @staticmethod
+    def _kept_from_indexes(indexes: Dict[str, List[Dict]], logins: Set[str], start: float, end: float) -> Set[int]:
+        """
+        PR numbers any of `logins` authored or acted on inside the window, per the indexes.
+        The pull_requests index records the author at created_at, so authored PRs come along.
+        """
+        kept: Set[int] = set()
+        for blocks in indexes.values():
+            for block in blocks:
+                if block["pr"] in kept:
+                    continue
+                if any(
+                    ts is not None and start <= ts <= end
+                    for login in logins
+                    for ts in block["acts"].get(login, ())
+                ):
+                    kept.add(block["pr"])
+        return kept
+
+    def _scan(
+        self, canonical: Path, compression: Optional[str], logins: Set[str], start: float, end: float
+    ) -> Tuple[Set[int], Optional[Dict[str, List[Tuple[int, int, int]]]]]:
+        """
+        Streaming first pass: decode each line just long enough to note its PR, its byte
+        span and whether one of `logins` acted in the window, keeping nothing else. Returns the
+        kept PR numbers and, for plain dumps, every file's (PR, offset, length) runs.
+        """
+        decode = self.decoder
+        kept: Set[int] = set()
+        spans: Dict[str, List[Tuple[int, int, int]]] = {}
+        for fname, fields in RECORD_FIELDS.items():
+            file = canonical_path(canonical, fname, compression)
+            if not file.exists():
+                continue
+            runs: List[List[int]] = []
+            offset = 0
+            with (file.open("rb") if compression is None else open_text(file, "r", compression)) as f:
+                for line in f:
+                    # Plain files are read as bytes to count offsets; the decoder always gets str.
+                    number, ts, login = fields(decode(line.decode("utf-8") if compression is None else line))
+                    if compression is None:
+                        if runs and runs[-1][0] == number:
+                            runs[-1][2] += len(line)
+                        else:
+                            runs.append([number, offset, len(line)])
+                        offset += len(line)
+                    if login in logins and number not in kept:
+                        ts = epoch_seconds(ts)
+                        if ts is not None and start <= ts <= end:
+                            kept.add(number)
+            spans[fname] = [tuple(run) for run in runs]
+        return kept, spans if compression is None else None
+
+    @staticmethod
+    def read_manifest(path: Path) -> Dict:
+        """The dump's manifest, which drives the user and date window."""
         manifest_path = path / "dump_manifest.json"
         if not manifest_path.exists():
             raise ManifestError(f"Manifest file not found: {manifest_path}", path=str(manifest_path))
         try:
-            manifest = json.loads(manifest_path.read_text())
+            return json.loads(manifest_path.read_text())
         except json.JSONDecodeError as e:
             raise ManifestError(f"Invalid JSON in manifest: {e}", path=str(manifest_path)) from e
+
+    def is_trusted(self, manifest: Dict) -> bool:
+        return self.trusted if self.trusted is not None else bool(manifest.get("trusted", False))
+
+    def parse_dump(self, dump_path: str) -> CanonicalBundle:
+        path = Path(dump_path)
+        manifest = self.read_manifest(path)
         user_login: str = manifest["user"]
-        start_dt = datetime.fromisoformat(manifest["from"].replace("Z", "+00:00"))
-        end_dt = datetime.fromisoformat(manifest["to"].replace("Z", "+00:00"))
+        return self.parse_base(path, manifest, {user_login}).view(user_login)
 
-        users: Dict[int, User] = {}
-        repos: Dict[int, Repository] = {}
+    def parse_dump_for_users(self, dump_path: str, logins: Optional[Iterable[str]] = None) -> ParsedDump:
+        """
+        Parse the dump once for many users (None = everyone who acted in the window);
+        `.view(login)` of the result equals parse_dump() of the dump with that user.
+        """
+        path = Path(dump_path)
+        return self.parse_base(path, self.read_manifest(path), set(logins) if logins is not None else None)
+
+    def parse_base(self, path: Path, manifest: Dict, logins: Optional[Set[str]]) -> ParsedDump:
+        """Decode and build the dump's records once for `logins`, over the manifest's window."""
+        trusted = self.is_trusted(manifest)
+        start_dt = parse_timestamp(manifest["from"])
+        end_dt = parse_timestamp(manifest["to"])
+        # Canonical files may be gzip/zstd compressed; they are decompressed as a stream.
+        compression = manifest.get("compression")
+        try:
+            check_compression(compression)
+        except ValueError as e:
+            raise ManifestError(str(e), path=str(path / "dump_manifest.json")) from e
+        canonical = path / "canonical"
+        start, end = start_dt.timestamp(), end_dt.timestamp()
+        decode = self.decoder
+        # PR number -> its (offset, length) byte spans, per file; known for plain dumps
+        # with sidecar indexes, or after a streaming first pass over a plain dump.
+        spans: Optional[Dict[str, List[Tuple[int, int, int]]]] = None
+        kept_numbers: Optional[Set[int]] = None
+        # Without a set of logins every acted-on PR is kept, so nothing can be skipped.
+        indexes = self._load_indexes(canonical) if compression is None and logins is not None else None
+        if indexes is not None:
+            kept_numbers = self._kept_from_indexes(indexes, logins, start, end)
+            spans = {fname: [(b["pr"], b["offset"], b["length"]) for b in blocks] for fname, blocks in indexes.items()}
+        elif self.streaming and logins is not None:
+            kept_numbers, spans = self._scan(canonical, compression, logins, start, end)
+
+        def records(fname: str) -> Iterator[Dict]:
+            file = canonical_path(canonical, fname, compression)
+            if not file.exists():
+                return
+            if kept_numbers is None:
+                with open_text(file, "r", compression) as f:
+                    for line in f:
+                        yield decode(line)
+            elif spans is not None:
+                for line in read_spans(file, [(o, n) for pr, o, n in spans.get(fname, ()) if pr in kept_numbers]):
+                    yield decode(line)
+            else:
+                fields = RECORD_FIELDS[fname]
+                with open_text(file, "r", compression) as f:
+                    for line in f:
+                        item = decode(line)
+                        if fields(item)[0] in kept_numbers:
+                            yield item
+
+        if kept_numbers is not None or not self.workers or self.workers < 2:
+            return self.build_base(start_dt, end_dt, records, trusted, logins)
+
+        pr_records = list(records("pull_requests.jsonl"))
+        in_window = frozenset(
+            pr["number"]
+            for pr in pr_records
+            if start_dt <= parse_timestamp(pr["created_at"]) <= end_dt
+        )
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            chunks: Dict[str, List[Future]] = {}
+            # Submitted in the order build_bundle consumes the files.
+            for fname in ("reviews.jsonl", "commits.jsonl", "review_comments.jsonl", "issue_comments.jsonl", "timeline.jsonl", "files.jsonl"):
+                file = canonical_path(canonical, fname, compression)
+                if not file.exists():
+                    continue
+                spans = _chunk_spans(file, self.chunk_bytes) if compression is None else [None]
+                chunks[fname] = [
+                    pool.submit(
+                        _decode_chunk, str(file), fname, compression, span, in_window, start, end, self.decoder
+                    )
+                    for span in spans
+                ]
+
+            def decoded(fname: str) -> Iterator[Dict]:
+                if fname == "pull_requests.jsonl":
+                    yield from pr_records
+                    return
+                for chunk in chunks.get(fname, ()):
+                    yield from chunk.result()
+
+            return self.build_base(start_dt, end_dt, decoded, trusted, logins)
+
+    def build_bundle(
+        self,
+        user_login: str,
+        start_dt: datetime,
+        end_dt: datetime,
+        records: Callable[[str], Iterable[Dict]],
+        trusted: bool = False,
+    ) -> CanonicalBundle:
+        """The bundle of one user; see build_base."""
+        return self.build_base(start_dt, end_dt, records, trusted, logins={user_login}).view(user_login)
+
+    def build_base(
+        self,
+        start_dt: datetime,
+        end_dt: datetime,
+        records: Callable[[str], Iterable[Dict]],
+        trusted: bool = False,
+        logins: Optional[Set[str]] = None,
+    ) -> "ParsedDump":
+        """
+        Parse canonical records once for several users; `records(fname)` yields the
+        REST-shaped dicts stored in canonical file `fname` (e.g. "reviews.jsonl") in dump
+        order. Keeps the in-window PRs any of `logins` (None = anyone) authored or acted
+        on. Records may be pre-filtered by the caller, but only ever to ones this would drop.
+        """
+        make = RecordFactory(trusted)
+        # One User / Repository instance per id, shared by every record that references it.
+        identities = IdentityTable(make)
+        ensure_user = identities.user
         pr_raw: Dict[int, dict] = {}
         commits: list[Commit] = []
         reviews: list[ReviewRecord] = []
@@ -61,301 +492,253 @@ class GitHubAdapter(ProviderAdapter):
         files: list[FileRecord] = []
         timeline_events: list[TimelineEvent] = []
 
-        acted_pr_numbers: Set[int] = set()  # PRs where vetted user acted
-
-        def ensure_user(user_dict: dict) -> User:
-            """
-            Normalize missing type and cache users.
-            """
-            if not user_dict:
-                raise ValueError("Missing user")
-            # Default to regular user if type missing
-            utype = user_dict.get("type") or UserType.USER.value
-            normalized = {**user_dict, "type": utype}
-            uid = normalized["id"]
-            if uid not in users:
-                users[uid] = User(**normalized)
-            return users[uid]
+        acted: Dict[str, Set[int]] = defaultdict(set)  # login -> PRs that user authored or acted on
 
         # ---------------------------
         # Pull requests (raw storage)
         # ---------------------------
-        pr_file = path / "canonical" / "pull_requests.jsonl"
-        if pr_file.exists():
-            with pr_file.open() as f:
-                for line in f:
-                    pr_dict = json.loads(line)
-                    created_at = datetime.fromisoformat(
-                        pr_dict["created_at"].replace("Z", "+00:00")
-                    )
-                    if not (start_dt <= created_at <= end_dt):
-                        continue
-                    pr_raw[pr_dict["number"]] = pr_dict
-                    # Author counts as action
-                    if pr_dict.get("user", {}).get("login") == user_login:
-                        acted_pr_numbers.add(pr_dict["number"])
+        for pr_dict in records("pull_requests.jsonl"):
+            created_at = parse_timestamp(pr_dict["created_at"])
+            if not (start_dt <= created_at <= end_dt):
+                continue
+            pr_raw[pr_dict["number"]] = pr_dict
+            # Author counts as action
+            author_login = pr_dict.get("user", {}).get("login")
+            if author_login:
+                acted[author_login].add(pr_dict["number"])
 
         # ---------------------------
         # Reviews
         # ---------------------------
-        review_file = path / "canonical" / "reviews.jsonl"
-        if review_file.exists():
-            with review_file.open() as f:
-                for line in f:
-                    review_dict = json.loads(line)
-                    submitted_at = datetime.fromisoformat(
-                        review_dict["submitted_at"].replace("Z", "+00:00")
-                    )
-                    if not (start_dt <= submitted_at <= end_dt):
-                        continue
-
-                    pr_number = int(review_dict["pull_request_url"].split("/")[-1])
-                    if pr_number not in pr_raw:
-                        # skip reviews for PRs outside window
-                        continue
-
-                    user = ensure_user(review_dict["user"])
-                    state_norm = review_dict["state"].lower()
-                    if state_norm not in {e.value for e in ReviewState}:
-                        state_norm = ReviewState.COMMENTED.value
-
-                    reviews.append(
-                        ReviewRecord(
-                            id=review_dict["id"],
-                            user=user,
-                            body=review_dict.get("body"),
-                            state=ReviewState(state_norm),
-                            submitted_at=submitted_at,
-                            pull_request_number=pr_number,
-                        )
-                    )
-                    if user.login == user_login:
-                        acted_pr_numbers.add(pr_number)
+        for review_dict in records("reviews.jsonl"):
+            submitted_at = parse_timestamp(review_dict["submitted_at"])
+            if not (start_dt <= submitted_at <= end_dt):
+                continue
+
+            pr_number = int(review_dict["pull_request_url"].split("/")[-1])
+            if pr_number not in pr_raw:
+                # skip reviews for PRs outside window
+                continue
+
+            user = ensure_user(review_dict["user"])
+            state_norm = review_dict["state"].lower()
+            if state_norm not in {e.value for e in ReviewState}:
+                state_norm = ReviewState.COMMENTED.value
+
+            reviews.append(
+                make(
+                    ReviewRecord,
+                    id=review_dict["id"],
+                    user=user,
+                    body=review_dict.get("body"),
+                    state=ReviewState(state_norm),
+                    submitted_at=submitted_at,
+                    pull_request_number=pr_number,
+                )
+            )
+            acted[user.login].add(pr_number)
 
         # ---------------------------
         # Commits
         # ---------------------------
-        commit_file = path / "canonical" / "commits.jsonl"
-        if commit_file.exists():
-            with commit_file.open() as f:
-                for line in f:
-                    commit_dict = json.loads(line)
-                    meta = commit_dict.get("commit") or {}
-                    meta_author = meta.get("author") or {}
-                    commit_dt_raw = meta_author.get("date")
-                    if not commit_dt_raw:
-                        continue
-                    commit_dt = datetime.fromisoformat(commit_dt_raw.replace("Z", "+00:00"))
-                    if not (start_dt <= commit_dt <= end_dt):
-                        continue
-
-                    pr_number = commit_dict.get("pull_request_number")
-                    if pr_number is None or pr_number not in pr_raw:
-                        continue
-
-                    author_dict = commit_dict.get("author")
-                    committer_dict = commit_dict.get("committer") or author_dict
-                    if not (author_dict and committer_dict):
-                        continue
-
-                    try:
-                        author = ensure_user(author_dict)
-                        committer = ensure_user(committer_dict)
-                    except (ValueError, KeyError, TypeError) as e:
-                        log.debug("Skipping commit %s: invalid user data - %s", commit_dict.get("sha", "unknown"), e)
-                        continue
-
-                    message = meta.get("message")
-                    if not message:
-                        continue
-
-                    commits.append(
-                        Commit(
-                            sha=commit_dict["sha"],
-                            author=author,
-                            committer=committer,
-                            message=message,
-                            date=commit_dt,
-                            pull_request_number=pr_number,
-                            idx=commit_dict.get("idx"),
-                        )
-                    )
-                    if author.login == user_login:
-                        acted_pr_numbers.add(pr_number)
+        for commit_dict in records("commits.jsonl"):
+            meta = commit_dict.get("commit") or {}
+            meta_author = meta.get("author") or {}
+            commit_dt_raw = meta_author.get("date")
+            if not commit_dt_raw:
+                continue
+            commit_dt = parse_timestamp(commit_dt_raw)
+            if not (start_dt <= commit_dt <= end_dt):
+                continue
+
+            pr_number = commit_dict.get("pull_request_number")
+            if pr_number is None or pr_number not in pr_raw:
+                continue
+
+            author_dict = commit_dict.get("author")
+            committer_dict = commit_dict.get("committer") or author_dict
+            if not (author_dict and committer_dict):
+                continue
+
+            try:
+                author = ensure_user(author_dict)
+                committer = ensure_user(committer_dict)
+            except (ValueError, KeyError, TypeError) as e:
+                log.debug("Skipping commit %s: invalid user data - %s", commit_dict.get("sha", "unknown"), e)
+                continue
+
+            message = meta.get("message")
+            if not message:
+                continue
+
+            commits.append(
+                make(
+                    Commit,
+                    sha=commit_dict["sha"],
+                    author=author,
+                    committer=committer,
+                    message=message,
+                    date=commit_dt,
+                    pull_request_number=pr_number,
+                    idx=commit_dict.get("idx"),
+                )
+            )
+            acted[author.login].add(pr_number)
 
         # ---------------------------
         # Review comments
         # ---------------------------
-        rc_file = path / "canonical" / "review_comments.jsonl"
-        if rc_file.exists():
-            with rc_file.open() as f:
-                for line in f:
-                    comment_dict = json.loads(line)
-                    pr_number = int(comment_dict["pull_request_url"].split("/")[-1])
-                    created_at = datetime.fromisoformat(
-                        comment_dict["created_at"].replace("Z", "+00:00")
-                    )
-                    if not (start_dt <= created_at <= end_dt):
-                        continue
-                    if pr_number not in pr_raw:
-                        continue
-
-                    user = ensure_user(comment_dict["user"])
-                    comments.append(
-                        CommentRecord(
-                            id=comment_dict["id"],
-                            user=user,
-                            body=comment_dict["body"],
-                            created_at=created_at,
-                            updated_at=comment_dict.get("updated_at"),
-                            type=CommentType.REVIEW,
-                            pull_request_number=pr_number,
-                            review_id=comment_dict.get("pull_request_review_id"),
-                            in_reply_to_id=comment_dict.get("in_reply_to_id"),
-                            path=comment_dict.get("path"),
-                            position=comment_dict.get("position"),
-                        )
-                    )
-                    if user.login == user_login:
-                        acted_pr_numbers.add(pr_number)
+        for comment_dict in records("review_comments.jsonl"):
+            pr_number = int(comment_dict["pull_request_url"].split("/")[-1])
+            created_at = parse_timestamp(comment_dict["created_at"])
+            if not (start_dt <= created_at <= end_dt):
+                continue
+            if pr_number not in pr_raw:
+                continue
+
+            user = ensure_user(comment_dict["user"])
+            comments.append(
+                make(
+                    CommentRecord,
+                    id=comment_dict["id"],
+                    user=user,
+                    body=comment_dict["body"],
+                    created_at=created_at,
+                    updated_at=parse_timestamp(comment_dict["updated_at"]) if comment_dict.get("updated_at") else None,
+                    type=CommentType.REVIEW,
+                    pull_request_number=pr_number,
+                    review_id=comment_dict.get("pull_request_review_id"),
+                    in_reply_to_id=comment_dict.get("in_reply_to_id"),
+                    path=comment_dict.get("path"),
+                    position=comment_dict.get("position"),
+                )
+            )
+            acted[user.login].add(pr_number)
 
         # ---------------------------
         # Issue comments (PR thread)
         # ---------------------------
-        ic_file = path / "canonical" / "issue_comments.jsonl"
-        if ic_file.exists():
-            with ic_file.open() as f:
-                for line in f:
-                    comment_dict = json.loads(line)
-                    issue_number = int(comment_dict["issue_url"].split("/")[-1])
-                    created_at = datetime.fromisoformat(
-                        comment_dict["created_at"].replace("Z", "+00:00")
-                    )
-                    if not (start_dt <= created_at <= end_dt):
-                        continue
-                    if issue_number not in pr_raw:
-                        continue
-
-                    user = ensure_user(comment_dict["user"])
-                    comments.append(
-                        CommentRecord(
-                            id=comment_dict["id"],
-                            user=user,
-                            body=comment_dict["body"],
-                            created_at=created_at,
-                            updated_at=comment_dict.get("updated_at"),
-                            type=CommentType.ISSUE,
-                            pull_request_number=issue_number,
-                            review_id=None,
-                            in_reply_to_id=None,
-                            path=None,
-                            position=None,
-                        )
-                    )
-                    if user.login == user_login:
-                        acted_pr_numbers.add(issue_number)
+        for comment_dict in records("issue_comments.jsonl"):
+            issue_number = int(comment_dict["issue_url"].split("/")[-1])
+            created_at = parse_timestamp(comment_dict["created_at"])
+            if not (start_dt <= created_at <= end_dt):
+                continue
+            if issue_number not in pr_raw:
+                continue
+
+            user = ensure_user(comment_dict["user"])
+            comments.append(
+                make(
+                    CommentRecord,
+                    id=comment_dict["id"],
+                    user=user,
+                    body=comment_dict["body"],
+                    created_at=created_at,
+                    updated_at=parse_timestamp(comment_dict["updated_at"]) if comment_dict.get("updated_at") else None,
+                    type=CommentType.ISSUE,
+                    pull_request_number=issue_number,
+                    review_id=None,
+                    in_reply_to_id=None,
+                    path=None,
+                    position=None,
+                )
+            )
+            acted[user.login].add(issue_number)
 
         # ---------------------------
         # Timeline events
         # ---------------------------
-        tl_file = path / "canonical" / "timeline.jsonl"
-        if tl_file.exists():
-            with tl_file.open() as f:
-                for line in f:
-                    tl_dict = json.loads(line)
-                    url = tl_dict.get("url", "")
-                    try:
-                        pr_number = int(url.rstrip("/").split("/")[-2])
-                    except (ValueError, IndexError) as e:
-                        log.debug("Skipping timeline event: cannot parse PR number from URL %r - %s", url, e)
-                        continue
-                    if pr_number not in pr_raw:
-                        continue
-                    created_raw = tl_dict.get("created_at")
-                    if not created_raw:
-                        continue
-                    created_dt = datetime.fromisoformat(created_raw.replace("Z", "+00:00"))
-                    if not (start_dt <= created_dt <= end_dt):
-                        continue
-                    actor_dict = tl_dict.get("actor") or {}
-                    try:
-                        actor = ensure_user(actor_dict)
-                    except (ValueError, KeyError, TypeError) as e:
-                        log.debug("Skipping timeline event %s: invalid actor data - %s", tl_dict.get("id", "unknown"), e)
-                        continue
-
-                    timeline_events.append(
-                        TimelineEvent(
-                            id=tl_dict["id"],
-                            node_id=tl_dict.get("node_id"),
-                            url=tl_dict.get("url"),
-                            event=tl_dict["event"],
-                            actor=actor,
-                            created_at=created_dt,
-                            pull_request_number=pr_number,
-                            commit_id=tl_dict.get("commit_id"),
-                            commit_url=tl_dict.get("commit_url"),
-                            comment_id=tl_dict.get("comment_id"),
-                            state=tl_dict.get("state"),
-                            html_url=tl_dict.get("html_url"),
-                        )
-                    )
-                    if actor.login == user_login:
-                        acted_pr_numbers.add(pr_number)
+        for tl_dict in records("timeline.jsonl"):
+            # Dump writers annotate each event with its PR; older dumps only have the URL.
+            pr_number = tl_dict.get("pull_request_number")
+            if pr_number is None:
+                url = tl_dict.get("url") or ""
+                try:
+                    pr_number = int(url.rstrip("/").split("/")[-2])
+                except (ValueError, IndexError) as e:
+                    log.debug("Skipping timeline event: cannot parse PR number from URL %r - %s", url, e)
+                    continue
+            if pr_number not in pr_raw:
+                continue
+            # REST "reviewed" events carry user / submitted_at instead of actor / created_at;
+            # "committed" events have neither and are skipped (the commits list covers them).
+            created_raw = tl_dict.get("created_at") or tl_dict.get("submitted_at")
+            if not created_raw:
+                continue
+            created_dt = parse_timestamp(created_raw)
+            if not (start_dt <= created_dt <= end_dt):
+                continue
+            actor_dict = tl_dict.get("actor") or tl_dict.get("user") or {}
+            try:
+                actor = ensure_user(actor_dict)
+            except (ValueError, KeyError, TypeError) as e:
+                log.debug("Skipping timeline event %s: invalid actor data - %s", tl_dict.get("id", "unknown"), e)
+                continue
+
+            timeline_events.append(
+                make(
+                    TimelineEvent,
+                    id=tl_dict["id"],
+                    node_id=tl_dict.get("node_id"),
+                    url=tl_dict.get("url"),
+                    event=tl_dict["event"],
+                    actor=actor,
+                    created_at=created_dt,
+                    pull_request_number=pr_number,
+                    commit_id=tl_dict.get("commit_id"),
+                    commit_url=tl_dict.get("commit_url"),
+                    comment_id=tl_dict.get("comment_id"),
+                    state=tl_dict.get("state"),
+                    html_url=tl_dict.get("html_url"),
+                )
+            )
+            acted[actor.login].add(pr_number)
 
         # ---------------------------
         # Files
         # ---------------------------
-        files_file = path / "canonical" / "files.jsonl"
-        if files_file.exists():
-            with files_file.open() as f:
-                for line in f:
-                    file_dict = json.loads(line)
-                    pr_number = file_dict.get("pull_request_number")
-                    if pr_number in pr_raw:
-                        files.append(
-                            FileRecord(
-                                sha=file_dict["sha"],
-                                filename=file_dict["filename"],
-                                additions=file_dict["additions"],
-                                deletions=file_dict["deletions"],
-                                changes=file_dict["changes"],
-                                status=file_dict["status"],
-                                pull_request_number=pr_number,
-                            )
-                        )
+        for file_dict in records("files.jsonl"):
+            pr_number = file_dict.get("pull_request_number")
+            if pr_number in pr_raw:
+                files.append(
+                    make(
+                        FileRecord,
+                        sha=file_dict.get("sha"),
+                        filename=file_dict["filename"],
+                        additions=file_dict["additions"],
+                        deletions=file_dict["deletions"],
+                        changes=file_dict["changes"],
+                        status=file_dict["status"],
+                        pull_request_number=pr_number,
+                    )
+                )
 
         # ---------------------------
-        # Build PR objects now that acted_pr_numbers is known
+        # Build PR objects now that the acted sets are known
         # ---------------------------
+        if logins is None:
+            wanted = set().union(*acted.values())
+        else:
+            wanted = set().union(*(acted.get(login, ()) for login in logins))
         prs: list[PullRequest] = []
         for pr_number, pr_dict in pr_raw.items():
-            include = pr_dict["user"]["login"] == user_login or pr_number in acted_pr_numbers
-            if not include:
+            if pr_number not in wanted:
                 continue
 
-            repo_dict = pr_dict["base"]["repo"]
-            owner = ensure_user({**repo_dict["owner"], "type": repo_dict["owner"].get("type") or UserType.ORGANIZATION.value})
-            repo_id = repo_dict["id"]
-            if repo_id not in repos:
-                repos[repo_id] = Repository(
-                    id=repo_id,
-                    name=repo_dict["name"],
-                    full_name=repo_dict["full_name"],
-                    owner=owner,
-                )
-            repo = repos[repo_id]
+            repo = identities.repository(pr_dict["base"]["repo"])
 
             base_user = ensure_user(pr_dict["base"]["user"])
             head_user = ensure_user(pr_dict["head"]["user"])
-            base = Branch(
+            base = make(
+                Branch,
                 label=pr_dict["base"]["label"],
                 ref=pr_dict["base"]["ref"],
                 sha=pr_dict["base"]["sha"],
                 user=base_user,
                 repo=repo,
             )
-            head = Branch(
+            head = make(
+                Branch,
                 label=pr_dict["head"]["label"],
                 ref=pr_dict["head"]["ref"],
                 sha=pr_dict["head"]["sha"],
@@ -368,26 +751,27 @@ class GitHubAdapter(ProviderAdapter):
                 merged_by = ensure_user(pr_dict["merged_by"])
 
             prs.append(
-                PullRequest(
+                make(
+                    PullRequest,
                     id=pr_dict["id"],
                     number=pr_number,
                     title=pr_dict["title"],
                     body=pr_dict.get("body"),
                     state=PullRequestState(pr_dict["state"]),
                     user=ensure_user(pr_dict["user"]),
-                    created_at=datetime.fromisoformat(pr_dict["created_at"].replace("Z", "+00:00")),
+                    created_at=parse_timestamp(pr_dict["created_at"]),
                     updated_at=(
-                        datetime.fromisoformat(pr_dict["updated_at"].replace("Z", "+00:00"))
+                        parse_timestamp(pr_dict["updated_at"])
                         if pr_dict.get("updated_at")
                         else None
                     ),
                     closed_at=(
-                        datetime.fromisoformat(pr_dict["closed_at"].replace("Z", "+00:00"))
+                        parse_timestamp(pr_dict["closed_at"])
                         if pr_dict.get("closed_at")
                         else None
                     ),
                     merged_at=(
-                        datetime.fromisoformat(pr_dict["merged_at"].replace("Z", "+00:00"))
+                        parse_timestamp(pr_dict["merged_at"])
                         if pr_dict.get("merged_at")
                         else None
                     ),
@@ -407,19 +791,15 @@ class GitHubAdapter(ProviderAdapter):
             )
 
         keep_pr_numbers = {pr.number for pr in prs}
-        commits = [c for c in commits if c.pull_request_number in keep_pr_numbers]
-        reviews = [r for r in reviews if r.pull_request_number in keep_pr_numbers]
-        comments = [c for c in comments if c.pull_request_number in keep_pr_numbers]
-        files = [f for f in files if f.pull_request_number in keep_pr_numbers]
-        timeline_events = [t for t in timeline_events if t.pull_request_number in keep_pr_numbers]
-
-        return CanonicalBundle(
-            users=list(users.values()),
-            repositories=list(repos.values()),
+        return ParsedDump(
+            users=identities.users,
+            repositories=identities.repositories,
             pull_requests=prs,
-            commits=commits,
-            reviews=reviews,
-            comments=comments,
-            files=files,
-            timeline=timeline_events,
+            commits=[c for c in commits if c.pull_request_number in keep_pr_numbers],
+            reviews=[r for r in reviews if r.pull_request_number in keep_pr_numbers],
+            comments=[c for c in comments if c.pull_request_number in keep_pr_numbers],
+            files=[f for f in files if f.pull_request_number in keep_pr_numbers],
+            timeline=[t for t in timeline_events if t.pull_request_number in keep_pr_numbers],
+            acted={login: numbers & keep_pr_numbers for login, numbers in acted.items() if numbers & keep_pr_numbers},
+            trusted=trusted,
         )
@@ -0,0 +1,53 @@
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from impact.adapters.github import GitHubAdapter, ParsedDump
+from impact.exceptions import ManifestError
+from impact.persistence.codec import parse_timestamp
+from impact.persistence.filesystem import CANONICAL_FILES, bundle_records
+from impact.persistence.index import RECORD_FIELDS, epoch_seconds
+from impact.persistence.pr_store import REFS_FILE, SharedPRStore, read_refs
+
+
+class GitHubSharedAdapter(GitHubAdapter):
+    """
+    Parse a GitHub dump whose PR bundles live in a SharedPRStore (manifest "pr_store")
+    and are only referenced from the dump's pr_refs.jsonl. Bundles of PRs the user
+    neither authored nor acted on inside the window are skipped as they are loaded;
+    the rest go through the same conversion as JSONL dumps.
+    """
+
+    def parse_base(self, path: Path, manifest: Dict, logins: Optional[Set[str]]) -> ParsedDump:
+        if not manifest.get("pr_store") or not (path / REFS_FILE).exists():
+            raise ManifestError(f"Dump in {path} does not reference a PR store", path=str(path / "dump_manifest.json"))
+        start_dt = parse_timestamp(manifest["from"])
+        end_dt = parse_timestamp(manifest["to"])
+        start, end = start_dt.timestamp(), end_dt.timestamp()
+
+        store = SharedPRStore(Path(manifest["pr_store"]))
+        records: Dict[str, List[Dict]] = defaultdict(list)
+        # Read the refs directly: a writer would register this dump as a root of the store.
+        for ref in read_refs(path / REFS_FILE):
+            entry = store.load(ref["key"])
+            if entry is None:
+                raise ManifestError(f"PR store {store.directory} lost {ref['repo']}#{ref['number']}", path=str(path / REFS_FILE))
+            by_kind = bundle_records(entry["bundle"])
+            if logins is not None and not self._acted(by_kind, logins, start, end):
+                continue
+            for key, items in by_kind.items():
+                records[CANONICAL_FILES[key]].extend(items)
+        return self.build_base(start_dt, end_dt, lambda fname: records.get(fname, ()), self.is_trusted(manifest), logins)
+
+    @staticmethod
+    def _acted(by_kind: Dict[str, List[Dict]], logins: Set[str], start: float, end: float) -> bool:
+        """Whether one of `logins` authored or acted on this PR inside the window, as GitHubAdapter decides it."""
+        for key, items in by_kind.items():
+            fields = RECORD_FIELDS[CANONICAL_FILES[key]]
+            for item in items:
+                _, ts, login = fields(item)
+                if login in logins:
+                    ts = epoch_seconds(ts)
+                    if ts is not None and start <= ts <= end:
+                        return True
+        return False
@@ -0,0 +1,41 @@
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+from impact.adapters.github import GitHubAdapter, ParsedDump
+from impact.exceptions import ManifestError
+from impact.persistence.codec import parse_timestamp
+from impact.persistence.database import DB_FILE, SQLiteDumpStore
+from impact.persistence.filesystem import CANONICAL_FILES
+
+FILE_KEYS = {fname: key for key, fname in CANONICAL_FILES.items()}
+
+
+class GitHubSQLiteAdapter(GitHubAdapter):
+    """
+    Parse a GitHub dump stored in SQLite (see SQLiteDumpStore) into the canonical
+    bundle. The kept PRs and the window are worked out in SQL on indexed columns,
+    so only the user's records are read; the records then go through the same
+    conversion as JSONL dumps.
+    """
+
+    def parse_base(self, path: Path, manifest: Dict, logins: Optional[Set[str]]) -> ParsedDump:
+        if not (path / DB_FILE).exists():
+            raise ManifestError(f"SQLite dump not found: {path / DB_FILE}", path=str(path / "dump_manifest.json"))
+        start_dt = parse_timestamp(manifest["from"])
+        end_dt = parse_timestamp(manifest["to"])
+        start, end = start_dt.timestamp(), end_dt.timestamp()
+
+        store = SQLiteDumpStore(path, readonly=True)
+        try:
+            kept = None
+            if logins is not None:
+                kept = set().union(*(store.acted_pr_numbers(login, start, end) for login in logins))
+            return self.build_base(
+                start_dt,
+                end_dt,
+                lambda fname: store.iter_records(FILE_KEYS[fname], numbers=kept, start=start, end=end),
+                self.is_trusted(manifest),
+                logins,
+            )
+        finally:
+            store.close()
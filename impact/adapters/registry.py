@@ -1,9 +1,22 @@
 from impact.adapters.base import ProviderAdapter
 from impact.adapters.github import GitHubAdapter
+from impact.adapters.github_shared import GitHubSharedAdapter
+from impact.adapters.github_sqlite import GitHubSQLiteAdapter
 
+# (provider, dump store as recorded in the manifest's "store") -> adapter class.
+ADAPTERS = {
+    ("github", "jsonl"): GitHubAdapter,
+    ("github", "sqlite"): GitHubSQLiteAdapter,
+    ("github", "shared"): GitHubSharedAdapter,
+}
 
-def get_adapter(provider: str) -> ProviderAdapter:
-    if provider == "github":
-        return GitHubAdapter()
-    else:
-        raise ValueError(f"Unsupported provider: {provider}")
\ No newline at end of file
+
+def get_adapter(provider: str, store: str = "jsonl", **options) -> ProviderAdapter:
+    """
+    `options` go to the adapter, e.g. `workers` (process pool for JSONL dumps) and
+    `trusted` (skip per-record validation; None = as the manifest says).
+    """
+    adapter = ADAPTERS.get((provider, store))
+    if adapter is None:
+        raise ValueError(f"Unsupported provider: {provider}" + (f" with {store} store" if store != "jsonl" else ""))
+    return adapter(**options)
@@ -0,0 +1,442 @@
+"""
+Columnar (struct-of-arrays) form of a CanonicalBundle, for population-scale analytics.
+
+Each record kind becomes a ColumnTable of NumPy arrays:
+  - timestamps as int64 epoch seconds (GitHub timestamps carry no sub-second part)
+  - PR numbers, counts and row references to the users / repositories tables as int32
+  - enums (review state, PR state, comment type) and timeline event types as small
+    categorical codes, with the categories kept on the table
+  - strings (logins, bodies, shas, paths, ...) as int32 codes into one StringPool
+    shared by the bundle, which stores each distinct string once, back to back
+Missing values are the dtype's minimum (MISSING_*) or -1 for codes and row references.
+
+Build one from a parsed dump with ParsedDump.columnar() (or from_bundle() for a
+CanonicalBundle at hand); to_bundle() goes back to the pydantic models. It encodes
+records already parsed into models, so the columnar form is for vectorized queries
+and compact storage, not for parsing or ledger building. NumPy is optional:
+pip install devrank[columnar].
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from enum import Enum
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+try:  # optional: pip install devrank[columnar]
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without the extra
+    np = None
+
+from impact.domain.models import (
+    Branch,
+    CanonicalBundle,
+    CommentRecord,
+    CommentType,
+    Commit,
+    FileRecord,
+    PullRequest,
+    PullRequestState,
+    Repository,
+    ReviewRecord,
+    ReviewState,
+    TimelineEvent,
+    User,
+    UserType,
+)
+
+MISSING_INT64 = -(2**63)
+MISSING_INT32 = -(2**31)
+NO_ROW = -1  # missing string code / user / repository reference
+
+# Column kinds: (dtype, missing value). "user"/"repo" are rows of the users /
+# repositories tables, "str" a StringPool code, "label" a code into the table's
+# categories; an Enum subclass is a code into its members, in declaration order.
+_KINDS = {
+    "i64": ("int64", MISSING_INT64),
+    "i32": ("int32", MISSING_INT32),
+    "time": ("int64", MISSING_INT64),
+    "bool": ("bool", False),
+    "str": ("int32", NO_ROW),
+    "user": ("int32", NO_ROW),
+    "repo": ("int32", NO_ROW),
+    "label": ("int16", NO_ROW),
+}
+
+ColumnSpec = Sequence[Tuple[str, Union[str, type]]]
+
+
+def _branch_spec(prefix: str) -> List[Tuple[str, str]]:
+    return [(f"{prefix}.label", "str"), (f"{prefix}.ref", "str"), (f"{prefix}.sha", "str"), (f"{prefix}.user", "user"), (f"{prefix}.repo", "repo")]
+
+
+USER_COLUMNS: ColumnSpec = [("id", "i64"), ("login", "str"), ("avatar_url", "str"), ("type", UserType)]
+REPOSITORY_COLUMNS: ColumnSpec = [("id", "i64"), ("name", "str"), ("full_name", "str"), ("owner", "user")]
+PULL_REQUEST_COLUMNS: ColumnSpec = [
+    ("id", "i64"), ("number", "i32"), ("title", "str"), ("body", "str"), ("state", PullRequestState),
+    ("user", "user"), ("created_at", "time"), ("updated_at", "time"), ("closed_at", "time"),
+    ("merged_at", "time"), ("merged", "bool"), ("merge_commit_sha", "str"), ("repository", "repo"),
+    *_branch_spec("base"), *_branch_spec("head"),
+    ("commits", "i32"), ("additions", "i32"), ("deletions", "i32"), ("changed_files", "i32"),
+    ("merged_by", "user"), ("comments", "i32"), ("review_comments", "i32"),
+]
+COMMIT_COLUMNS: ColumnSpec = [
+    ("sha", "str"), ("author", "user"), ("committer", "user"), ("message", "str"), ("date", "time"),
+    ("pull_request_number", "i32"), ("idx", "i32"),
+]
+REVIEW_COLUMNS: ColumnSpec = [
+    ("id", "i64"), ("user", "user"), ("body", "str"), ("state", ReviewState), ("submitted_at", "time"),
+    ("pull_request_number", "i32"),
+]
+COMMENT_COLUMNS: ColumnSpec = [
+    ("id", "i64"), ("user", "user"), ("body", "str"), ("created_at", "time"), ("updated_at", "time"),
+    ("type", CommentType), ("pull_request_number", "i32"), ("review_id", "i64"), ("in_reply_to_id", "i64"),
+    ("path", "str"), ("position", "i32"),
+]
+FILE_COLUMNS: ColumnSpec = [
+    ("sha", "str"), ("filename", "str"), ("additions", "i32"), ("deletions", "i32"), ("changes", "i32"),
+    ("status", "label"), ("pull_request_number", "i32"),
+]
+TIMELINE_COLUMNS: ColumnSpec = [
+    ("id", "i64"), ("node_id", "str"), ("url", "str"), ("event", "label"), ("actor", "user"),
+    ("created_at", "time"), ("pull_request_number", "i32"), ("commit_id", "str"), ("commit_url", "str"),
+    ("comment_id", "i64"), ("state", "str"), ("html_url", "str"),
+]
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("Columnar bundles need the 'numpy' package (pip install devrank[columnar])")
+
+
+def _epoch(value: Optional[datetime]) -> int:
+    if value is None:
+        return MISSING_INT64
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+class StringPool:
+    """
+    Distinct strings stored back to back in one str: string `code` is
+    text[offsets[code]:offsets[code + 1]]. Codes are handed out by code() while
+    the pool is built; freeze() lays the text out.
+    """
+
+    def __init__(self):
+        self._codes: Dict[str, int] = {}
+        self._strings: List[str] = []
+        self.text = ""
+        self.offsets = None
+
+    def code(self, value: Optional[str]) -> int:
+        if value is None:
+            return NO_ROW
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self._strings)
+            self._strings.append(value)
+        return code
+
+    def freeze(self) -> "StringPool":
+        self.offsets = np.zeros(len(self._strings) + 1, dtype=np.int64)
+        np.cumsum([len(s) for s in self._strings], out=self.offsets[1:])
+        self.text = "".join(self._strings)
+        self._codes, self._strings = {}, []
+        return self
+
+    def __getitem__(self, code: int) -> Optional[str]:
+        if code < 0:
+            return None
+        return self.text[self.offsets[code]:self.offsets[code + 1]]
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1 if self.offsets is not None else len(self._strings)
+
+
+class ColumnTable:
+    """One record kind: equal-length arrays by column name (nested fields as "base.label")."""
+
+    def __init__(self, columns: Dict[str, Any], categories: Dict[str, Tuple[str, ...]]):
+        self.columns = columns
+        self.categories = categories
+
+    def __getitem__(self, name: str):
+        return self.columns[name]
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def category_code(self, name: str, value: str) -> int:
+        """Code of `value` in categorical column `name` (NO_ROW if it never occurs)."""
+        try:
+            return self.categories[name].index(value)
+        except ValueError:
+            return NO_ROW
+
+
+class _Encoder:
+    """Builds ColumnTables that share one StringPool and users / repositories tables."""
+
+    def __init__(self):
+        self.pool = StringPool()
+        self.user_rows: Dict[int, int] = {}
+        self.users: List[User] = []
+        self.repo_rows: Dict[int, int] = {}
+        self.repositories: List[Repository] = []
+
+    def user_row(self, user: Optional[User]) -> int:
+        if user is None:
+            return NO_ROW
+        row = self.user_rows.get(user.id)
+        if row is None:
+            row = self.user_rows[user.id] = len(self.users)
+            self.users.append(user)
+        return row
+
+    def repo_row(self, repo: Optional[Repository]) -> int:
+        if repo is None:
+            return NO_ROW
+        row = self.repo_rows.get(repo.id)
+        if row is None:
+            row = self.repo_rows[repo.id] = len(self.repositories)
+            self.repositories.append(repo)
+            self.user_row(repo.owner)
+        return row
+
+    def table(self, records: Sequence, spec: ColumnSpec) -> ColumnTable:
+        columns: Dict[str, Any] = {}
+        categories: Dict[str, Tuple[str, ...]] = {}
+        for name, kind in spec:
+            values = [attrgetter(name)(r) for r in records]
+            if isinstance(kind, type) and issubclass(kind, Enum):
+                members = list(kind)
+                categories[name] = tuple(m.value for m in members)
+                codes = [NO_ROW if v is None else members.index(kind(v)) for v in values]
+                columns[name] = np.array(codes, dtype=np.int8)
+                continue
+            dtype, missing = _KINDS[kind]
+            if kind == "label":
+                labels: Dict[str, int] = {}
+                codes = [NO_ROW if v is None else labels.setdefault(v, len(labels)) for v in values]
+                categories[name] = tuple(labels)
+            elif kind == "str":
+                codes = [self.pool.code(v) for v in values]
+            elif kind == "user":
+                codes = [self.user_row(v) for v in values]
+            elif kind == "repo":
+                codes = [self.repo_row(v) for v in values]
+            elif kind == "time":
+                codes = [_epoch(v) for v in values]
+            else:
+                codes = [missing if v is None else v for v in values]
+            columns[name] = np.array(codes, dtype=dtype)
+        return ColumnTable(columns, categories)
+
+
+def _decode_rows(table: ColumnTable, spec: ColumnSpec, pool: StringPool, users: List, repos: List) -> List[Dict]:
+    """Per-row field dicts of `table`, nested fields grouped ("base.label" -> row["base"]["label"])."""
+    decoded: List[Tuple[str, List]] = []
+    for name, kind in spec:
+        column = table[name].tolist()
+        if isinstance(kind, type) and issubclass(kind, Enum):
+            members = list(kind)
+            values = [None if c < 0 else members[c] for c in column]
+        elif kind == "label":
+            labels = table.categories[name]
+            values = [None if c < 0 else labels[c] for c in column]
+        elif kind == "str":
+            values = [pool[c] for c in column]
+        elif kind == "user":
+            values = [None if c < 0 else users[c] for c in column]
+        elif kind == "repo":
+            values = [None if c < 0 else repos[c] for c in column]
+        elif kind == "time":
+            values = [None if v == MISSING_INT64 else datetime.fromtimestamp(v, timezone.utc) for v in column]
+        elif kind == "bool":
+            values = column
+        else:
+            missing = _KINDS[kind][1]
+            values = [None if v == missing else v for v in column]
+        decoded.append((name, values))
+
+    rows: List[Dict] = [{} for _ in range(len(table))]
+    for name, values in decoded:
+        head, _, tail = name.partition(".")
+        for row, value in zip(rows, values):
+            if tail:
+                row.setdefault(head, {})[tail] = value
+            else:
+                row[head] = value
+    return rows
+
+
+class ColumnarBundle:
+    """
+    Struct-of-arrays CanonicalBundle. `users` and `repositories` hold every user /
+    repository a record references; `listed_users` / `listed_repositories` flag the
+    rows that the bundle's own lists contain.
+    """
+
+    def __init__(
+        self,
+        pool: StringPool,
+        users: ColumnTable,
+        repositories: ColumnTable,
+        pull_requests: ColumnTable,
+        commits: ColumnTable,
+        reviews: ColumnTable,
+        comments: ColumnTable,
+        files: ColumnTable,
+        timeline: ColumnTable,
+        listed_users,
+        listed_repositories,
+    ):
+        self.pool = pool
+        self.users = users
+        self.repositories = repositories
+        self.pull_requests = pull_requests
+        self.commits = commits
+        self.reviews = reviews
+        self.comments = comments
+        self.files = files
+        self.timeline = timeline
+        self.listed_users = listed_users
+        self.listed_repositories = listed_repositories
+        self._user_rows: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def from_records(
+        cls,
+        users: Iterable[User],
+        repositories: Iterable[Repository],
+        pull_requests: Sequence[PullRequest],
+        commits: Sequence[Commit],
+        reviews: Sequence[ReviewRecord],
+        comments: Sequence[CommentRecord],
+        files: Sequence[FileRecord],
+        timeline: Sequence[TimelineEvent],
+    ) -> "ColumnarBundle":
+        _require_numpy()
+        enc = _Encoder()
+        listed_users = [enc.user_row(u) for u in users]
+        listed_repos = [enc.repo_row(r) for r in repositories]
+        tables = {
+            "pull_requests": enc.table(pull_requests, PULL_REQUEST_COLUMNS),
+            "commits": enc.table(commits, COMMIT_COLUMNS),
+            "reviews": enc.table(reviews, REVIEW_COLUMNS),
+            "comments": enc.table(comments, COMMENT_COLUMNS),
+            "files": enc.table(files, FILE_COLUMNS),
+            "timeline": enc.table(timeline, TIMELINE_COLUMNS),
+        }
+        # Repositories first: their owners join the users table.
+        repos = enc.table(enc.repositories, REPOSITORY_COLUMNS)
+        users_table = enc.table(enc.users, USER_COLUMNS)
+        user_mask = np.zeros(len(enc.users), dtype=bool)
+        user_mask[listed_users] = True
+        repo_mask = np.zeros(len(enc.repositories), dtype=bool)
+        repo_mask[listed_repos] = True
+        return cls(enc.pool.freeze(), users_table, repos, listed_users=user_mask, listed_repositories=repo_mask, **tables)
+
+    @classmethod
+    def from_bundle(cls, bundle: CanonicalBundle) -> "ColumnarBundle":
+        return cls.from_records(
+            bundle.users, bundle.repositories, bundle.pull_requests, bundle.commits,
+            bundle.reviews, bundle.comments, bundle.files, bundle.timeline,
+        )
+
+    def to_bundle(self) -> CanonicalBundle:
+        """The pydantic bundle; users and repositories are shared between the records that reference them."""
+        users = [
+            User.model_construct(**row) for row in _decode_rows(self.users, USER_COLUMNS, self.pool, [], [])
+        ]
+        repos = [
+            Repository.model_construct(**row)
+            for row in _decode_rows(self.repositories, REPOSITORY_COLUMNS, self.pool, users, [])
+        ]
+
+        def decode(table: ColumnTable, spec: ColumnSpec) -> List[Dict]:
+            return _decode_rows(table, spec, self.pool, users, repos)
+
+        pull_requests = []
+        for row in decode(self.pull_requests, PULL_REQUEST_COLUMNS):
+            row["base"] = Branch.model_construct(**row["base"])
+            row["head"] = Branch.model_construct(**row["head"])
+            pull_requests.append(PullRequest.model_construct(**row))
+        return CanonicalBundle.model_construct(
+            users=[u for u, listed in zip(users, self.listed_users) if listed],
+            repositories=[r for r, listed in zip(repos, self.listed_repositories) if listed],
+            pull_requests=pull_requests,
+            commits=[Commit.model_construct(**row) for row in decode(self.commits, COMMIT_COLUMNS)],
+            reviews=[ReviewRecord.model_construct(**row) for row in decode(self.reviews, REVIEW_COLUMNS)],
+            comments=[CommentRecord.model_construct(**row) for row in decode(self.comments, COMMENT_COLUMNS)],
+            files=[FileRecord.model_construct(**row) for row in decode(self.files, FILE_COLUMNS)],
+            timeline=[TimelineEvent.model_construct(**row) for row in decode(self.timeline, TIMELINE_COLUMNS)],
+        )
+
+    # ---------------------------
+    # Vectorized queries
+    # ---------------------------
+    def user_row(self, login: str) -> int:
+        """Row of `login` in the users table, or NO_ROW."""
+        if self._user_rows is None:
+            # Decoded once; setdefault keeps the first row should a login repeat.
+            rows: Dict[str, int] = {}
+            for row, code in enumerate(self.users["login"].tolist()):
+                rows.setdefault(self.pool[code], row)
+            self._user_rows = rows
+        return self._user_rows.get(login, NO_ROW)
+
+    @staticmethod
+    def window_mask(times, start: Optional[datetime] = None, end: Optional[datetime] = None):
+        """Rows of an epoch-seconds column inside [start, end] (naive bounds are taken as UTC)."""
+        mask = times != MISSING_INT64
+        if start is not None:
+            mask &= times >= _epoch(start)
+        if end is not None:
+            mask &= times <= _epoch(end)
+        return mask
+
+    def cycle_time_hours(self):
+        """Per PR row: hours from creation to merge, NaN if not merged."""
+        prs = self.pull_requests
+        merged = prs["merged"] & (prs["merged_at"] != MISSING_INT64)
+        hours = np.full(len(prs), np.nan)
+        hours[merged] = (prs["merged_at"][merged] - prs["created_at"][merged]) / 3600.0
+        return hours
+
+    def pr_rows(self, numbers):
+        """Row of each PR number in the pull_requests table (NO_ROW where the bundle lacks it)."""
+        pr_numbers = self.pull_requests["number"]
+        order = np.argsort(pr_numbers, kind="stable")
+        ordered = pr_numbers[order]
+        pos = np.clip(np.searchsorted(ordered, numbers), 0, max(len(ordered) - 1, 0))
+        if not len(ordered):
+            return np.full(len(numbers), NO_ROW, dtype=np.int64)
+        return np.where(ordered[pos] == numbers, order[pos], NO_ROW)
+
+    def first_review_latency_hours(self, exclude_author: bool = True):
+        """Per PR row: hours from creation to its first review (by someone else), NaN if none."""
+        prs, reviews = self.pull_requests, self.reviews
+        rows = self.pr_rows(reviews["pull_request_number"])
+        valid = rows != NO_ROW
+        if exclude_author:
+            # Index only matched rows: with no PRs there is no row 0 to stand in for the rest.
+            valid[valid] = reviews["user"][valid] != prs["user"][rows[valid]]
+        first = np.full(len(prs), np.iinfo(np.int64).max, dtype=np.int64)
+        np.minimum.at(first, rows[valid], reviews["submitted_at"][valid])
+        hours = np.full(len(prs), np.nan)
+        reviewed = first != np.iinfo(np.int64).max
+        hours[reviewed] = (first[reviewed] - prs["created_at"][reviewed]) / 3600.0
+        return hours
+
+
+__all__ = [
+    "ColumnTable",
+    "ColumnarBundle",
+    "MISSING_INT32",
+    "MISSING_INT64",
+    "NO_ROW",
+    "StringPool",
+]
@@ -0,0 +1,211 @@
+"""
+Interned identities and the normalized bundle form.
+
+Every record of a CanonicalBundle embeds its users (and PRs their repository and
+branches), so the same few hundred people are referenced from millions of records.
+IdentityTable hands out one User / Repository instance per id, with login and name
+strings interned, so records share them instead of holding copies. The normalized
+form serializes a bundle with each user and repository written once and records
+pointing at them by id.
+"""
+from __future__ import annotations
+
+import sys
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from impact.domain.models import (
+    Branch,
+    CanonicalBundle,
+    CommentRecord,
+    Commit,
+    FileRecord,
+    PullRequest,
+    Repository,
+    ReviewRecord,
+    TimelineEvent,
+    User,
+    UserType,
+)
+from impact.exceptions import DataValidationError
+
+# Bumped whenever the normalized layout changes; denormalize_bundle refuses others.
+NORMALIZED_VERSION = 1
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value is not None else None
+
+
+class IdentityTable:
+    """
+    One User and one Repository instance per id. `make(model, **fields)` builds the
+    instances (e.g. a RecordFactory); by default they are validated.
+    """
+
+    def __init__(self, make: Optional[Callable[..., Any]] = None):
+        self.make = make or (lambda model, **fields: model(**fields))
+        self.users: Dict[int, User] = {}
+        self.repositories: Dict[int, Repository] = {}
+
+    def user(self, user_dict: Dict, default_type: UserType = UserType.USER) -> User:
+        """The interned user for a REST-shaped user dict; `default_type` applies when it has none."""
+        if not user_dict:
+            raise ValueError("Missing user")
+        uid = user_dict["id"]
+        user = self.users.get(uid)
+        if user is None:
+            user = self.users[uid] = self.make(
+                User,
+                id=uid,
+                login=_intern(user_dict["login"]),
+                avatar_url=user_dict.get("avatar_url"),
+                type=UserType(user_dict.get("type") or default_type.value),
+            )
+        return user
+
+    def repository(self, repo_dict: Dict) -> Repository:
+        """The interned repository for a REST-shaped repo dict; owners default to organizations."""
+        rid = repo_dict["id"]
+        repo = self.repositories.get(rid)
+        if repo is None:
+            repo = self.repositories[rid] = self.make(
+                Repository,
+                id=rid,
+                name=_intern(repo_dict["name"]),
+                full_name=_intern(repo_dict["full_name"]),
+                owner=self.user(repo_dict["owner"], UserType.ORGANIZATION),
+            )
+        return repo
+
+    def add_user(self, user: User) -> User:
+        return self.users.setdefault(user.id, user)
+
+    def add_repository(self, repo: Repository) -> Repository:
+        self.add_user(repo.owner)
+        return self.repositories.setdefault(repo.id, repo)
+
+
+# ---------------------------
+# Normalized serialization
+# ---------------------------
+def _plain(record, exclude: Iterable[str]) -> Dict:
+    return record.model_dump(mode="json", exclude=set(exclude))
+
+
+def normalize_bundle(bundle: CanonicalBundle) -> Dict:
+    """
+    JSON-ready dict of the bundle with every user and repository written once, under
+    "users" / "repositories", and records referencing them by id ("user", "author",
+    "repository", ...). Users and repositories only referenced from records are
+    included too.
+    """
+    table = IdentityTable()
+    for user in bundle.users:
+        table.add_user(user)
+    for repo in bundle.repositories:
+        table.add_repository(repo)
+
+    def uid(user: Optional[User]) -> Optional[int]:
+        return None if user is None else table.add_user(user).id
+
+    def rid(repo: Repository) -> int:
+        return table.add_repository(repo).id
+
+    def branch(b: Branch) -> Dict:
+        return {"label": b.label, "ref": b.ref, "sha": b.sha, "user": uid(b.user), "repo": rid(b.repo)}
+
+    pull_requests = [
+        {
+            **_plain(pr, ("user", "repository", "base", "head", "merged_by")),
+            "user": uid(pr.user),
+            "repository": rid(pr.repository),
+            "base": branch(pr.base),
+            "head": branch(pr.head),
+            "merged_by": uid(pr.merged_by),
+        }
+        for pr in bundle.pull_requests
+    ]
+    commits = [
+        {**_plain(c, ("author", "committer")), "author": uid(c.author), "committer": uid(c.committer)}
+        for c in bundle.commits
+    ]
+    reviews = [{**_plain(r, ("user",)), "user": uid(r.user)} for r in bundle.reviews]
+    comments = [{**_plain(c, ("user",)), "user": uid(c.user)} for c in bundle.comments]
+    timeline = [{**_plain(t, ("actor",)), "actor": uid(t.actor)} for t in bundle.timeline]
+    return {
+        "version": NORMALIZED_VERSION,
+        "users": [u.model_dump(mode="json") for u in table.users.values()],
+        "repositories": [{**_plain(r, ("owner",)), "owner": r.owner.id} for r in table.repositories.values()],
+        # Bundle-level lists keep their own membership (a subset of the tables above).
+        "bundle_users": [u.id for u in bundle.users],
+        "bundle_repositories": [r.id for r in bundle.repositories],
+        "pull_requests": pull_requests,
+        "commits": commits,
+        "reviews": reviews,
+        "comments": comments,
+        "files": [f.model_dump(mode="json") for f in bundle.files],
+        "timeline": timeline,
+    }
+
+
+def denormalize_bundle(data: Dict) -> CanonicalBundle:
+    """Rebuild the bundle normalize_bundle() wrote; records share one instance per user and repository."""
+    if data.get("version") != NORMALIZED_VERSION:
+        raise DataValidationError(
+            f"Unsupported normalized bundle version: {data.get('version')!r}", field="version", value=data.get("version")
+        )
+    users: Dict[int, User] = {}
+    for u in data["users"]:
+        users[u["id"]] = User(**{**u, "login": _intern(u["login"])})
+
+    def user(ref: Optional[int]) -> Optional[User]:
+        if ref is None:
+            return None
+        try:
+            return users[ref]
+        except KeyError:
+            raise DataValidationError(f"Normalized bundle references unknown user {ref}", field="users", value=ref) from None
+
+    repos: Dict[int, Repository] = {}
+    for r in data["repositories"]:
+        repos[r["id"]] = Repository(
+            id=r["id"], name=_intern(r["name"]), full_name=_intern(r["full_name"]), owner=user(r["owner"])
+        )
+
+    def repo(ref: int) -> Repository:
+        try:
+            return repos[ref]
+        except KeyError:
+            raise DataValidationError(
+                f"Normalized bundle references unknown repository {ref}", field="repositories", value=ref
+            ) from None
+
+    def branch(b: Dict) -> Branch:
+        return Branch(label=b["label"], ref=b["ref"], sha=b["sha"], user=user(b["user"]), repo=repo(b["repo"]))
+
+    pull_requests: List[PullRequest] = [
+        PullRequest(
+            **{
+                **pr,
+                "user": user(pr["user"]),
+                "repository": repo(pr["repository"]),
+                "base": branch(pr["base"]),
+                "head": branch(pr["head"]),
+                "merged_by": user(pr["merged_by"]),
+            }
+        )
+        for pr in data["pull_requests"]
+    ]
+    return CanonicalBundle(
+        users=[user(ref) for ref in data["bundle_users"]],
+        repositories=[repo(ref) for ref in data["bundle_repositories"]],
+        pull_requests=pull_requests,
+        commits=[Commit(**{**c, "author": user(c["author"]), "committer": user(c["committer"])}) for c in data["commits"]],
+        reviews=[ReviewRecord(**{**r, "user": user(r["user"])}) for r in data["reviews"]],
+        comments=[CommentRecord(**{**c, "user": user(c["user"])}) for c in data["comments"]],
+        files=[FileRecord(**f) for f in data["files"]],
+        timeline=[TimelineEvent(**{**t, "actor": user(t["actor"])}) for t in data["timeline"]],
+    )
+
+
+__all__ = ["IdentityTable", "NORMALIZED_VERSION", "denormalize_bundle", "normalize_bundle"]
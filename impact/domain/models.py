@@ -107,7 +107,7 @@ class CommentRecord(BaseModel):
 
 
 class FileRecord(BaseModel):
-    sha: str
+    sha: Optional[str] = None
     filename: str
     additions: int
     deletions: int
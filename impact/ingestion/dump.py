@@ -1,6 +1,7 @@
 import json
 import logging
 import os
+from typing import Optional
 
 from impact.ingestion.base import Ingestion
 from impact.adapters.registry import get_adapter
@@ -13,8 +14,20 @@ log = logging.getLogger(__name__)
 class DumpIngestion(Ingestion):
     """Ingests data from a filesystem dump directory."""
 
-    def __init__(self, path: str):
+    def __init__(
+        self,
+        path: str,
+        workers: Optional[int] = None,
+        trusted: Optional[bool] = None,
+        streaming: bool = False,
+    ):
         self.path = path
+        # Worker processes for parsing large JSONL dumps; None parses in this process.
+        self.workers = workers
+        # Skip per-record validation (True) or force it (False); None follows the manifest.
+        self.trusted = trusted
+        # Two-pass parse that only holds the kept PRs' records in memory.
+        self.streaming = streaming
 
     def ingest(self) -> CanonicalBundle:
         """
@@ -48,5 +61,5 @@ class DumpIngestion(Ingestion):
             )
 
         log.info("Ingesting dump from %s (provider: %s)", self.path, provider)
-        adapter = get_adapter(provider)
+        adapter = get_adapter(provider, manifest.get('store', 'jsonl'), workers=self.workers, trusted=self.trusted, streaming=self.streaming)
         return adapter.parse_dump(self.path)
@@ -1,24 +1,147 @@
 import logging
+import threading
+import time
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 from impact.domain.models import CanonicalBundle, PullRequest, ReviewRecord, CommentRecord, Commit, User, TimelineEvent, FileRecord
+from impact.ledger.records import LedgerComment, LedgerCommit, LedgerReview, LedgerTimelineEvent, LedgerUser
 
 log = logging.getLogger(__name__)
 
+_UNBUILT = object()
+
+
+def _epoch(value: datetime) -> float:
+    """Sort key of a record time; naive times are taken as UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class TimeIndex:
+    """
+    Records already sorted by time, with a parallel list of their epoch keys so a
+    [start, end] window is two bisections: O(log n + k). Naive bounds are read in
+    the timezone of the first record (UTC if it has none), as the ledger always has.
+    """
+
+    __slots__ = ("items", "keys", "tz")
+
+    def __init__(self, items: List, time_of: Callable):
+        self.items = items
+        self.keys = [_epoch(time_of(item)) for item in items]
+        self.tz = (time_of(items[0]).tzinfo if items else None) or timezone.utc
+
+    def _bound(self, value: datetime) -> float:
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=self.tz)
+        return value.timestamp()
+
+    def span(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Tuple[int, int]:
+        """Positions [lo, hi) of the records inside [start, end] (either bound optional, inclusive)."""
+        lo = bisect_left(self.keys, self._bound(start)) if start else 0
+        hi = bisect_right(self.keys, self._bound(end)) if end else len(self.keys)
+        return lo, max(lo, hi)
+
+    def window(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List:
+        if not (start or end):
+            return self.items
+        lo, hi = self.span(start, end)
+        return self.items[lo:hi]
+
+
+class _LazyIndex:
+    """
+    A Ledger index built on first access by the builder registered for it in
+    Ledger._BUILDERS. The built value is stored on the instance, which shadows this
+    (non-data) descriptor, so later reads are plain attribute lookups.
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, ledger, owner=None):
+        if ledger is None:
+            return self
+        return ledger._ensure(self.name)
+
 
 class Ledger:
     """
     In-memory, read-only ledger that builds deterministic and time-ordered indexes
     from a CanonicalBundle for query-oriented access.
+
+    Each index is built on first use, under a lock so concurrent readers build it
+    once; a report that only asks for PRs never sorts reviews or the timeline.
+    `warm()` builds them all up front (e.g. before a service starts taking requests),
+    and `index_build_seconds` records how long each builder took.
+
+    With `compact=True` reviews, comments, commits and timeline events are stored
+    as the frozen __slots__ records of impact.ledger.records (one LedgerUser per
+    user id), which read like the pydantic models but are smaller and faster to
+    access; call `.to_model()` on one to get the pydantic record back.
     """
 
-    def __init__(self, bundle: CanonicalBundle):
+    # user_login -> sorted list of PRs by created_at
+    user_prs: Dict[str, List[PullRequest]] = _LazyIndex()
+    # pr_number -> PR
+    pr_by_number: Dict[int, PullRequest] = _LazyIndex()
+    # pr_number -> sorted list of reviews by submitted_at
+    pr_reviews: Dict[int, List[ReviewRecord]] = _LazyIndex()
+    # user_login -> sorted list of reviews by submitted_at
+    user_reviews: Dict[str, List[ReviewRecord]] = _LazyIndex()
+    # pr_number / review id -> sorted list of comments by created_at
+    pr_comments: Dict[int, List[CommentRecord]] = _LazyIndex()
+    review_comments_by_review: Dict[int, List[CommentRecord]] = _LazyIndex()
+    # pr_number / author login -> sorted list of commits by date
+    pr_commits: Dict[int, List[Commit]] = _LazyIndex()
+    user_commits: Dict[str, List[Commit]] = _LazyIndex()
+    # pr_number -> files
+    pr_files: Dict[int, List[FileRecord]] = _LazyIndex()
+    # pr_number -> sorted list of timeline events by created_at
+    pr_timeline: Dict[int, List] = _LazyIndex()
+    # user_login -> the per-user lists above with parallel epoch keys, for bisect windows
+    user_pr_times: Dict[str, TimeIndex] = _LazyIndex()
+    user_commit_times: Dict[str, TimeIndex] = _LazyIndex()
+    user_review_times: Dict[str, TimeIndex] = _LazyIndex()
+    # user_login -> merged PRs sorted by merged_at, and each one's position in user_prs
+    user_merged_times: Dict[str, TimeIndex] = _LazyIndex()
+    user_merged_positions: Dict[str, List[int]] = _LazyIndex()
+
+    # index -> builder; a builder returns {index: value} for every index it produces.
+    _BUILDERS: Dict[str, str] = {
+        "user_prs": "_build_user_prs",
+        "pr_by_number": "_build_pr_by_number",
+        "pr_reviews": "_build_pr_reviews",
+        "user_reviews": "_build_user_reviews",
+        "pr_comments": "_build_pr_comments",
+        "review_comments_by_review": "_build_review_comments",
+        "pr_commits": "_build_pr_commits",
+        "user_commits": "_build_user_commits",
+        "pr_files": "_build_pr_files",
+        "pr_timeline": "_build_pr_timeline",
+        "user_pr_times": "_build_user_pr_times",
+        "user_commit_times": "_build_user_commit_times",
+        "user_review_times": "_build_user_review_times",
+        "user_merged_times": "_build_user_merged",
+        "user_merged_positions": "_build_user_merged",
+    }
+
+    def __init__(self, bundle: CanonicalBundle, compact: bool = False):
         if bundle is None:
             raise ValueError("CanonicalBundle cannot be None")
 
         self.bundle = bundle
+        self.compact = compact
+        self._users: Dict[int, LedgerUser] = {}
+        self._stored: Dict[str, List] = {}
+        # Reentrant: some builders read other indexes, building them if needed.
+        self._lock = threading.RLock()
+        # builder name -> seconds it took (including any index it had to build first)
+        self.index_build_seconds: Dict[str, float] = {}
 
         log.debug(
             "Initializing Ledger with %d PRs, %d reviews, %d commits, %d comments",
@@ -28,112 +151,116 @@ class Ledger:
             len(bundle.comments),
         )
 
-        # Indexes: user_login -> sorted list of PRs by created_at
-        self.user_prs: Dict[str, List[PullRequest]] = defaultdict(list)
-
-        # pr_number -> sorted list of reviews by submitted_at
-        self.pr_reviews: Dict[int, List[ReviewRecord]] = defaultdict(list)
-
-        # pr_number -> sorted list of comments by created_at
-        self.pr_comments: Dict[int, List[CommentRecord]] = defaultdict(list)
-        self.review_comments_by_review: Dict[int, List[CommentRecord]] = defaultdict(list)
-
-        # pr_number -> sorted list of commits by date
-        self.pr_commits: Dict[int, List[Commit]] = defaultdict(list)
-        # pr_number -> files
-        self.pr_files: Dict[int, List[FileRecord]] = defaultdict(list)
-
-        # user_login -> sorted list of commits by date
-        self.user_commits: Dict[str, List[Commit]] = defaultdict(list)
-
-        # user_login -> sorted list of reviews by submitted_at
-        self.user_reviews: Dict[str, List[ReviewRecord]] = defaultdict(list)
-
-        # Populate indexes
-        self._build_indexes()
-        # PR lookup
-        self.pr_by_number: Dict[int, PullRequest] = {pr.number: pr for pr in self.bundle.pull_requests}
-        # Timeline indexes
-        self.pr_timeline: Dict[int, List] = defaultdict(list)
-        self._build_timeline_indexes()
-
-    def _build_indexes(self):
-        # PRs by user
-        for pr in self.bundle.pull_requests:
-            self.user_prs[pr.user.login].append(pr)
-
-        for user_prs in self.user_prs.values():
-            user_prs.sort(key=lambda p: p.created_at)
-
-        # Reviews by PR
-        for review in self.bundle.reviews:
-            self.pr_reviews[review.pull_request_number].append(review)
-            self.user_reviews[review.user.login].append(review)
-
-        for reviews in self.pr_reviews.values():
-            reviews.sort(key=lambda r: r.submitted_at)
-
-        for reviews in self.user_reviews.values():
-            reviews.sort(key=lambda r: r.submitted_at)
-
-        # Comments by PR
-        for comment in self.bundle.comments:
-            if comment.pull_request_number:
-                self.pr_comments[comment.pull_request_number].append(comment)
-            if comment.review_id:
-                self.review_comments_by_review[comment.review_id].append(comment)
-
-        for comments in self.pr_comments.values():
-            comments.sort(key=lambda c: c.created_at)
-        for comments in self.review_comments_by_review.values():
-            comments.sort(key=lambda c: c.created_at)
-
-        # Commits by PR and by user
-        for commit in self.bundle.commits:
-            if commit.pull_request_number:
-                self.pr_commits[commit.pull_request_number].append(commit)
-            self.user_commits[commit.author.login].append(commit)
-
-        for commits in self.pr_commits.values():
-            commits.sort(key=lambda c: c.date)
-
-        for commits in self.user_commits.values():
-            commits.sort(key=lambda c: c.date)
-
-        # Files by PR
-        if hasattr(self.bundle, "files"):
-            for file in self.bundle.files:
-                self.pr_files[file.pull_request_number].append(file)
-
-    def _build_timeline_indexes(self):
-        if not hasattr(self.bundle, "timeline"):
-            return
-        for evt in getattr(self.bundle, "timeline", []):
-            self.pr_timeline[evt.pull_request_number].append(evt)
-        for events in self.pr_timeline.values():
-            events.sort(key=lambda e: e.created_at)
+    def _ensure(self, name: str):
+        """The index `name`, building it (once, whatever the number of threads asking) if needed."""
+        value = self.__dict__.get(name, _UNBUILT)
+        if value is not _UNBUILT:
+            return value
+        with self._lock:
+            if name not in self.__dict__:
+                builder = self._BUILDERS[name]
+                started = time.perf_counter()
+                built = getattr(self, builder)()
+                self.index_build_seconds[builder] = time.perf_counter() - started
+                log.debug("Ledger index %s built in %.3fs", builder, self.index_build_seconds[builder])
+                # Published only once complete; readers outside the lock see all or nothing.
+                self.__dict__.update(built)
+            return self.__dict__[name]
+
+    def warm(self, indexes: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """Build `indexes` (default: all) now; returns index_build_seconds."""
+        for name in indexes if indexes is not None else self._BUILDERS:
+            if name not in self._BUILDERS:
+                raise ValueError(f"Unknown ledger index {name!r}")
+            self._ensure(name)
+        return dict(self.index_build_seconds)
+
+    def _records(self, kind: str, record_type: type) -> List:
+        """The bundle's records of `kind` as the ledger stores them; compact ones are converted once."""
+        records = getattr(self.bundle, kind, [])
+        if not self.compact:
+            return records
+        if kind not in self._stored:
+            self._stored[kind] = [record_type.from_model(record, self._users) for record in records]
+        return self._stored[kind]
+
+    @staticmethod
+    def _group(records: Iterable, key: Callable, sort_key: Optional[Callable] = None) -> Dict:
+        groups = defaultdict(list)
+        for record in records:
+            k = key(record)
+            if k is not None:
+                groups[k].append(record)
+        if sort_key is not None:
+            for items in groups.values():
+                items.sort(key=sort_key)
+        return groups
+
+    # ---------------------------
+    # Index builders
+    # ---------------------------
+    def _build_user_prs(self):
+        return {"user_prs": self._group(self.bundle.pull_requests, lambda p: p.user.login, lambda p: p.created_at)}
+
+    def _build_pr_by_number(self):
+        return {"pr_by_number": {pr.number: pr for pr in self.bundle.pull_requests}}
+
+    def _build_pr_reviews(self):
+        reviews = self._records("reviews", LedgerReview)
+        return {"pr_reviews": self._group(reviews, lambda r: r.pull_request_number, lambda r: r.submitted_at)}
+
+    def _build_user_reviews(self):
+        reviews = self._records("reviews", LedgerReview)
+        return {"user_reviews": self._group(reviews, lambda r: r.user.login, lambda r: r.submitted_at)}
+
+    def _build_pr_comments(self):
+        comments = self._records("comments", LedgerComment)
+        return {"pr_comments": self._group(comments, lambda c: c.pull_request_number or None, lambda c: c.created_at)}
+
+    def _build_review_comments(self):
+        comments = self._records("comments", LedgerComment)
+        return {"review_comments_by_review": self._group(comments, lambda c: c.review_id or None, lambda c: c.created_at)}
+
+    def _build_pr_commits(self):
+        commits = self._records("commits", LedgerCommit)
+        return {"pr_commits": self._group(commits, lambda c: c.pull_request_number or None, lambda c: c.date)}
+
+    def _build_user_commits(self):
+        commits = self._records("commits", LedgerCommit)
+        return {"user_commits": self._group(commits, lambda c: c.author.login, lambda c: c.date)}
+
+    def _build_pr_files(self):
+        return {"pr_files": self._group(getattr(self.bundle, "files", []), lambda f: f.pull_request_number)}
+
+    def _build_pr_timeline(self):
+        events = self._records("timeline", LedgerTimelineEvent)
+        return {"pr_timeline": self._group(events, lambda e: e.pull_request_number, lambda e: e.created_at)}
+
+    def _build_user_pr_times(self):
+        return {"user_pr_times": {login: TimeIndex(prs, lambda p: p.created_at) for login, prs in self.user_prs.items()}}
+
+    def _build_user_commit_times(self):
+        return {"user_commit_times": {login: TimeIndex(c, lambda c: c.date) for login, c in self.user_commits.items()}}
+
+    def _build_user_review_times(self):
+        return {
+            "user_review_times": {login: TimeIndex(r, lambda r: r.submitted_at) for login, r in self.user_reviews.items()}
+        }
+
+    def _build_user_merged(self):
+        times: Dict[str, TimeIndex] = {}
+        positions: Dict[str, List[int]] = {}
+        for login, prs in self.user_prs.items():
+            merged = [i for i, pr in enumerate(prs) if pr.merged and pr.merged_at]
+            merged.sort(key=lambda i: _epoch(prs[i].merged_at))
+            times[login] = TimeIndex([prs[i] for i in merged], lambda p: p.merged_at)
+            positions[login] = merged
+        return {"user_merged_times": times, "user_merged_positions": positions}
 
     def get_prs_for_user(self, user_login: str, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> List[PullRequest]:
         """Get PRs for a user within an optional time period."""
-        prs = self.user_prs.get(user_login, [])
-        if start_date or end_date:
-            if prs:
-                tz = prs[0].created_at.tzinfo or timezone.utc
-            else:
-                tz = timezone.utc
-            if start_date and start_date.tzinfo is None:
-                start_date = start_date.replace(tzinfo=tz)
-            if end_date and end_date.tzinfo is None:
-                end_date = end_date.replace(tzinfo=tz)
-            filtered = []
-            for pr in prs:
-                if start_date and pr.created_at < start_date:
-                    continue
-                if end_date and pr.created_at > end_date:
-                    continue
-                filtered.append(pr)
-            return filtered
-        return prs
+        index = self.user_pr_times.get(user_login)
+        return index.window(start_date, end_date) if index else []
 
     def get_reviews_for_pr(self, pr_number: int) -> List[ReviewRecord]:
         """Get reviews for a PR, time-ordered."""
@@ -149,41 +276,13 @@ class Ledger:
 
     def get_commits_for_user(self, user_login: str, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> List[Commit]:
         """Get commits for a user within an optional time period."""
-        commits = self.user_commits.get(user_login, [])
-        if start_date or end_date:
-            tz = commits[0].date.tzinfo if commits else timezone.utc
-            if start_date and start_date.tzinfo is None:
-                start_date = start_date.replace(tzinfo=tz)
-            if end_date and end_date.tzinfo is None:
-                end_date = end_date.replace(tzinfo=tz)
-            filtered = []
-            for commit in commits:
-                if start_date and commit.date < start_date:
-                    continue
-                if end_date and commit.date > end_date:
-                    continue
-                filtered.append(commit)
-            return filtered
-        return commits
+        index = self.user_commit_times.get(user_login)
+        return index.window(start_date, end_date) if index else []
 
     def get_reviews_for_user(self, user_login: str, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> List[ReviewRecord]:
         """Get reviews for a user within an optional time period."""
-        reviews = self.user_reviews.get(user_login, [])
-        if start_date or end_date:
-            tz = reviews[0].submitted_at.tzinfo if reviews else timezone.utc
-            if start_date and start_date.tzinfo is None:
-                start_date = start_date.replace(tzinfo=tz)
-            if end_date and end_date.tzinfo is None:
-                end_date = end_date.replace(tzinfo=tz)
-            filtered = []
-            for review in reviews:
-                if start_date and review.submitted_at < start_date:
-                    continue
-                if end_date and review.submitted_at > end_date:
-                    continue
-                filtered.append(review)
-            return filtered
-        return reviews
+        index = self.user_review_times.get(user_login)
+        return index.window(start_date, end_date) if index else []
 
     def get_timeline_for_pr(self, pr_number: int) -> List:
         """Get timeline events for a PR, time-ordered."""
@@ -199,22 +298,10 @@ class Ledger:
         return self.review_comments_by_review.get(review_id, [])
 
     def get_merged_prs_for_user(self, user_login: str, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> List[PullRequest]:
-        """Get merged PRs for a user within an optional time period (filtered by merged_at)."""
-        prs = self.user_prs.get(user_login, [])
-        if not prs:
+        """Get merged PRs for a user within an optional time period (filtered by merged_at), in created_at order."""
+        index = self.user_merged_times.get(user_login)
+        if not index:
             return []
-        tz = prs[0].created_at.tzinfo or timezone.utc
-        if start_date and start_date.tzinfo is None:
-            start_date = start_date.replace(tzinfo=tz)
-        if end_date and end_date.tzinfo is None:
-            end_date = end_date.replace(tzinfo=tz)
-        filtered = []
-        for pr in prs:
-            if not pr.merged or not pr.merged_at:
-                continue
-            if start_date and pr.merged_at < start_date:
-                continue
-            if end_date and pr.merged_at > end_date:
-                continue
-            filtered.append(pr)
-        return filtered
+        lo, hi = index.span(start_date, end_date)
+        prs = self.user_prs[user_login]
+        return [prs[i] for i in sorted(self.user_merged_positions[user_login][lo:hi])]
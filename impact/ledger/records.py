@@ -0,0 +1,142 @@
+"""
+Frozen, __slots__ record types for the Ledger's internal storage.
+
+They carry the same fields as the pydantic models in impact.domain.models, so
+metrics read them the same way (`review.user.login`, `event.created_at`, ...), but
+without a per-instance __dict__ or pydantic's attribute machinery. Convert with
+`from_model()` when building a ledger and `to_model()` when handing records back
+out of it.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import ClassVar, Dict, FrozenSet, Optional, Tuple
+
+from impact.domain.models import (
+    CommentRecord,
+    CommentType,
+    Commit,
+    ReviewRecord,
+    ReviewState,
+    TimelineEvent,
+    User,
+    UserType,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class LedgerUser:
+    id: int
+    login: str
+    avatar_url: Optional[str] = None
+    type: UserType = UserType.USER
+
+    @classmethod
+    def from_model(cls, user: User, users: Optional[Dict[int, "LedgerUser"]] = None) -> "LedgerUser":
+        """The compact user; `users` caches one instance per id across records."""
+        if users is not None and user.id in users:
+            return users[user.id]
+        compact = cls(user.id, user.login, user.avatar_url, user.type)
+        if users is not None:
+            users[user.id] = compact
+        return compact
+
+    def to_model(self) -> User:
+        return User.model_construct(id=self.id, login=self.login, avatar_url=self.avatar_url, type=self.type)
+
+
+class _SlotsRecord:
+    """Conversion shared by the record types below; subclasses set MODEL and USER_FIELDS."""
+
+    __slots__ = ()
+    MODEL: ClassVar[type]
+    USER_FIELDS: ClassVar[FrozenSet[str]] = frozenset()
+    _names: ClassVar[Tuple[str, ...]]
+
+    @classmethod
+    def from_model(cls, record, users: Optional[Dict[int, LedgerUser]] = None):
+        values = [getattr(record, name) for name in cls._names]
+        for i, name in enumerate(cls._names):
+            if name in cls.USER_FIELDS:
+                values[i] = LedgerUser.from_model(values[i], users)
+        return cls(*values)
+
+    def to_model(self):
+        # The values came out of a validated model, so they need no second validation.
+        values = {name: getattr(self, name) for name in self._names}
+        for name in self.USER_FIELDS:
+            values[name] = values[name].to_model()
+        return self.MODEL.model_construct(**values)
+
+
+@dataclass(frozen=True, slots=True)
+class LedgerReview(_SlotsRecord):
+    MODEL: ClassVar[type] = ReviewRecord
+    USER_FIELDS: ClassVar[FrozenSet[str]] = frozenset({"user"})
+
+    id: int
+    user: LedgerUser
+    body: Optional[str]
+    state: ReviewState
+    submitted_at: datetime
+    pull_request_number: int
+
+
+@dataclass(frozen=True, slots=True)
+class LedgerCommit(_SlotsRecord):
+    MODEL: ClassVar[type] = Commit
+    USER_FIELDS: ClassVar[FrozenSet[str]] = frozenset({"author", "committer"})
+
+    sha: str
+    author: LedgerUser
+    committer: LedgerUser
+    message: str
+    date: datetime
+    pull_request_number: Optional[int] = None
+    idx: Optional[int] = None
+
+
+@dataclass(frozen=True, slots=True)
+class LedgerComment(_SlotsRecord):
+    MODEL: ClassVar[type] = CommentRecord
+    USER_FIELDS: ClassVar[FrozenSet[str]] = frozenset({"user"})
+
+    id: int
+    user: LedgerUser
+    body: str
+    created_at: datetime
+    updated_at: Optional[datetime]
+    type: CommentType
+    pull_request_number: Optional[int] = None
+    review_id: Optional[int] = None
+    in_reply_to_id: Optional[int] = None
+    path: Optional[str] = None
+    position: Optional[int] = None
+
+
+@dataclass(frozen=True, slots=True)
+class LedgerTimelineEvent(_SlotsRecord):
+    MODEL: ClassVar[type] = TimelineEvent
+    USER_FIELDS: ClassVar[FrozenSet[str]] = frozenset({"actor"})
+
+    id: int
+    node_id: Optional[str]
+    url: Optional[str]
+    event: str
+    actor: LedgerUser
+    created_at: datetime
+    pull_request_number: int
+    commit_id: Optional[str] = None
+    commit_url: Optional[str] = None
+    comment_id: Optional[int] = None
+    state: Optional[str] = None
+    html_url: Optional[str] = None
+
+
+for _cls in (LedgerReview, LedgerCommit, LedgerComment, LedgerTimelineEvent):
+    _cls._names = tuple(f.name for f in fields(_cls))
+del _cls
+
+
+__all__ = ["LedgerComment", "LedgerCommit", "LedgerReview", "LedgerTimelineEvent", "LedgerUser"]
@@ -1,3 +1,5 @@
+from typing import Iterable, Set
+
 from impact.metrics.plugins.pr_merge_effectiveness import PRMergeEffectiveness
 from impact.metrics.plugins.review_leverage import ReviewLeverage
 from impact.metrics.plugins.pr_throughput import PRThroughput
@@ -14,3 +16,9 @@ def get_metrics():
         'time_to_first_review': TimeToFirstReview,
         'slow_review_response': SlowReviewResponse,
     }
+
+
+def required_resources(slugs: Iterable[str]) -> Set[str]:
+    """Union of the record kinds the given metrics read (see Metric.requires); unknown slugs are ignored."""
+    metrics = get_metrics()
+    return set().union(*(metrics[slug].requires for slug in slugs if slug in metrics))
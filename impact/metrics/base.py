@@ -1,8 +1,15 @@
 from abc import ABC, abstractmethod
+from typing import FrozenSet
+
 from impact.domain.models import MetricContext, MetricResult
 
 
 class Metric(ABC):
+    # Canonical record kinds this metric reads besides the pull requests themselves:
+    # any of "reviews", "review_comments", "issue_comments", "commits", "files", "timeline".
+    # Live fetches for a set of metrics only download the union of these.
+    requires: FrozenSet[str] = frozenset()
+
     @property
     @abstractmethod
     def slug(self) -> str:
@@ -21,6 +21,8 @@ class PRMergeEffectiveness(Metric):
         - pr_details: Per-PR breakdown with interaction types
     """
 
+    requires = frozenset({"reviews", "review_comments", "issue_comments", "timeline"})
+
     @property
     def slug(self) -> str:
         return "pr_merge_effectiveness"
@@ -30,6 +30,8 @@ class ReviewLeverage(Metric):
         - merged_after_review: PRs merged after review
     """
 
+    requires = frozenset({"reviews", "review_comments", "commits", "files", "timeline"})
+
     @property
     def slug(self) -> str:
         return "review_leverage"
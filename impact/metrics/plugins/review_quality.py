@@ -10,6 +10,8 @@ class ReviewIterations(Metric):
     Count how many change-request cycles a PR authored by the user went through before merge.
     """
 
+    requires = frozenset({"reviews", "review_comments"})
+
     @property
     def slug(self) -> str:
         return "review_iterations"
@@ -45,6 +47,8 @@ class TimeToFirstReview(Metric):
     Time from PR creation to first review by someone other than the author.
     """
 
+    requires = frozenset({"reviews"})
+
     @property
     def slug(self) -> str:
         return "time_to_first_review"
@@ -86,6 +90,8 @@ class SlowReviewResponse(Metric):
     Measures how long it takes the PR author to push a new commit after a changes-requested review.
     """
 
+    requires = frozenset({"reviews", "commits"})
+
     @property
     def slug(self) -> str:
         return "slow_review_response"
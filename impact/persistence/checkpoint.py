@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+JOURNAL_FILE = "fetch_journal.jsonl"
+
+
+def _parse_ts(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class FetchJournal:
+    """
+    Append-only checkpoint journal kept next to a dump's canonical files.
+
+    One line is appended (and flushed) per PR bundle once it has been fully
+    written, recording the PR's `updated_at` and which bundle resources were
+    fetched (None = all). A rerun into the same directory loads the journal and
+    skips PRs that are finished, unchanged and fetched with every resource it
+    needs; a torn last line from a crash is ignored.
+    """
+
+    def __init__(self, base_dir: Path):
+        self.path = Path(base_dir) / JOURNAL_FILE
+        self._lock = threading.Lock()
+        # (repo, number) -> (updated_at, fetched resources or None for all) as recorded
+        self._done: Dict[Tuple[str, int], Tuple[Optional[str], Optional[FrozenSet[str]]]] = {}
+        if self.path.exists():
+            self._load()
+
+    def _load(self):
+        with self.path.open() as f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    log.warning("Ignoring unreadable journal line %s in %s", line_number, self.path)
+                    continue
+                key = (entry["repo"], int(entry["number"]))
+                if entry.get("forgotten"):
+                    self._done.pop(key, None)
+                else:
+                    resources = entry.get("resources")
+                    self._done[key] = (entry.get("updated_at"), None if resources is None else frozenset(resources))
+
+    def _append(self, entry: Dict):
+        with self.path.open("a") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def is_current(
+        self, repo: str, number: int, updated_at: Optional[str], resources: Optional[Iterable[str]] = None
+    ) -> bool:
+        """True if the PR was fetched with (at least) `resources` and has not been updated since."""
+        key = (repo, number)
+        if key not in self._done:
+            return False
+        recorded_at, fetched = self._done[key]
+        if fetched is not None and (resources is None or not set(resources) <= fetched):
+            return False
+        recorded = _parse_ts(recorded_at)
+        seen = _parse_ts(updated_at)
+        if recorded is None or seen is None:
+            return recorded is not None
+        return seen <= recorded
+
+    def record(self, repo: str, number: int, updated_at: Optional[str], resources: Optional[Iterable[str]] = None):
+        fetched = None if resources is None else frozenset(resources)
+        with self._lock:
+            self._done[(repo, number)] = (updated_at, fetched)
+            self._append(
+                {
+                    "repo": repo,
+                    "number": number,
+                    "updated_at": updated_at,
+                    "resources": None if fetched is None else sorted(fetched),
+                    "fetched_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+                }
+            )
+
+    def forget(self, keys: Iterable[Tuple[str, int]]):
+        """Drop these (repo, number) PRs from the journal."""
+        with self._lock:
+            for key in [k for k in set(keys) if k in self._done]:
+                del self._done[key]
+                self._append({"repo": key[0], "number": key[1], "forgotten": True})
+
+    def keys(self) -> List[Tuple[str, int]]:
+        return list(self._done)
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+
+__all__ = ["FetchJournal", "JOURNAL_FILE"]
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Union
+
+try:  # optional: pip install devrank[orjson]
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without the extra
+    orjson = None
+
+# Distinct timestamp strings remembered by parse_timestamp. A dump repeats the same
+# instants across files (PR created_at, commit dates, timeline events), and records
+# parsed for the window check are parsed again when their model is built.
+TIMESTAMP_CACHE_SIZE = 1 << 16
+
+
+def _json_loads(data: Union[str, bytes]) -> Any:
+    return json.loads(data)
+
+
+# Decoder for dump lines: orjson when installed (several times faster), else the stdlib.
+loads: Callable[[Union[str, bytes]], Any] = orjson.loads if orjson is not None else _json_loads
+DECODER = "orjson" if orjson is not None else "json"
+
+
+@lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
+def parse_timestamp(value: str) -> datetime:
+    """GitHub ISO-8601 timestamp ("...Z") -> aware datetime, parsed once per distinct string."""
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+__all__ = ["DECODER", "TIMESTAMP_CACHE_SIZE", "loads", "parse_timestamp"]
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import gzip
+import io
+from pathlib import Path
+from typing import IO, Optional, Tuple
+
+try:  # optional: pip install devrank[zstd]
+    import zstandard
+except ImportError:  # pragma: no cover - exercised only without the extra
+    zstandard = None
+
+# Dump compression name (as recorded in dump_manifest.json) -> file suffix.
+COMPRESSION_SUFFIXES = {
+    None: "",
+    "gzip": ".gz",
+    "zstd": ".zst",
+}
+# zstd level 3 is the library default: fast, and JSONL compresses well at it.
+ZSTD_LEVEL = 3
+GZIP_LEVEL = 6
+
+
+def check_compression(compression: Optional[str]):
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"Unknown dump compression {compression!r}; expected one of gzip, zstd or none")
+    if compression == "zstd" and zstandard is None:
+        raise ImportError("zstd-compressed dumps need the 'zstandard' package (pip install devrank[zstd])")
+
+
+def dump_path(directory: Path, fname: str, compression: Optional[str] = None) -> Path:
+    """Path of canonical file `fname` (e.g. "reviews.jsonl") under the given compression."""
+    check_compression(compression)
+    return Path(directory) / (fname + COMPRESSION_SUFFIXES[compression])
+
+
+def find_dump_file(directory: Path, fname: str) -> Optional[Tuple[Path, Optional[str]]]:
+    """The existing (path, compression) of canonical file `fname`, whichever format it was written in."""
+    for compression, suffix in COMPRESSION_SUFFIXES.items():
+        path = Path(directory) / (fname + suffix)
+        if path.exists():
+            return path, compression
+    return None
+
+
+def open_text(path: Path, mode: str = "r", compression: Optional[str] = None, buffering: int = -1) -> IO[str]:
+    """
+    Open a (possibly compressed) JSONL file as text, streaming in both directions.
+    Appending adds a new gzip member / zstd frame; readers decode across them.
+    """
+    check_compression(compression)
+    if mode not in ("r", "w", "a"):
+        raise ValueError(f"Unsupported mode {mode!r}")
+    if compression is None:
+        return open(path, mode, buffering=buffering, encoding="utf-8")
+    if compression == "gzip":
+        return gzip.open(path, mode + "t", compresslevel=GZIP_LEVEL, encoding="utf-8")
+    raw = open(path, mode + "b")
+    if mode == "r":
+        stream = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True, closefd=True)
+        return io.TextIOWrapper(io.BufferedReader(stream), encoding="utf-8")
+    stream = zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(raw, closefd=True)
+    return io.TextIOWrapper(stream, encoding="utf-8", write_through=False)
+
+
+__all__ = ["COMPRESSION_SUFFIXES", "check_compression", "dump_path", "find_dump_file", "open_text"]
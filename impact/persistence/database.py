@@ -1,2 +1,353 @@
-# Placeholder for future database persistence (write/read CanonicalBundle to DB).
-# To be implemented with chosen ORM/driver.
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from impact.persistence.codec import loads
+from impact.persistence.filesystem import CANONICAL_FILES, DEFAULT_BATCH_SIZE, FLUSH_INTERVAL, bundle_records
+from impact.persistence.index import RECORD_FIELDS, epoch_seconds
+
+log = logging.getLogger(__name__)
+
+DB_FILE = "dump.sqlite"
+
+# Normalized layout: one row per canonical record, with the acting user(s) moved to
+# `users` and the columns the adapter filters on (repo, PR number, timestamp) lifted
+# out of the JSON. `row` keeps dump order; the UNIQUE keys make refetches upserts.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY,
+    login TEXT NOT NULL,
+    type TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS users_login ON users (login);
+
+CREATE TABLE IF NOT EXISTS pull_requests (
+    row INTEGER PRIMARY KEY,
+    repo TEXT NOT NULL,
+    pr_number INTEGER NOT NULL,
+    id INTEGER,
+    user_id INTEGER REFERENCES users (id),
+    ts REAL,
+    updated_at TEXT,
+    data TEXT NOT NULL,
+    UNIQUE (repo, pr_number)
+);
+CREATE INDEX IF NOT EXISTS pull_requests_user_ts ON pull_requests (user_id, ts);
+CREATE INDEX IF NOT EXISTS pull_requests_ts ON pull_requests (ts);
+
+CREATE TABLE IF NOT EXISTS reviews (
+    row INTEGER PRIMARY KEY,
+    repo TEXT NOT NULL,
+    pr_number INTEGER NOT NULL,
+    id INTEGER NOT NULL,
+    user_id INTEGER REFERENCES users (id),
+    ts REAL,
+    data TEXT NOT NULL,
+    UNIQUE (id)
+);
+CREATE INDEX IF NOT EXISTS reviews_pr ON reviews (repo, pr_number);
+CREATE INDEX IF NOT EXISTS reviews_user_ts ON reviews (user_id, ts);
+CREATE INDEX IF NOT EXISTS reviews_ts ON reviews (ts);
+
+CREATE TABLE IF NOT EXISTS comments (
+    row INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    repo TEXT NOT NULL,
+    pr_number INTEGER NOT NULL,
+    id INTEGER NOT NULL,
+    user_id INTEGER REFERENCES users (id),
+    ts REAL,
+    data TEXT NOT NULL,
+    UNIQUE (kind, id)
+);
+CREATE INDEX IF NOT EXISTS comments_pr ON comments (repo, pr_number);
+CREATE INDEX IF NOT EXISTS comments_user_ts ON comments (user_id, ts);
+CREATE INDEX IF NOT EXISTS comments_ts ON comments (ts);
+
+CREATE TABLE IF NOT EXISTS commits (
+    row INTEGER PRIMARY KEY,
+    repo TEXT NOT NULL,
+    pr_number INTEGER NOT NULL,
+    sha TEXT NOT NULL,
+    user_id INTEGER REFERENCES users (id),
+    committer_id INTEGER REFERENCES users (id),
+    ts REAL,
+    data TEXT NOT NULL,
+    UNIQUE (repo, pr_number, sha)
+);
+CREATE INDEX IF NOT EXISTS commits_user_ts ON commits (user_id, ts);
+CREATE INDEX IF NOT EXISTS commits_ts ON commits (ts);
+
+CREATE TABLE IF NOT EXISTS files (
+    row INTEGER PRIMARY KEY,
+    repo TEXT NOT NULL,
+    pr_number INTEGER NOT NULL,
+    filename TEXT NOT NULL,
+    data TEXT NOT NULL,
+    UNIQUE (repo, pr_number, filename)
+);
+
+CREATE TABLE IF NOT EXISTS timeline (
+    row INTEGER PRIMARY KEY,
+    repo TEXT NOT NULL,
+    pr_number INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    user_id INTEGER REFERENCES users (id),
+    ts REAL,
+    data TEXT NOT NULL,
+    UNIQUE (repo, pr_number, seq)
+);
+CREATE INDEX IF NOT EXISTS timeline_user_ts ON timeline (user_id, ts);
+CREATE INDEX IF NOT EXISTS timeline_ts ON timeline (ts);
+"""
+
+# Bundle kind -> (table, comment kind, user columns as (column, record field), natural key).
+# A record's `ts` is the timestamp GitHubAdapter windows it on (see index.RECORD_FIELDS).
+TABLES: Dict[str, Tuple[str, Optional[str], Tuple[Tuple[str, str], ...], Tuple[str, ...]]] = {
+    "pull_request": ("pull_requests", None, (("user_id", "user"),), ("repo", "pr_number")),
+    "reviews": ("reviews", None, (("user_id", "user"),), ("id",)),
+    "review_comments": ("comments", "review", (("user_id", "user"),), ("kind", "id")),
+    "issue_comments": ("comments", "issue", (("user_id", "user"),), ("kind", "id")),
+    "commits": ("commits", None, (("user_id", "author"), ("committer_id", "committer")), ("repo", "pr_number", "sha")),
+    "files": ("files", None, (), ("repo", "pr_number", "filename")),
+    "timeline": ("timeline", None, (("user_id", "actor"),), ("repo", "pr_number", "seq")),
+}
+
+
+class SQLiteDumpStore:
+    """
+    Stores canonical GitHub dumps in an embedded SQLite database (`dump.sqlite`)
+    instead of JSONL files, next to the usual dump_manifest.json.
+
+    It speaks the same interface as FileSystemDumpWriter, so GitHubLiveFetcher can
+    write to either. Writing a bundle replaces whatever the store held for that PR,
+    so refetches are upserts. Used as a context manager, commits are batched like the
+    file writer's flushes and each bundle's `on_written` callback runs after its
+    batch is committed. Readers (GitHubSQLiteAdapter) use `acted_pr_numbers` and
+    `iter_records` to filter by user and window on indexed columns.
+    """
+
+    compression = None
+
+    def __init__(
+        self,
+        base_dir: Path,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = FLUSH_INTERVAL,
+        readonly: bool = False,
+    ):
+        self.base_dir = Path(base_dir)
+        self.path = self.base_dir / DB_FILE
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._streaming = False
+        self._pending: List[Callable[[], None]] = []
+        self._last_commit = time.monotonic()
+        if readonly:
+            self.conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, isolation_level=None, check_same_thread=False)
+        else:
+            self.base_dir.mkdir(parents=True, exist_ok=True)
+            self.conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            # FULL syncs every commit, so a checkpointed PR is always on disk.
+            self.conn.execute("PRAGMA synchronous=FULL")
+            self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def write_manifest(self, manifest: Dict):
+        path = self.base_dir / "dump_manifest.json"
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(manifest, indent=2))
+        tmp.replace(path)
+
+    def read_manifest(self) -> Optional[Dict]:
+        path = self.base_dir / "dump_manifest.json"
+        if not path.exists():
+            return None
+        return json.loads(path.read_text())
+
+    # ---------------------------
+    # Reads
+    # ---------------------------
+    def iter_records(
+        self,
+        key: str,
+        numbers: Optional[Iterable[int]] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> Iterator[Dict]:
+        """
+        Records of bundle kind `key` in dump order, shaped as the JSONL dump stores
+        them. Optionally only those of PRs `numbers` and timestamped (epoch seconds)
+        within [start, end]; files have no timestamp and ignore the window.
+        """
+        table, kind, user_columns, _ = TABLES[key]
+        select = ["t.data"] + [f"u{i}.data" for i in range(len(user_columns))]
+        joins = [f"LEFT JOIN users u{i} ON u{i}.id = t.{column}" for i, (column, _) in enumerate(user_columns)]
+        where, params = [], []
+        if kind is not None:
+            where.append("t.kind = ?")
+            params.append(kind)
+        if numbers is not None:
+            where.append("t.pr_number IN (SELECT value FROM json_each(?))")
+            params.append(json.dumps(sorted(numbers)))
+        if table != "files" and start is not None and end is not None:
+            where.append("t.ts BETWEEN ? AND ?")
+            params += [start, end]
+        sql = f"SELECT {', '.join(select)} FROM {table} t {' '.join(joins)}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        for row in self.conn.execute(sql + " ORDER BY t.row", params):
+            item = loads(row[0])
+            for (_, field), user in zip(user_columns, row[1:]):
+                if user is not None:
+                    item[field] = loads(user)
+            yield item
+
+    def acted_pr_numbers(self, login: str, start: float, end: float) -> Set[int]:
+        """Numbers of PRs `login` authored or acted on (reviewed, commented, committed, timeline) within [start, end]."""
+        selects = [
+            f"SELECT t.pr_number FROM {table} t JOIN users u ON u.id = t.user_id WHERE u.login = ? AND t.ts BETWEEN ? AND ?"
+            for table in ("pull_requests", "reviews", "comments", "commits", "timeline")
+        ]
+        rows = self.conn.execute(" UNION ".join(selects), [login, start, end] * len(selects))
+        return {number for (number,) in rows}
+
+    def pr_numbers(self) -> Set[int]:
+        """Numbers of the PRs already in the store."""
+        return {number for (number,) in self.conn.execute("SELECT pr_number FROM pull_requests")}
+
+    # ---------------------------
+    # Writes
+    # ---------------------------
+    def pr_keys(self) -> Set[Tuple[str, int]]:
+        """(repo, number) of the PRs already in the store."""
+        return set(self.conn.execute("SELECT repo, pr_number FROM pull_requests"))
+
+    def drop_prs(self, keys: Iterable[Tuple[str, int]]):
+        """Remove every record belonging to these (repo, number) PRs."""
+        keys = sorted(set(keys))
+        with self._lock:
+            self._begin()
+            for table in {spec[0] for spec in TABLES.values()}:
+                self.conn.executemany(f"DELETE FROM {table} WHERE repo = ? AND pr_number = ?", keys)
+            self._commit()
+
+    def _begin(self):
+        if not self.conn.in_transaction:
+            self.conn.execute("BEGIN")
+
+    def _commit(self):
+        if self.conn.in_transaction:
+            self.conn.execute("COMMIT")
+        self._last_commit = time.monotonic()
+        pending, self._pending = self._pending, []
+        for callback in pending:
+            callback()
+
+    def _upsert_user(self, user) -> Optional[int]:
+        if not isinstance(user, dict) or user.get("id") is None:
+            return None
+        self.conn.execute(
+            "INSERT INTO users (id, login, type, data) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (id) DO UPDATE SET login = excluded.login, type = excluded.type, data = excluded.data",
+            (user["id"], user.get("login"), user.get("type"), json.dumps(user)),
+        )
+        return user["id"]
+
+    def _insert(self, key: str, repo: str, pr_number: int, seq: int, item: Dict):
+        table, kind, user_columns, natural_key = TABLES[key]
+        item = dict(item)
+        row = {"repo": repo, "pr_number": pr_number}
+        for column, field in user_columns:
+            user_id = self._upsert_user(item.get(field))
+            row[column] = user_id
+            if user_id is not None:
+                del item[field]  # stored once in `users`
+        if table != "files":
+            row["ts"] = epoch_seconds(RECORD_FIELDS[CANONICAL_FILES[key]](item)[1])
+        if kind is not None:
+            row["kind"] = kind
+        if table in ("pull_requests", "reviews", "comments"):
+            row["id"] = item.get("id")
+        if table == "pull_requests":
+            row["updated_at"] = item.get("updated_at")
+        elif table == "commits":
+            row["sha"] = item.get("sha")
+        elif table == "files":
+            row["filename"] = item.get("filename")
+        elif table == "timeline":
+            row["seq"] = seq
+        row["data"] = json.dumps(item)
+        columns = list(row)
+        updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c not in natural_key)
+        self.conn.execute(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+            f"ON CONFLICT ({', '.join(natural_key)}) DO UPDATE SET {updates}",
+            [row[c] for c in columns],
+        )
+
+    def write_pr_bundle(self, bundle: Dict, on_written: Optional[Callable[[], None]] = None):
+        """
+        Replace the store's records for this PR with the bundle's. Only the kinds the
+        bundle carries are replaced, so a narrowed refetch keeps the rest.
+        """
+        pr = bundle.get("pull_request") or {}
+        repo = ((pr.get("base") or {}).get("repo") or {}).get("full_name") or ""
+        number = pr.get("number")
+        records = bundle_records(bundle)
+        with self._lock:
+            self._begin()
+            self.conn.execute("SAVEPOINT bundle")
+            try:
+                for key, items in records.items():
+                    table, kind, _, _ = TABLES[key]
+                    if key != "pull_request":
+                        clause = " AND kind = ?" if kind else ""
+                        self.conn.execute(
+                            f"DELETE FROM {table} WHERE repo = ? AND pr_number = ?{clause}",
+                            (repo, number, kind) if kind else (repo, number),
+                        )
+                    for seq, item in enumerate(items):
+                        self._insert(key, repo, number, seq, item)
+            except BaseException:
+                self.conn.execute("ROLLBACK TO bundle")
+                self.conn.execute("RELEASE bundle")
+                raise
+            self.conn.execute("RELEASE bundle")
+            if on_written is not None:
+                self._pending.append(on_written)
+            if not self._streaming or (
+                len(self._pending) >= self.batch_size or time.monotonic() - self._last_commit >= self.flush_interval
+            ):
+                self._commit()
+
+    def start(self) -> "SQLiteDumpStore":
+        """Batch commits until finalize()."""
+        self._streaming = True
+        self._last_commit = time.monotonic()
+        return self
+
+    def finalize(self):
+        with self._lock:
+            self._streaming = False
+            self._commit()
+
+    def __enter__(self) -> "SQLiteDumpStore":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.finalize()
+
+
+__all__ = ["DB_FILE", "SQLiteDumpStore", "TABLES"]
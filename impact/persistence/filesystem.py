@@ -1,51 +1,414 @@
 from __future__ import annotations
 
 import json
+import logging
+import os
+import queue
+import threading
+import time
 from pathlib import Path
-from typing import Dict
+from typing import IO, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from impact.persistence.compression import (
+    COMPRESSION_SUFFIXES,
+    check_compression,
+    dump_path,
+    find_dump_file,
+    open_text,
+)
+from impact.persistence.index import build_index, index_entries, index_path, load_index
+
+log = logging.getLogger(__name__)
+
+CANONICAL_FILES = {
+    "pull_request": "pull_requests.jsonl",
+    "reviews": "reviews.jsonl",
+    "review_comments": "review_comments.jsonl",
+    "issue_comments": "issue_comments.jsonl",
+    "commits": "commits.jsonl",
+    "files": "files.jsonl",
+    "timeline": "timeline.jsonl",
+}
+
+PARTIAL_SUFFIX = ".partial"
+# Bundles per flush, and bundles that may wait in the queue before producers block.
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_QUEUE_SIZE = 256
+# A partly filled batch is flushed once it is this old, so checkpoints never lag far behind.
+FLUSH_INTERVAL = 1.0
+WRITE_BUFFER_BYTES = 1 << 20
+_STOP = object()
+
+
+def _number_from_url(url: Optional[str]) -> Optional[int]:
+    try:
+        return int((url or "").rstrip("/").split("/")[-1])
+    except ValueError:
+        return None
+
+
+def _repo_from_url(url: Optional[str]) -> Optional[str]:
+    """`owner/name` out of a REST URL such as .../repos/owner/name/pulls/5."""
+    _, found, rest = (url or "").partition("/repos/")
+    parts = rest.split("/")
+    return "/".join(parts[:2]) if found and len(parts) > 2 else None
+
+
+def record_pr_number(key: str, item: Dict) -> Optional[int]:
+    """PR number a canonical record of bundle kind `key` belongs to, or None if it cannot be told."""
+    if key == "pull_request":
+        return item.get("number")
+    if key in ("reviews", "review_comments"):
+        return _number_from_url(item.get("pull_request_url"))
+    if key == "issue_comments":
+        return _number_from_url(item.get("issue_url"))
+    return item.get("pull_request_number")
+
+
+def record_pr_key(key: str, item: Dict) -> Tuple[Optional[str], Optional[int]]:
+    """
+    (repo full name, PR number) a canonical record of bundle kind `key` belongs to;
+    the repo is None for lines written before records carried it.
+    """
+    if key == "pull_request":
+        repo = ((item.get("base") or {}).get("repo") or {}).get("full_name")
+    elif key in ("reviews", "review_comments"):
+        repo = _repo_from_url(item.get("pull_request_url"))
+    elif key == "issue_comments":
+        repo = _repo_from_url(item.get("issue_url"))
+    else:
+        repo = item.get("pull_request_repo")
+    return repo, record_pr_number(key, item)
+
+
+def bundle_records(bundle: Dict) -> Dict[str, List[Dict]]:
+    """Bundle kind -> the canonical records a PR bundle stores for it, in order."""
+    pr = bundle.get("pull_request", {})
+    pr_number = pr.get("number")
+    repo = ((pr.get("base") or {}).get("repo") or {}).get("full_name")
+    out = {}
+    for key in CANONICAL_FILES:
+        data = bundle.get(key)
+        if data is None:
+            continue
+        if not isinstance(data, list):
+            out[key] = [data]
+            continue
+        items = []
+        for idx, item in enumerate(data):
+            # Enrich commits, files and timeline events with PR context for downstream parsing.
+            if key == "commits":
+                item = dict(item)
+                item["pull_request_number"] = pr_number
+                item["pull_request_repo"] = repo
+                item["idx"] = idx
+            if key in ("files", "timeline"):
+                item = dict(item)
+                item["pull_request_number"] = pr_number
+                item["pull_request_repo"] = repo
+            items.append(item)
+        out[key] = items
+    return out
+
+
+def _read_lines(path: Path, compression: Optional[str]) -> Iterator[str]:
+    """Complete lines of a dump file; a torn tail (cut line or truncated stream) is dropped."""
+    with open_text(path, "r", compression) as f:
+        try:
+            for line in f:
+                if line.endswith("\n"):
+                    yield line
+        except (EOFError, OSError, ValueError):
+            # Stream cut short by a crash (truncated gzip member / zstd frame).
+            return
+
+
+def _recover_partial(partial: Path, final: Path, compression: Optional[str]):
+    """Adopt a `.partial` file left by an interrupted streaming run, minus any torn last line."""
+    if compression is None:
+        with partial.open("rb+") as f:
+            data = f.read()
+            f.truncate(data.rfind(b"\n") + 1)
+        # Index entries may run ahead of or behind the recovered data; rebuild them.
+        index_path(partial).unlink(missing_ok=True)
+        os.replace(partial, final)
+        build_index(final)
+        return
+    tmp = final.with_name(final.name + ".tmp")
+    with open_text(tmp, "w", compression) as dst:
+        dst.writelines(_read_lines(partial, compression))
+    os.replace(tmp, final)
+    partial.unlink()
 
 
 class FileSystemDumpWriter:
     """
     Writes canonical GitHub dump files to a target directory.
+
+    Used directly, each write_pr_bundle call appends to the files. For a fetch run,
+    start() switches to streaming mode: bundles from any number of producer threads
+    (or the event loop) are serialized by the caller and handed over a bounded
+    queue to one writer thread, which keeps a buffered handle per file open and
+    flushes in batches of `batch_size` bundles (or every `flush_interval` seconds). While streaming, the files are
+    written as `canonical/*.jsonl.partial`; finalize() flushes and renames them
+    into place, so readers never see a half-written dump. Each bundle's
+    `on_written` callback runs once its batch is flushed, which is what makes
+    checkpointing safe; partial files left by a crash are adopted on the next run.
+
+    `compression` ("gzip" or "zstd") writes `*.jsonl.gz` / `*.jsonl.zst` instead of
+    plain JSONL. A directory that already holds a dump keeps that dump's format.
+
+    Plain JSONL files get a sidecar `*.jsonl.idx` (see impact.persistence.index)
+    mapping each PR's run of lines to its byte offset, length, timestamps and
+    actors, so readers can seek straight to the PRs they keep.
     """
 
-    def __init__(self, base_dir: Path):
+    def __init__(
+        self,
+        base_dir: Path,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        flush_interval: float = FLUSH_INTERVAL,
+        compression: Optional[str] = None,
+    ):
         self.base_dir = Path(base_dir)
         self.canonical_dir = self.base_dir / "canonical"
         self.canonical_dir.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.flush_interval = flush_interval
+        self._queue: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+        self._direct_lock = threading.Lock()
+        check_compression(compression)
+        self.compression = compression
+        for fname in CANONICAL_FILES.values():
+            for existing, suffix in COMPRESSION_SUFFIXES.items():
+                partial = self.canonical_dir / (fname + suffix + PARTIAL_SUFFIX)
+                if partial.exists():
+                    _recover_partial(partial, self.canonical_dir / (fname + suffix), existing)
+        for fname in CANONICAL_FILES.values():
+            found = find_dump_file(self.canonical_dir, fname)
+            if found and found[1] != compression:
+                log.warning("Dump in %s is stored as %s; keeping that format", self.base_dir, found[1] or "plain JSONL")
+                self.compression = found[1]
+                break
+
+    def _path(self, fname: str) -> Path:
+        return dump_path(self.canonical_dir, fname, self.compression)
 
     def write_manifest(self, manifest: Dict):
-        (self.base_dir / "dump_manifest.json").write_text(json.dumps(manifest, indent=2))
-
-    def write_pr_bundle(self, bundle: Dict):
-        # Each key writes to its respective jsonl
-        pr_number = bundle.get("pull_request", {}).get("number")
-        files = {
-            "pull_request": "pull_requests.jsonl",
-            "reviews": "reviews.jsonl",
-            "review_comments": "review_comments.jsonl",
-            "issue_comments": "issue_comments.jsonl",
-            "commits": "commits.jsonl",
-            "files": "files.jsonl",
-            "timeline": "timeline.jsonl",
-        }
-        for key, fname in files.items():
-            data = bundle.get(key)
-            if data is None:
+        path = self.base_dir / "dump_manifest.json"
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(manifest, indent=2))
+        os.replace(tmp, path)
+
+    def read_manifest(self) -> Optional[Dict]:
+        path = self.base_dir / "dump_manifest.json"
+        if not path.exists():
+            return None
+        return json.loads(path.read_text())
+
+    def iter_records(self, key: str) -> Iterator[Dict]:
+        """Records already written for bundle kind `key`, skipping a torn trailing line."""
+        found = find_dump_file(self.canonical_dir, CANONICAL_FILES[key])
+        if found is None:
+            return
+        for line in _read_lines(*found):
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+    def pr_numbers(self) -> Set[int]:
+        """Numbers of the PRs whose pull_request line is already in the dump."""
+        return {pr["number"] for pr in self.iter_records("pull_request")}
+
+    def pr_keys(self) -> Set[Tuple[str, int]]:
+        """(repo, number) of the PRs whose pull_request line is already in the dump."""
+        return {record_pr_key("pull_request", pr) for pr in self.iter_records("pull_request")}
+
+    def drop_prs(self, keys: Iterable[Tuple[str, int]]):
+        """
+        Remove every line belonging to these (repo, number) PRs, so a refetch (or the
+        retry of a bundle that was only partly written) does not leave duplicates
+        behind. Lines written before records carried their repo match by number.
+        Files are rewritten through a temp file and an atomic rename.
+        """
+        keys = set(keys)
+        if not keys:
+            return
+        numbers = {number for _, number in keys}
+        for key, fname in CANONICAL_FILES.items():
+            found = find_dump_file(self.canonical_dir, fname)
+            if found is None:
                 continue
-            path = self.canonical_dir / fname
-            with path.open("a") as f:
-                if isinstance(data, list):
-                    for idx, item in enumerate(data):
-                        # Enrich commits and files with PR context for downstream parsing.
-                        if key == "commits":
-                            item = dict(item)
-                            item["pull_request_number"] = pr_number
-                            item["idx"] = idx
-                        if key == "files":
-                            item = dict(item)
-                            item["pull_request_number"] = pr_number
-                        f.write(json.dumps(item) + "\n")
-                else:
-                    f.write(json.dumps(data) + "\n")
+            path, compression = found
+            tmp = path.with_name(path.name + ".tmp")
+            with open_text(tmp, "w", compression) as dst:
+                for line in _read_lines(path, compression):
+                    try:
+                        repo, number = record_pr_key(key, json.loads(line))
+                    except json.JSONDecodeError:
+                        continue  # torn write from an interrupted run
+                    if (repo, number) not in keys and (repo is not None or number not in numbers):
+                        dst.write(line)
+            os.replace(tmp, path)
+            if compression is None:
+                build_index(path)
+
+    # ---------------------------
+    # Bundles
+    # ---------------------------
+    def _serialize(self, bundle: Dict) -> Dict[str, Tuple[str, List[Dict]]]:
+        """
+        File name -> (the JSONL text this bundle appends to it, its index blocks with
+        offsets relative to the start of that text; empty for compressed dumps).
+        """
+        out = {}
+        for key, items in bundle_records(bundle).items():
+            fname = CANONICAL_FILES[key]
+            lines = [json.dumps(item) + "\n" for item in items]
+            # json.dumps escapes non-ASCII, so character counts are byte counts.
+            blocks = index_entries(fname, zip(items, map(len, lines))) if self.compression is None else []
+            out[fname] = ("".join(lines), blocks)
+        return out
+
+    @staticmethod
+    def _append_index(handle: IO[str], blocks: List[Dict], position: int):
+        for block in blocks:
+            handle.write(json.dumps({**block, "offset": block["offset"] + position}) + "\n")
+
+    def write_pr_bundle(self, bundle: Dict, on_written: Optional[Callable[[], None]] = None):
+        """
+        Append one PR bundle. Safe to call from many threads; while streaming this only
+        serializes the bundle and queues it (blocking if the queue is full).
+        """
+        chunks = self._serialize(bundle)
+        if self._queue is not None:
+            if self._error is not None:
+                raise self._error
+            self._queue.put((chunks, on_written))
+            return
+        with self._direct_lock:
+            for fname, (text, blocks) in chunks.items():
+                path = self._path(fname)
+                if self.compression is None and path.exists() and not index_path(path).exists():
+                    build_index(path)
+                position = path.stat().st_size if path.exists() else 0
+                with open_text(path, "a", self.compression) as f:
+                    f.write(text)
+                if blocks:
+                    with index_path(path).open("a") as idx:
+                        self._append_index(idx, blocks, position)
+        if on_written is not None:
+            on_written()
+
+    # ---------------------------
+    # Streaming
+    # ---------------------------
+    def start(self) -> "FileSystemDumpWriter":
+        if self._queue is not None:
+            return self
+        sinks = {}
+        for fname in CANONICAL_FILES.values():
+            final = self._path(fname)
+            partial = final.with_name(final.name + PARTIAL_SUFFIX)
+            index = None
+            if self.compression is None:
+                # Appends must extend an index that already covers the file exactly.
+                if final.exists() and load_index(final) is None:
+                    build_index(final)
+                if index_path(final).exists():
+                    os.replace(index_path(final), index_path(partial))
+                index = index_path(partial).open("a", buffering=WRITE_BUFFER_BYTES)
+            if final.exists():
+                os.replace(final, partial)
+            position = partial.stat().st_size if partial.exists() else 0
+            handles = open_text(partial, "a", self.compression, buffering=WRITE_BUFFER_BYTES)
+            sinks[fname] = [handles, index, position]
+        self._queue = queue.Queue(maxsize=self.queue_size)
+        self._error = None
+        self._thread = threading.Thread(target=self._drain, args=(sinks,), name="dump-writer", daemon=True)
+        self._thread.start()
+        return self
+
+    def _drain(self, sinks: Dict[str, List]):
+        """Writer thread: `sinks` maps file name -> [data handle, index handle or None, byte position]."""
+        pending: List[Callable[[], None]] = []
+        buffered = 0
+        last_flush = time.monotonic()
+
+        def flush():
+            nonlocal buffered, last_flush
+            for handle, index, _ in sinks.values():
+                # Data first: an index entry must never point past the data on disk.
+                handle.flush()
+                os.fsync(handle.fileno())
+                if index is not None:
+                    index.flush()
+            for callback in pending:
+                callback()
+            pending.clear()
+            buffered = 0
+            last_flush = time.monotonic()
+
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    if buffered:
+                        flush()
+                    continue
+                if item is _STOP:
+                    break
+                chunks, on_written = item
+                for fname, (text, blocks) in chunks.items():
+                    sink = sinks[fname]
+                    sink[0].write(text)
+                    if sink[1] is not None:
+                        self._append_index(sink[1], blocks, sink[2])
+                    sink[2] += len(text)
+                if on_written is not None:
+                    pending.append(on_written)
+                buffered += 1
+                if buffered >= self.batch_size or time.monotonic() - last_flush >= self.flush_interval:
+                    flush()
+            flush()
+        except BaseException as exc:  # noqa: BLE001 - surfaced to producers and finalize()
+            self._error = exc
+            log.error("Dump writer failed: %s", exc)
+            # Keep consuming so producers blocked on put() are released.
+            while self._queue.get() is not _STOP:
+                pass
+        finally:
+            for handle, index, _ in sinks.values():
+                handle.close()
+                if index is not None:
+                    index.close()
+
+    def finalize(self):
+        """Flush everything queued, close the handles and move the files into place."""
+        if self._queue is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._queue = None
+        self._thread = None
+        for fname in CANONICAL_FILES.values():
+            final = self._path(fname)
+            partial = final.with_name(final.name + PARTIAL_SUFFIX)
+            if partial.exists():
+                os.replace(partial, final)
+            if index_path(partial).exists():
+                os.replace(index_path(partial), index_path(final))
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self) -> "FileSystemDumpWriter":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.finalize()
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from impact.persistence.codec import loads, parse_timestamp
+
+log = logging.getLogger(__name__)
+
+INDEX_SUFFIX = ".idx"
+
+
+def _number_from_url(url: Optional[str], position: int) -> Optional[int]:
+    try:
+        return int((url or "").rstrip("/").split("/")[position])
+    except (ValueError, IndexError):
+        return None
+
+
+# How GitHubAdapter files each record kind: (PR number, timestamp it windows on, acting login).
+def _pr_fields(item: Dict) -> Tuple[Optional[int], Optional[str], Optional[str]]:
+    return item.get("number"), item.get("created_at"), (item.get("user") or {}).get("login")
+
+
+def _review_fields(item: Dict) -> Tuple[Optional[int], Optional[str], Optional[str]]:
+    return _number_from_url(item.get("pull_request_url"), -1), item.get("submitted_at"), (item.get("user") or {}).get("login")
+
+
+def _review_comment_fields(item: Dict) -> Tuple[Optional[int], Optional[str], Optional[str]]:
+    return _number_from_url(item.get("pull_request_url"), -1), item.get("created_at"), (item.get("user") or {}).get("login")
+
+
+def _issue_comment_fields(item: Dict) -> Tuple[Optional[int], Optional[str], Optional[str]]:
+    return _number_from_url(item.get("issue_url"), -1), item.get("created_at"), (item.get("user") or {}).get("login")
+
+
+def _commit_fields(item: Dict) -> Tuple[Optional[int], Optional[str], Optional[str]]:
+    date = (((item.get("commit") or {}).get("author")) or {}).get("date")
+    return item.get("pull_request_number"), date, (item.get("author") or {}).get("login")
+
+
+def _timeline_fields(item: Dict) -> Tuple[Optional[int], Optional[str], Optional[str]]:
+    # The writer's annotation, else (older dumps) the PR number in the event URL, as the adapter reads it.
+    number = item.get("pull_request_number")
+    if number is None:
+        number = _number_from_url(item.get("url"), -2)
+    actor = item.get("actor") or item.get("user") or {}
+    return number, item.get("created_at") or item.get("submitted_at"), actor.get("login")
+
+
+def _file_fields(item: Dict) -> Tuple[Optional[int], Optional[str], Optional[str]]:
+    return item.get("pull_request_number"), None, None
+
+
+RECORD_FIELDS = {
+    "pull_requests.jsonl": _pr_fields,
+    "reviews.jsonl": _review_fields,
+    "review_comments.jsonl": _review_comment_fields,
+    "issue_comments.jsonl": _issue_comment_fields,
+    "commits.jsonl": _commit_fields,
+    "timeline.jsonl": _timeline_fields,
+    "files.jsonl": _file_fields,
+}
+
+
+def epoch_seconds(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return parse_timestamp(value).timestamp()
+    except ValueError:
+        return None
+
+
+def index_path(data_path: Path) -> Path:
+    return data_path.with_name(data_path.name + INDEX_SUFFIX)
+
+
+def index_entries(fname: str, records: Iterable[Tuple[Dict, int]], offset: int = 0) -> List[Dict]:
+    """
+    Index blocks for consecutive (record, byte length) pairs of canonical file `fname`
+    starting at byte `offset`. Runs of records the adapter files under the same PR become
+    one block: {"pr", "offset", "length", "min", "max", "acts"}, where min/max bound the
+    records' timestamps (epoch seconds) and acts maps each acting login to its timestamps.
+    """
+    fields = RECORD_FIELDS[fname]
+    blocks: List[Dict] = []
+    for item, length in records:
+        number, ts_raw, login = fields(item)
+        ts = epoch_seconds(ts_raw)
+        block = blocks[-1] if blocks and blocks[-1]["pr"] == number else None
+        if block is None:
+            block = {"pr": number, "offset": offset, "length": 0, "min": ts, "max": ts, "acts": {}}
+            blocks.append(block)
+        block["length"] += length
+        if ts is not None:
+            block["min"] = ts if block["min"] is None else min(block["min"], ts)
+            block["max"] = ts if block["max"] is None else max(block["max"], ts)
+        if login is not None:
+            block["acts"].setdefault(login, []).append(ts)
+        offset += length
+    return blocks
+
+
+def build_index(data_path: Path):
+    """(Re)write the sidecar index of a plain JSONL canonical file from its contents."""
+    fname = data_path.name
+    tmp = index_path(data_path).with_name(index_path(data_path).name + ".tmp")
+
+    def records() -> Iterator[Tuple[Dict, int]]:
+        with data_path.open("rb") as f:
+            for raw in f:
+                yield loads(raw), len(raw)
+
+    with tmp.open("w") as out:
+        for block in index_entries(fname, records()):
+            out.write(json.dumps(block) + "\n")
+    os.replace(tmp, index_path(data_path))
+
+
+def load_index(data_path: Path) -> Optional[List[Dict]]:
+    """
+    Blocks of `data_path`'s sidecar index, or None when there is none or it does not
+    cover the file exactly (e.g. a dump written before indexing, or edited by hand).
+    """
+    idx = index_path(data_path)
+    if not idx.exists() or not data_path.exists():
+        return None
+    with idx.open() as f:
+        blocks = [loads(line) for line in f]
+    covered = 0
+    for block in blocks:
+        if block["offset"] != covered:
+            break
+        covered += block["length"]
+    if covered != data_path.stat().st_size:
+        log.debug("Ignoring stale index %s", idx)
+        return None
+    if any(block["pr"] is None for block in blocks):
+        # Written before timeline events were filed by their pull_request_number annotation.
+        log.debug("Ignoring outdated index %s", idx)
+        return None
+    return blocks
+
+
+def read_spans(data_path: Path, spans: List[Tuple[int, int]]) -> Iterator[str]:
+    """Lines stored in the given (offset, length) byte spans, in file order; adjacent spans are read together."""
+    merged: List[List[int]] = []
+    for offset, length in sorted(spans):
+        if merged and merged[-1][0] + merged[-1][1] == offset:
+            merged[-1][1] += length
+        else:
+            merged.append([offset, length])
+    with data_path.open("rb") as f:
+        for offset, length in merged:
+            f.seek(offset)
+            chunk = f.read(length).decode("utf-8")
+            # Only "\n" ends a JSONL line; str.splitlines() would also break on "\u2028",
+            # "\x1c" and the like, which JSON strings may hold unescaped.
+            start = 0
+            while start < len(chunk):
+                end = chunk.find("\n", start) + 1 or len(chunk)
+                yield chunk[start:end]
+                start = end
+
+
+__all__ = ["INDEX_SUFFIX", "RECORD_FIELDS", "build_index", "epoch_seconds", "index_entries", "index_path", "load_index", "read_spans"]
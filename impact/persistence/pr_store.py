@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import contextlib
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from impact.persistence.codec import loads
+from impact.persistence.filesystem import bundle_records
+
+log = logging.getLogger(__name__)
+
+REFS_FILE = "pr_refs.jsonl"
+# Entries younger than this survive gc() even when unreferenced, so a fetch that
+# has stored a bundle but not yet written its ref is never collected under it.
+GC_GRACE_SECONDS = 3600.0
+
+
+def entry_key(repo: str, number: int, updated_at: str) -> str:
+    """Address of a PR bundle: the hash of (repo, number, updated_at), which pins its content."""
+    return hashlib.sha256(f"{repo}#{number}@{updated_at}".encode("utf-8")).hexdigest()
+
+
+def _covers(stored: Optional[Iterable[str]], wanted: Optional[Iterable[str]]) -> bool:
+    if stored is None:
+        return True
+    return wanted is not None and set(wanted) <= set(stored)
+
+
+class SharedPRStore:
+    """
+    PR bundles shared between dumps and candidates, addressed by (repo, number, updated_at).
+
+    GitHub bumps a PR's updated_at whenever anything on it changes, so a stored bundle
+    stays valid for as long as the PR's updated_at does; GitHubLiveFetcher checks the
+    store before fetching and adds what it fetches. Entries are JSON files under
+    `objects/` named by entry_key(), written atomically under a per-entry lock file
+    (flock), so any number of fetch processes can share one store. Dumps written with SharedStoreDumpWriter
+    reference entries instead of copying them and register themselves under
+    `roots/`; gc() deletes entries no registered dump references.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.objects_dir = self.directory / "objects"
+        self.roots_dir = self.directory / "roots"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.roots_dir.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.objects_dir / key[:2] / f"{key}.json"
+
+    @contextlib.contextmanager
+    def _locked(self, key: str):
+        """Hold the entry's lock file, so one put() at a time merges into it across threads and processes."""
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        with path.with_suffix(".lock").open("a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def load(self, key: str) -> Optional[Dict]:
+        """The stored entry {"repo", "number", "updated_at", "resources", "bundle"}, or None."""
+        try:
+            return loads(self._path(key).read_bytes())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def get(self, repo: str, number: int, updated_at: Optional[str], resources: Optional[List[str]] = None) -> Optional[Dict]:
+        """
+        The bundle of this PR revision if the store holds one with at least `resources`
+        (None = all), narrowed to exactly those resources; otherwise None.
+        """
+        entry = self.load(entry_key(repo, number, updated_at)) if updated_at else None
+        if entry is None or not _covers(entry["resources"], resources):
+            self.misses += 1
+            return None
+        self.hits += 1
+        # A hit counts as use: gc() only collects unreferenced entries nobody read lately.
+        os.utime(self._path(entry_key(repo, number, updated_at)))
+        bundle = entry["bundle"]
+        if resources is not None:
+            bundle = {k: v for k, v in bundle.items() if k == "pull_request" or k in resources}
+        return bundle
+
+    def put(self, repo: str, number: int, updated_at: Optional[str], bundle: Dict, resources: Optional[List[str]] = None) -> Optional[str]:
+        """
+        Store a bundle holding `resources` (None = all); returns its key. An entry for the
+        same PR revision that lacks some of them is merged with it, so dumps fetching
+        different resources add to one entry instead of replacing each other's.
+        """
+        if not updated_at:
+            return None
+        key = entry_key(repo, number, updated_at)
+        with self._locked(key):
+            existing = self.load(key)
+            if existing is not None and _covers(existing["resources"], resources):
+                return key
+            if existing is not None:
+                bundle = {**existing["bundle"], **bundle}
+                if resources is not None and existing["resources"] is not None:
+                    resources = set(resources) | set(existing["resources"])
+                else:
+                    resources = None
+            path = self._path(key)
+            entry = {
+                "repo": repo,
+                "number": number,
+                "updated_at": updated_at,
+                "resources": sorted(resources) if resources is not None else None,
+                "bundle": bundle,
+            }
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_text(json.dumps(entry))
+            os.replace(tmp, path)
+        return key
+
+    # ---------------------------
+    # Roots and garbage collection
+    # ---------------------------
+    def register_root(self, dump_dir: Path):
+        """Record that `dump_dir` references entries, so gc() keeps them."""
+        dump_dir = Path(dump_dir).resolve()
+        marker = self.roots_dir / hashlib.sha256(str(dump_dir).encode("utf-8")).hexdigest()
+        if not marker.exists():
+            marker.write_text(str(dump_dir))
+
+    def referenced_keys(self) -> Set[str]:
+        """Keys referenced by registered dumps; roots whose dump is gone are unregistered."""
+        keys: Set[str] = set()
+        for marker in self.roots_dir.iterdir():
+            refs = Path(marker.read_text()) / REFS_FILE
+            if not refs.exists():
+                log.info("Dump %s no longer exists; unregistering it", refs.parent)
+                marker.unlink()
+                continue
+            keys.update(ref["key"] for ref in read_refs(refs))
+        return keys
+
+    def gc(self, grace_seconds: float = GC_GRACE_SECONDS, dry_run: bool = False) -> Tuple[int, int]:
+        """Delete unreferenced entries not written or read for `grace_seconds`; returns (entries, bytes) freed."""
+        keep = self.referenced_keys()
+        cutoff = time.time() - grace_seconds
+        freed = freed_bytes = 0
+        for path in self.objects_dir.glob("*/*.json"):
+            if path.stem in keep:
+                continue
+            stat = path.stat()
+            if stat.st_mtime > cutoff:
+                continue
+            freed += 1
+            freed_bytes += stat.st_size
+            if not dry_run:
+                path.unlink(missing_ok=True)
+                path.with_suffix(".lock").unlink(missing_ok=True)
+        log.info("PR store gc: %s %s entries (%s bytes)", "would free" if dry_run else "freed", freed, freed_bytes)
+        return freed, freed_bytes
+
+
+def read_refs(path: Path) -> List[Dict]:
+    """The refs a SharedStoreDumpWriter appended to `path` (a dump's pr_refs.jsonl); [] if there is none."""
+    refs: List[Dict] = []
+    try:
+        with Path(path).open() as f:
+            for line in f:
+                try:
+                    refs.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue  # torn write from an interrupted run
+    except FileNotFoundError:
+        pass
+    return refs
+
+
+class SharedStoreDumpWriter:
+    """
+    Writes a dump that references a SharedPRStore instead of holding canonical files:
+    `pr_refs.jsonl` lists one {"repo", "number", "updated_at", "key"} per PR, in write
+    order. It speaks the same interface as FileSystemDumpWriter; each bundle is put in
+    the store (as holding `resources`, None = all) before its ref is appended, and its
+    `on_written` callback runs once the ref is on disk. Read such dumps with
+    GitHubSharedAdapter.
+    """
+
+    compression = None
+
+    def __init__(self, base_dir: Path, store: SharedPRStore, resources: Optional[List[str]] = None):
+        self.base_dir = Path(base_dir)
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.store = store
+        self.resources = resources
+        self.refs_path = self.base_dir / REFS_FILE
+        self._lock = threading.Lock()
+        self.store.register_root(self.base_dir)
+
+    def write_manifest(self, manifest: Dict):
+        path = self.base_dir / "dump_manifest.json"
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(manifest, indent=2))
+        os.replace(tmp, path)
+
+    def read_manifest(self) -> Optional[Dict]:
+        path = self.base_dir / "dump_manifest.json"
+        if not path.exists():
+            return None
+        return json.loads(path.read_text())
+
+    def refs(self) -> List[Dict]:
+        return read_refs(self.refs_path)
+
+    def iter_records(self, key: str) -> Iterator[Dict]:
+        """Records of bundle kind `key` of every referenced PR, as the JSONL dump would hold them."""
+        for ref in self.refs():
+            entry = self.store.load(ref["key"])
+            if entry is not None:
+                yield from bundle_records(entry["bundle"]).get(key, [])
+
+    def pr_numbers(self) -> Set[int]:
+        return {ref["number"] for ref in self.refs()}
+
+    def pr_keys(self) -> Set[Tuple[str, int]]:
+        return {(ref["repo"], ref["number"]) for ref in self.refs()}
+
+    def drop_prs(self, keys: Iterable[Tuple[str, int]]):
+        """Remove the refs of these (repo, number) PRs; the store's entries stay until gc()."""
+        keys = set(keys)
+        if not keys:
+            return
+        with self._lock:
+            refs = [ref for ref in self.refs() if (ref["repo"], ref["number"]) not in keys]
+            tmp = self.refs_path.with_name(REFS_FILE + ".tmp")
+            tmp.write_text("".join(json.dumps(ref) + "\n" for ref in refs))
+            os.replace(tmp, self.refs_path)
+
+    def write_pr_bundle(self, bundle: Dict, on_written: Optional[Callable[[], None]] = None):
+        pr = bundle["pull_request"]
+        repo = pr["base"]["repo"]["full_name"]
+        # Without updated_at a bundle cannot be addressed; key it by its content instead.
+        updated_at = pr.get("updated_at") or hashlib.sha256(json.dumps(bundle, sort_keys=True).encode()).hexdigest()
+        key = self.store.put(repo, pr["number"], updated_at, bundle, self.resources)
+        ref = {"repo": repo, "number": pr["number"], "updated_at": pr.get("updated_at"), "key": key}
+        with self._lock:
+            with self.refs_path.open("a") as f:
+                f.write(json.dumps(ref) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        if on_written is not None:
+            on_written()
+
+    def start(self) -> "SharedStoreDumpWriter":
+        return self
+
+    def finalize(self):
+        pass
+
+    def __enter__(self) -> "SharedStoreDumpWriter":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.finalize()
+
+
+__all__ = ["GC_GRACE_SECONDS", "REFS_FILE", "SharedPRStore", "SharedStoreDumpWriter", "entry_key", "read_refs"]
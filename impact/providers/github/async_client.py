@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List, Optional, Union
+
+import httpx
+from tenacity import retry, stop_after_attempt, retry_if_exception_type
+
+from impact.providers.github.cache import ResponseCache
+from impact.providers.github.governor import RateGovernor
+from impact.providers.github.client import (
+    DEFAULT_ACCEPT,
+    DEFAULT_BASE_URL,
+    GitHubRateLimitError,
+    _headers,
+    _is_rate_limited,
+    _rate_limit_error,
+    _retry_wait,
+    MAX_PER_PAGE,
+    _next_link,
+    _page_items,
+    _remaining_page_urls,
+)
+from impact.providers.github.tokens import TokenPool
+
+
+class AsyncGitHubClient:
+    """
+    Asyncio counterpart of GitHubClient with the same retry/backoff and rate-limit handling.
+    All requests share one pooled httpx.AsyncClient; `max_concurrency` caps the number of
+    requests in flight across every caller of this client (a governor may lower it further).
+    """
+
+    def __init__(
+        self,
+        token: Union[str, TokenPool],
+        base_url: str = DEFAULT_BASE_URL,
+        timeout: float = 15.0,
+        max_concurrency: int = 8,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        cache: Optional[ResponseCache] = None,
+        governor: Optional[RateGovernor] = None,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+        self.base_url = base_url.rstrip("/")
+        self.tokens = token if isinstance(token, TokenPool) else TokenPool([token])
+        self.max_concurrency = max_concurrency
+        limits = httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency)
+        self.client = httpx.AsyncClient(timeout=timeout, headers={"Accept": DEFAULT_ACCEPT}, limits=limits, transport=transport)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.cache = cache
+        self.governor = governor
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def __aenter__(self) -> "AsyncGitHubClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def _acquire_token(self) -> str:
+        # Wait outside the semaphore, and only once every pooled token is exhausted.
+        while True:
+            token, wait = self.tokens.next_token()
+            if token is not None:
+                return token
+            self.tokens.slept_seconds += wait
+            await asyncio.sleep(wait)
+
+    async def _send(self, url: str, params: Optional[Dict[str, Any]], headers: Dict[str, str]) -> httpx.Response:
+        async with self._semaphore:
+            if self.governor is None:
+                return await self.client.get(url, params=params, headers=headers)
+            async with self.governor.async_slot():
+                delay = self.governor.reserve()
+                if delay:
+                    await asyncio.sleep(delay)
+                resp = await self.client.get(url, params=params, headers=headers)
+        self.governor.observe(resp)
+        return resp
+
+    @retry(
+        retry=retry_if_exception_type((httpx.HTTPError, GitHubRateLimitError)),
+        wait=_retry_wait,
+        stop=stop_after_attempt(5),
+        reraise=True,
+    )
+    async def get(self, path: str, params: Optional[Dict[str, Any]] = None, etag: Optional[str] = None) -> httpx.Response:
+        url = f"{self.base_url}{path}"
+        token = await self._acquire_token()
+        headers = _headers(token, etag=etag)
+        cached = None
+        if self.cache is not None and etag is None:
+            cached = self.cache.lookup(url, params)
+            if cached:
+                headers.update(cached.conditional_headers())
+        resp = await self._send(url, params, headers)
+        self.tokens.update(token, resp.headers)
+        if resp.status_code == 304:
+            if cached is not None:
+                self.cache.record(hit=True)
+                return cached.to_response(resp.request)
+            return resp
+        if _is_rate_limited(resp):
+            raise _rate_limit_error(resp, path)
+        resp.raise_for_status()
+        if self.cache is not None and etag is None:
+            self.cache.record(hit=False)
+            self.cache.store(url, params, resp)
+        return resp
+
+    async def paginate(self, path: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Like GitHubClient.paginate (largest page size, remaining pages fetched concurrently
+        once rel="last" is known), but collects the items into a list since callers always
+        materialize the full collection.
+        """
+        params = {"per_page": MAX_PER_PAGE, **(params or {})}
+        resp = await self.get(path, params=params)
+        if resp.status_code == 304:
+            return []
+        items: List[Dict[str, Any]] = _page_items(resp)
+
+        page_urls = _remaining_page_urls(resp)
+        if page_urls:
+            pages = await asyncio.gather(*(self.get(url.replace(self.base_url, "")) for url in page_urls))
+            for page in pages:
+                if page.status_code != 304:
+                    items.extend(_page_items(page))
+            return items
+
+        last_url = None
+        while True:
+            next_link = _next_link(resp)
+            if not next_link or next_link == last_url:
+                break
+            last_url = next_link
+            resp = await self.get(next_link.replace(self.base_url, ""))
+            if resp.status_code == 304:
+                return items
+            items.extend(_page_items(resp))
+        return items
+
+
+__all__ = ["AsyncGitHubClient"]
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import asyncio
+from itertools import islice
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Set, Tuple, Union
+
+from impact.providers.github.async_client import AsyncGitHubClient
+from impact.providers.github.fetcher import bundle_endpoints
+
+
+class AsyncGitHubFetcher:
+    """
+    Async variant of GitHubFetcher.fetch_pr_bundle. The endpoints of a PR bundle are
+    requested concurrently, and many PRs can be in flight at once; the client's
+    concurrency cap bounds the total number of open requests.
+    """
+
+    def __init__(self, client: AsyncGitHubClient):
+        self.client = client
+
+    async def _fetch_endpoint(self, path: str, paginated: bool) -> Any:
+        if paginated:
+            return await self.client.paginate(path)
+        resp = await self.client.get(path)
+        return resp.json()
+
+    async def fetch_pr_bundle(self, repo: str, number: int, resources: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        endpoints = bundle_endpoints(resources)
+        keys = list(endpoints)
+        results = await asyncio.gather(
+            *(
+                self._fetch_endpoint(template.format(repo=repo, number=number), paginated)
+                for template, paginated in endpoints.values()
+            )
+        )
+        return dict(zip(keys, results))
+
+    async def fetch_pr_bundles(
+        self,
+        prs: Iterable[Tuple[str, int]],
+        resources: Optional[Iterable[str]] = None,
+        in_flight: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[str, int, Union[Dict[str, Any], BaseException]]]:
+        """
+        Fetch bundles for many (repo, number) pairs concurrently and yield
+        (repo, number, bundle) as each completes. A failed PR yields its exception
+        in place of the bundle so one bad PR does not abort the batch. At most
+        `in_flight` PRs (default: the client's concurrency cap) are started at a
+        time, and `prs` is consumed lazily, so memory follows the cap rather than
+        the backlog.
+        """
+        resources = None if resources is None else list(resources)
+        limit = in_flight or self.client.max_concurrency
+
+        async def one(repo: str, number: int):
+            try:
+                return repo, number, await self.fetch_pr_bundle(repo, number, resources)
+            except Exception as exc:  # noqa: BLE001
+                return repo, number, exc
+
+        pending_prs = iter(prs)
+        tasks: Set[asyncio.Task] = set()
+        try:
+            while True:
+                for repo, number in islice(pending_prs, limit - len(tasks)):
+                    tasks.add(asyncio.ensure_future(one(repo, number)))
+                if not tasks:
+                    return
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+__all__ = ["AsyncGitHubFetcher"]
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+
+import httpx
+
+log = logging.getLogger(__name__)
+
+DEFAULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+# Response headers replayed on a cache hit (pagination relies on Link).
+_KEPT_HEADERS = ("Content-Type", "Link", "ETag", "Last-Modified")
+
+
+def cache_key(url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+    """Canonical key for a GET: absolute URL plus its query, with params merged in and sorted."""
+    merged = httpx.URL(url).copy_merge_params(params or {})
+    query = "&".join(f"{k}={v}" for k, v in sorted(merged.params.multi_items()))
+    base = str(merged.copy_with(query=None))
+    return f"{base}?{query}" if query else base
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    headers: Dict[str, str]
+    body: bytes
+
+    def conditional_headers(self) -> Dict[str, str]:
+        h = {}
+        if self.etag:
+            h["If-None-Match"] = self.etag
+        if self.last_modified:
+            h["If-Modified-Since"] = self.last_modified
+        return h
+
+    def to_response(self, request: Optional[httpx.Request] = None) -> httpx.Response:
+        """Rebuild a 200 response from the cached body, as served for a 304."""
+        return httpx.Response(
+            200,
+            headers=self.headers,
+            content=self.body,
+            request=request,
+            extensions={"from_cache": True},
+        )
+
+
+class ResponseCache:
+    """
+    On-disk conditional-request cache for GitHub REST responses.
+
+    Each entry is one JSON file named by the hash of its cache key, holding the
+    validators (ETag / Last-Modified), replayable headers and body. Recency is
+    tracked via file mtime so LRU order survives restarts; once the total size
+    exceeds `max_bytes` the least recently used entries are evicted.
+    Safe to share between threads.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # file name -> size in bytes, least recently used first
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._load_index()
+
+    def _load_index(self):
+        found = []
+        for p in self.directory.glob("*.json"):
+            st = p.stat()
+            found.append((st.st_mtime, p.name, st.st_size))
+        for _, name, size in sorted(found):
+            self._entries[name] = size
+            self._total_bytes += size
+
+    @staticmethod
+    def _file_name(key: str) -> str:
+        return hashlib.sha256(key.encode()).hexdigest() + ".json"
+
+    def lookup(self, url: str, params: Optional[Mapping[str, Any]] = None) -> Optional[CachedResponse]:
+        key = cache_key(url, params)
+        name = self._file_name(key)
+        with self._lock:
+            if name not in self._entries:
+                return None
+            path = self.directory / name
+            try:
+                raw = json.loads(path.read_text())
+            except (OSError, json.JSONDecodeError) as e:
+                log.debug("Dropping unreadable cache entry %s: %s", name, e)
+                self._drop(name)
+                return None
+            if raw.get("url") != key:
+                return None
+            self._entries.move_to_end(name)
+            os.utime(path, None)
+        return CachedResponse(
+            url=key,
+            etag=raw.get("etag"),
+            last_modified=raw.get("last_modified"),
+            headers=raw.get("headers", {}),
+            body=raw.get("body", "").encode(),
+        )
+
+    def store(self, url: str, params: Optional[Mapping[str, Any]], resp: httpx.Response):
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if not (etag or last_modified):
+            return
+        key = cache_key(url, params)
+        name = self._file_name(key)
+        payload = json.dumps(
+            {
+                "url": key,
+                "etag": etag,
+                "last_modified": last_modified,
+                "headers": {h: resp.headers[h] for h in _KEPT_HEADERS if h in resp.headers},
+                "body": resp.text,
+                "stored_at": time.time(),
+            }
+        )
+        size = len(payload.encode())
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            tmp = self.directory / (name + ".tmp")
+            tmp.write_text(payload)
+            os.replace(tmp, self.directory / name)
+            self._total_bytes += size - self._entries.pop(name, 0)
+            self._entries[name] = size
+            self._evict()
+
+    def record(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _drop(self, name: str):
+        self._total_bytes -= self._entries.pop(name, 0)
+        try:
+            (self.directory / name).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and self._entries:
+            name = next(iter(self._entries))
+            self._drop(name)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+__all__ = ["ResponseCache", "CachedResponse", "cache_key", "DEFAULT_CACHE_MAX_BYTES"]
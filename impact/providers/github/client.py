@@ -1,18 +1,57 @@
 from __future__ import annotations
 
-import asyncio
+import concurrent.futures
+import logging
 import time
-from typing import Any, Dict, Iterable, Optional
+from typing import Any, Dict, Iterable, List, Optional, Union
 
 import httpx
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
+from impact.exceptions import ProviderError
+from impact.providers.github.cache import ResponseCache
+from impact.providers.github.governor import RateGovernor
+from impact.providers.github.tokens import TokenPool
+
+log = logging.getLogger(__name__)
+
 DEFAULT_BASE_URL = "https://api.github.com"
 DEFAULT_ACCEPT = "application/vnd.github+json"
+# Largest page GitHub serves for the list endpoints we use (pulls, timeline, reviews, comments, commits, files).
+MAX_PER_PAGE = 100
+DEFAULT_PAGE_WORKERS = 4
 
 
 class GitHubRateLimitError(Exception):
-    pass
+    """
+    A rate-limited response. `reset` (epoch seconds) is set when the retry should wait
+    for the limit to reset rather than back off: the search API's small per-minute
+    budget is not tracked by the token pool, so rotating tokens does not help there.
+    """
+
+    def __init__(self, message: str = "", reset: Optional[float] = None):
+        super().__init__(message)
+        self.reset = reset
+
+
+def _rate_limit_error(resp: httpx.Response, path: str) -> GitHubRateLimitError:
+    reset = resp.headers.get("X-RateLimit-Reset")
+    if path.startswith("/search/") and reset:
+        return GitHubRateLimitError(resp.text, reset=float(reset))
+    return GitHubRateLimitError(resp.text)
+
+
+_backoff = wait_exponential(multiplier=1, min=1, max=30)
+
+
+def _retry_wait(retry_state) -> float:
+    """Capped exponential backoff, or until the reset a GitHubRateLimitError carries."""
+    exc = retry_state.outcome.exception() if retry_state.outcome is not None else None
+    if isinstance(exc, GitHubRateLimitError) and exc.reset is not None:
+        sleep_for = max(exc.reset - time.time(), 0) + 1
+        log.info("Search rate limit hit; sleeping %.0fs until it resets", sleep_for)
+        return sleep_for
+    return _backoff(retry_state)
 
 
 def _headers(token: str, accept: str = DEFAULT_ACCEPT, etag: Optional[str] = None) -> Dict[str, str]:
@@ -25,74 +64,205 @@ def _headers(token: str, accept: str = DEFAULT_ACCEPT, etag: Optional[str] = Non
     return h
 
 
+def _is_rate_limited(resp: httpx.Response) -> bool:
+    if resp.status_code == 429:
+        return True
+    return resp.status_code == 403 and "rate limit" in resp.text.lower()
+
+
+def _page_links(resp: httpx.Response) -> Dict[str, str]:
+    """Parse the Link header into {rel: url}."""
+    links = {}
+    for part in resp.headers.get("Link", "").split(","):
+        if "<" not in part or 'rel="' not in part:
+            continue
+        rel = part[part.find('rel="') + 5 :].split('"', 1)[0]
+        links[rel] = part[part.find("<") + 1 : part.find(">")]
+    return links
+
+
+def _next_link(resp: httpx.Response) -> Optional[str]:
+    return _page_links(resp).get("next")
+
+
+def _remaining_page_urls(resp: httpx.Response) -> List[str]:
+    """
+    URLs of every page after the current one, derived from rel="next" and rel="last".
+    Empty when the endpoint is not page-numbered (cursor pagination) or has no more pages.
+    """
+    links = _page_links(resp)
+    if "next" not in links or "last" not in links:
+        return []
+    next_url = httpx.URL(links["next"])
+    last_url = httpx.URL(links["last"])
+    try:
+        first = int(next_url.params["page"])
+        last = int(last_url.params["page"])
+    except (KeyError, ValueError):
+        return []
+    return [str(last_url.copy_set_param("page", page)) for page in range(first, last + 1)]
+
+
+def _page_items(resp: httpx.Response) -> List[Dict[str, Any]]:
+    data = resp.json()
+    return data if isinstance(data, list) else [data]
+
+
 class GitHubClient:
     """
     Thin GitHub REST client with retry/backoff and simple pagination.
     Synchronous interface via httpx.Client for CLI use.
+
+    `token` may be a single token or a TokenPool; each request is sent with the
+    pooled token that has the most rate-limit budget left.
     """
 
-    def __init__(self, token: str, base_url: str = DEFAULT_BASE_URL, timeout: float = 15.0):
+    def __init__(
+        self,
+        token: Union[str, TokenPool],
+        base_url: str = DEFAULT_BASE_URL,
+        timeout: float = 15.0,
+        transport: Optional[httpx.BaseTransport] = None,
+        cache: Optional[ResponseCache] = None,
+        governor: Optional[RateGovernor] = None,
+        page_workers: int = DEFAULT_PAGE_WORKERS,
+    ):
         self.base_url = base_url.rstrip("/")
-        self.token = token
-        self.client = httpx.Client(timeout=timeout, headers=_headers(token))
+        self.tokens = token if isinstance(token, TokenPool) else TokenPool([token])
+        self.client = httpx.Client(timeout=timeout, headers={"Accept": DEFAULT_ACCEPT}, transport=transport)
+        # Optional conditional-request cache; 304s are served from it and do not count against the rate limit.
+        self.cache = cache
+        # Optional adaptive pacing/concurrency control fed by every response.
+        self.governor = governor
+        self.page_workers = page_workers
 
     def close(self):
         self.client.close()
 
+    def refresh_rate_limits(self):
+        """Record every pooled token's core budget from /rate_limit, which does not count against it."""
+        for token in self.tokens.tokens:
+            resp = self.client.get(f"{self.base_url}/rate_limit", headers=_headers(token))
+            resp.raise_for_status()
+            core = resp.json()["resources"]["core"]
+            self.tokens.set_budget(token, core.get("remaining", 0), core.get("reset"), core.get("limit"))
+
+    def _send(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        headers: Dict[str, str],
+        json_body: Optional[Dict[str, Any]] = None,
+    ) -> httpx.Response:
+        method = "GET" if json_body is None else "POST"
+        if self.governor is None:
+            return self.client.request(method, url, params=params, headers=headers, json=json_body)
+        with self.governor.slot():
+            delay = self.governor.reserve()
+            if delay:
+                time.sleep(delay)
+            resp = self.client.request(method, url, params=params, headers=headers, json=json_body)
+        self.governor.observe(resp)
+        return resp
+
     @retry(
         retry=retry_if_exception_type((httpx.HTTPError, GitHubRateLimitError)),
-        wait=wait_exponential(multiplier=1, min=1, max=30),
+        wait=_retry_wait,
         stop=stop_after_attempt(5),
         reraise=True,
     )
     def get(self, path: str, params: Optional[Dict[str, Any]] = None, etag: Optional[str] = None) -> httpx.Response:
         url = f"{self.base_url}{path}"
-        headers = _headers(self.token, etag=etag)
-        resp = self.client.get(url, params=params, headers=headers)
+        token = self.tokens.acquire()
+        headers = _headers(token, etag=etag)
+        cached = None
+        if self.cache is not None and etag is None:
+            cached = self.cache.lookup(url, params)
+            if cached:
+                headers.update(cached.conditional_headers())
+        resp = self._send(url, params, headers)
+        self.tokens.update(token, resp.headers)
         if resp.status_code == 304:
+            if cached is not None:
+                self.cache.record(hit=True)
+                return cached.to_response(resp.request)
             return resp
-        # Handle rate limiting proactively: sleep until reset then retry via tenacity.
-        if resp.status_code == 403 and "rate limit" in resp.text.lower():
-            remaining = resp.headers.get("X-RateLimit-Remaining")
-            reset = resp.headers.get("X-RateLimit-Reset")
-            if remaining == "0" and reset:
-                sleep_for = max(int(reset) - int(time.time()), 0) + 1
-                time.sleep(min(sleep_for, 900))  # cap to 15 minutes
-            raise GitHubRateLimitError(resp.text)
+        # The pool now knows this token is spent: the tenacity retry goes to another token,
+        # or acquire() sleeps until the earliest reset once every token is exhausted.
+        if _is_rate_limited(resp):
+            raise _rate_limit_error(resp, path)
         resp.raise_for_status()
+        if self.cache is not None and etag is None:
+            self.cache.record(hit=False)
+            self.cache.store(url, params, resp)
         return resp
 
-    def paginate(self, path: str, params: Optional[Dict[str, Any]] = None) -> Iterable[Dict[str, Any]]:
+    @retry(
+        retry=retry_if_exception_type((httpx.HTTPError, GitHubRateLimitError)),
+        wait=wait_exponential(multiplier=1, min=1, max=30),
+        stop=stop_after_attempt(5),
+        reraise=True,
+    )
+    def graphql(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
-        Follows GitHub Link headers. After the first request we stop sending the original params
-        because the `next` URL already contains its own query string (including page).
+        Run a GraphQL query and return its `data`. Rate-limit errors (reported in the
+        body with HTTP 200) are retried like REST ones; other errors raise ProviderError.
         """
-        params = params or {}
-        next_path = path
+        token = self.tokens.acquire()
+        resp = self._send(f"{self.base_url}/graphql", None, _headers(token), {"query": query, "variables": variables or {}})
+        self.tokens.update(token, resp.headers)
+        if _is_rate_limited(resp):
+            raise GitHubRateLimitError(resp.text)
+        resp.raise_for_status()
+        payload = resp.json()
+        errors = payload.get("errors") or []
+        if any(e.get("type") == "RATE_LIMITED" for e in errors):
+            raise GitHubRateLimitError(str(errors))
+        if errors and not payload.get("data"):
+            raise ProviderError(f"GraphQL query failed: {errors}", provider="github", status_code=resp.status_code)
+        for e in errors:
+            log.warning("GraphQL partial error: %s", e.get("message"))
+        return payload["data"]
+
+    def paginate(
+        self, path: str, params: Optional[Dict[str, Any]] = None, parallel: bool = True
+    ) -> Iterable[Dict[str, Any]]:
+        """
+        Follows GitHub Link headers, always asking for the largest page size. Once the first
+        response's rel="last" reveals the page count, the remaining pages are fetched
+        concurrently and their items yielded in page order. Pass parallel=False for callers
+        that stop early (e.g. scanning PRs by update time) so unneeded pages are not requested.
+        After the first request we stop sending the original params because the `next` URL
+        already contains its own query string (including page).
+        """
+        params = {"per_page": MAX_PER_PAGE, **(params or {})}
+        resp = self.get(path, params=params)
+        if resp.status_code == 304:
+            return
+        yield from _page_items(resp)
+
+        page_urls = _remaining_page_urls(resp) if parallel else []
+        if page_urls:
+            page_paths = [url.replace(self.base_url, "") for url in page_urls]
+            workers = max(1, min(self.page_workers, len(page_paths)))
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+                # map() returns pages in submission order while fetching them concurrently.
+                for page in executor.map(self.get, page_paths):
+                    if page.status_code != 304:
+                        yield from _page_items(page)
+            return
+
         last_url = None
         while True:
-            resp = self.get(next_path, params=params)
-            if resp.status_code == 304:
-                return
-            data = resp.json()
-            if isinstance(data, list):
-                for item in data:
-                    yield item
-            else:
-                yield data
-
-            links = resp.headers.get("Link", "")
-            next_link = None
-            for part in links.split(","):
-                if 'rel="next"' in part:
-                    next_link = part[part.find("<") + 1 : part.find(">")]
-                    break
+            next_link = _next_link(resp)
             if not next_link or next_link == last_url:
                 break
             last_url = next_link
             # next_link already contains query params; avoid duplicating by clearing params
-            next_path = next_link.replace(self.base_url, "")
-            params = None
+            resp = self.get(next_link.replace(self.base_url, ""))
+            if resp.status_code == 304:
+                return
+            yield from _page_items(resp)
 
 
 __all__ = ["GitHubClient", "GitHubRateLimitError"]
@@ -0,0 +1,491 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import random
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from impact.persistence.compression import find_dump_file, open_text
+from impact.persistence.filesystem import CANONICAL_FILES, record_pr_number
+from impact.providers.github.fetcher import PR_BUNDLE_ENDPOINTS
+
+log = logging.getLogger(__name__)
+
+DEFAULT_RATE_LIMIT = 5000
+# GitHub's default and maximum page sizes for the list endpoints we use.
+DEFAULT_PER_PAGE = 30
+MAX_PER_PAGE = 100
+
+# Annotations the dump writer adds to raw payloads; stripped when replaying a recorded dump.
+_WRITER_FIELDS = {"commits": ("pull_request_number", "idx"), "files": ("pull_request_number",), "timeline": ("pull_request_number",)}
+
+
+def _iso(dt: datetime) -> str:
+    return dt.isoformat().replace("+00:00", "Z")
+
+
+def _parse_iso(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _route(template: str) -> "re.Pattern[str]":
+    pattern = re.escape(template).replace(r"\{repo\}", r"(?P<repo>[^/]+/[^/]+)").replace(r"\{number\}", r"(?P<number>\d+)")
+    return re.compile(f"^{pattern}$")
+
+
+# Routes are derived from the fetcher's own endpoint table so the two cannot drift apart.
+_BUNDLE_ROUTES = [(key, _route(template)) for key, (template, _) in PR_BUNDLE_ENDPOINTS.items()]
+_LIST_ROUTE = re.compile(r"^/repos/(?P<repo>[^/]+/[^/]+)/pulls$")
+
+
+# ---------------------------
+# Data
+# ---------------------------
+class FakeGitHubData:
+    """
+    PR bundles served by FakeGitHubServer, keyed by repo and PR number. Each bundle
+    has the keys of PR_BUNDLE_ENDPOINTS holding raw REST payloads.
+    """
+
+    def __init__(self):
+        self.bundles: Dict[str, Dict[int, Dict[str, Any]]] = {}
+
+    def add_bundle(self, repo: str, bundle: Dict[str, Any]):
+        self.bundles.setdefault(repo, {})[bundle["pull_request"]["number"]] = bundle
+
+    def bundle(self, repo: str, number: int) -> Optional[Dict[str, Any]]:
+        return self.bundles.get(repo, {}).get(number)
+
+    def pulls(self, repo: str) -> List[Dict[str, Any]]:
+        """PR objects of `repo`, most recently updated first (the order list_prs relies on)."""
+        prs = [b["pull_request"] for b in self.bundles.get(repo, {}).values()]
+        return sorted(prs, key=lambda pr: pr["updated_at"], reverse=True)
+
+    def __len__(self) -> int:
+        return sum(len(prs) for prs in self.bundles.values())
+
+    @classmethod
+    def from_dump(cls, dump_dir: Path) -> "FakeGitHubData":
+        """Replay a recorded canonical dump (as written by FileSystemDumpWriter)."""
+        canonical = Path(dump_dir) / "canonical"
+        grouped: Dict[str, Dict[int, List[Dict[str, Any]]]] = {key: {} for key in CANONICAL_FILES}
+        for key, fname in CANONICAL_FILES.items():
+            found = find_dump_file(canonical, fname)
+            if found is None:
+                continue
+            with open_text(*found) as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    item = json.loads(line)
+                    number = record_pr_number(key, item)
+                    for field in _WRITER_FIELDS.get(key, ()):
+                        item.pop(field, None)
+                    grouped[key].setdefault(number, []).append(item)
+
+        data = cls()
+        for number, (pr, *_) in grouped["pull_request"].items():
+            bundle = {"pull_request": pr}
+            for key in PR_BUNDLE_ENDPOINTS:
+                if key != "pull_request":
+                    bundle[key] = grouped[key].get(number, [])
+            data.add_bundle(pr["base"]["repo"]["full_name"], bundle)
+        return data
+
+    @classmethod
+    def synthetic(
+        cls,
+        repo: str = "acme/widgets",
+        user_login: str = "dev0",
+        prs: int = 50,
+        developers: int = 8,
+        reviews: int = 3,
+        comments: int = 4,
+        commits: int = 5,
+        files: int = 6,
+        timeline: int = 6,
+        start: datetime = datetime(2025, 1, 1, tzinfo=timezone.utc),
+        seed: int = 0,
+    ) -> "FakeGitHubData":
+        """
+        Deterministic synthetic PRs with REST-shaped payloads. Counts are per PR; authors
+        and reviewers are drawn from `developers` users, the first of which is `user_login`.
+        """
+        rng = random.Random(seed)
+        owner_login = repo.split("/")[0]
+        owner = {"login": owner_login, "id": 1, "type": "Organization"}
+        users = [{"login": user_login if i == 0 else f"dev{i}", "id": 100 + i, "type": "User"} for i in range(developers)]
+        repo_dict = {"id": 1, "name": repo.split("/")[1], "full_name": repo, "owner": owner}
+        api = f"https://api.github.com/repos/{repo}"
+        data = cls()
+        ids = iter(range(1_000_000, 10_000_000))
+
+        for number in range(1, prs + 1):
+            author = rng.choice(users)
+            created = start + timedelta(hours=rng.randint(0, 24 * 300))
+            merged = created + timedelta(hours=rng.randint(1, 24 * 7))
+            others = [u for u in users if u is not author] or users
+
+            def at(hours_after: int) -> str:
+                return _iso(created + timedelta(hours=min(hours_after, int((merged - created).total_seconds() // 3600))))
+
+            branch = {"label": f"{owner_login}:main", "ref": "main", "sha": f"base{number}", "user": owner}
+            bundle: Dict[str, Any] = {
+                "pull_request": {
+                    "id": next(ids),
+                    "number": number,
+                    "title": f"Change {number}",
+                    "body": "Synthetic pull request",
+                    "state": "closed",
+                    "user": author,
+                    "created_at": _iso(created),
+                    "updated_at": _iso(merged),
+                    "closed_at": _iso(merged),
+                    "merged_at": _iso(merged),
+                    "merged": True,
+                    "merge_commit_sha": f"merge{number}",
+                    "merged_by": rng.choice(others),
+                    "base": {**branch, "repo": repo_dict},
+                    "head": {**branch, "label": f"{author['login']}:topic{number}", "ref": f"topic{number}", "user": author},
+                    "commits": commits,
+                    "additions": 10 * files,
+                    "deletions": 2 * files,
+                    "changed_files": files,
+                    "comments": comments,
+                    "review_comments": comments,
+                    "requested_reviewers": [],
+                    "assignees": [],
+                },
+                "reviews": [
+                    {
+                        "id": next(ids),
+                        "user": rng.choice(others),
+                        "body": "Looks good" if i == reviews - 1 else "Please revise",
+                        "state": "APPROVED" if i == reviews - 1 else "CHANGES_REQUESTED",
+                        "submitted_at": at(2 + 4 * i),
+                        "pull_request_url": f"{api}/pulls/{number}",
+                    }
+                    for i in range(reviews)
+                ],
+                "review_comments": [
+                    {
+                        "id": next(ids),
+                        "user": rng.choice(others),
+                        "body": f"Comment {i}",
+                        "created_at": at(2 + i),
+                        "updated_at": at(2 + i),
+                        "path": f"src/module_{i % max(files, 1)}.py",
+                        "position": i + 1,
+                        "pull_request_url": f"{api}/pulls/{number}",
+                    }
+                    for i in range(comments)
+                ],
+                "issue_comments": [
+                    {
+                        "id": next(ids),
+                        "user": rng.choice(users),
+                        "body": f"Discussion {i}",
+                        "created_at": at(1 + i),
+                        "updated_at": at(1 + i),
+                        "issue_url": f"{api}/issues/{number}",
+                    }
+                    for i in range(comments)
+                ],
+                "commits": [
+                    {
+                        "sha": f"{number:06d}{i:04d}",
+                        "author": author,
+                        "committer": author,
+                        "commit": {"message": f"Commit {i}", "author": {"date": at(i)}},
+                    }
+                    for i in range(commits)
+                ],
+                "files": [
+                    {
+                        "sha": f"file{number}-{i}",
+                        "filename": f"src/module_{i}.py",
+                        "status": "modified",
+                        "additions": 10,
+                        "deletions": 2,
+                        "changes": 12,
+                    }
+                    for i in range(files)
+                ],
+                "timeline": [
+                    {
+                        "id": next(ids),
+                        "event": rng.choice(["labeled", "review_requested", "head_ref_force_pushed", "referenced"]),
+                        "actor": rng.choice(users),
+                        "created_at": at(i),
+                        "url": f"{api}/issues/events/{number}{i}",
+                    }
+                    for i in range(timeline)
+                ],
+            }
+            # REST timelines repeat issue comments, reviews and commits as events of their own.
+            bundle["timeline"] += [
+                {"id": c["id"], "event": "commented", "actor": c["user"], "user": c["user"], "body": c["body"], "created_at": c["created_at"]}
+                for c in bundle["issue_comments"]
+            ]
+            bundle["timeline"] += [
+                {"id": r["id"], "event": "reviewed", "user": r["user"], "body": r["body"], "state": r["state"].lower(), "submitted_at": r["submitted_at"]}
+                for r in bundle["reviews"]
+            ]
+            bundle["timeline"] += [
+                {
+                    "sha": c["sha"],
+                    "event": "committed",
+                    "author": {"name": author["login"], "email": None, "date": c["commit"]["author"]["date"]},
+                    "committer": {"name": author["login"], "email": None, "date": c["commit"]["author"]["date"]},
+                    "message": c["commit"]["message"],
+                }
+                for c in bundle["commits"]
+            ]
+            data.add_bundle(repo, bundle)
+        return data
+
+
+# ---------------------------
+# Server
+# ---------------------------
+class FakeGitHubServer:
+    """
+    Local stand-in for the GitHub REST API, serving FakeGitHubData on 127.0.0.1.
+
+    Serves the endpoints GitHubFetcher uses (PR list, the seven bundle endpoints,
+    /search/issues and /rate_limit) with GitHub's behaviour where the fetch path
+    depends on it: page/per_page pagination with Link headers, ETags answered with
+    304 (free of charge, as on GitHub), per-token X-RateLimit-* headers with 403
+    once a token's budget is spent, and optional per-request latency plus jitter.
+    Counters (`requests`, `not_modified`, `rate_limited`) make it usable as a
+    benchmark target. Use as a context manager or via start()/stop().
+    """
+
+    def __init__(
+        self,
+        data: FakeGitHubData,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        rate_limit: int = DEFAULT_RATE_LIMIT,
+        reset_after: float = 3600.0,
+        max_per_page: int = MAX_PER_PAGE,
+        seed: int = 0,
+    ):
+        self.data = data
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.reset_after = reset_after
+        self.max_per_page = max_per_page
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._budgets: Dict[str, Tuple[int, float]] = {}  # token -> (remaining, reset epoch)
+        self.requests: Counter = Counter()  # endpoint kind -> count, including 304s
+        self.not_modified = 0
+        self.rate_limited = 0
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    # ---------------------------
+    # Lifecycle
+    # ---------------------------
+    @property
+    def url(self) -> str:
+        if self._httpd is None:
+            raise RuntimeError("FakeGitHubServer is not running")
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeGitHubServer":
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):  # noqa: N802 - http.server naming
+                server._handle(self)
+
+            def log_message(self, format, *args):  # noqa: A002 - signature fixed by base class
+                log.debug("fake github: " + format, *args)
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self) -> "FakeGitHubServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.requests.values())
+
+    # ---------------------------
+    # Rate limit
+    # ---------------------------
+    def _budget(self, token: str, spend: bool) -> Tuple[int, float]:
+        now = time.time()
+        with self._lock:
+            remaining, reset = self._budgets.get(token, (self.rate_limit, now + self.reset_after))
+            if now >= reset:
+                remaining, reset = self.rate_limit, now + self.reset_after
+            if spend and remaining > 0:
+                remaining -= 1
+            self._budgets[token] = (remaining, reset)
+            return remaining, reset
+
+    def _rate_headers(self, remaining: int, reset: float) -> Dict[str, str]:
+        return {
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": str(int(reset) + 1),
+            "X-RateLimit-Resource": "core",
+        }
+
+    # ---------------------------
+    # Request handling
+    # ---------------------------
+    def _handle(self, req: BaseHTTPRequestHandler):
+        if self.latency or self.jitter:
+            with self._lock:
+                delay = self.latency + self._rng.uniform(0, self.jitter)
+            time.sleep(delay)
+
+        parts = urlsplit(req.path)
+        params = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        token = req.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+
+        if parts.path == "/rate_limit":
+            remaining, reset = self._budget(token, spend=False)
+            self._count("rate_limit")
+            core = {"limit": self.rate_limit, "remaining": remaining, "reset": int(reset) + 1}
+            return self._send(req, 200, {"resources": {"core": core}})
+
+        kind, payload = self._resolve(parts.path, params)
+        self._count(kind)
+        if payload is None:
+            return self._send(req, 404, {"message": "Not Found"})
+
+        remaining, reset = self._budget(token, spend=False)
+        if remaining <= 0:
+            with self._lock:
+                self.rate_limited += 1
+            body = {"message": "API rate limit exceeded for token."}
+            return self._send(req, 403, body, self._rate_headers(0, reset))
+
+        headers: Dict[str, str] = {}
+        if isinstance(payload, list) and kind != "search":
+            payload, headers = self._paginate(req, parts.path, params, payload)
+        body = json.dumps(payload).encode()
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        headers["ETag"] = etag
+        if req.headers.get("If-None-Match") == etag:
+            # Conditional hits are free on GitHub, so they do not spend budget here either.
+            with self._lock:
+                self.not_modified += 1
+            headers.update(self._rate_headers(remaining, reset))
+            return self._send_raw(req, 304, b"", headers)
+        remaining, reset = self._budget(token, spend=True)
+        headers.update(self._rate_headers(remaining, reset))
+        return self._send_raw(req, 200, body, headers)
+
+    def _count(self, kind: str):
+        with self._lock:
+            self.requests[kind] += 1
+
+    def _resolve(self, path: str, params: Dict[str, str]) -> Tuple[str, Any]:
+        if path == "/search/issues":
+            return "search", self._search(params)
+        match = _LIST_ROUTE.match(path)
+        if match:
+            return "pulls", self.data.pulls(match["repo"]) if match["repo"] in self.data.bundles else None
+        for key, route in _BUNDLE_ROUTES:
+            match = route.match(path)
+            if match:
+                bundle = self.data.bundle(match["repo"], int(match["number"]))
+                return key, None if bundle is None else bundle[key]
+        return "unknown", None
+
+    def _paginate(
+        self, req: BaseHTTPRequestHandler, path: str, params: Dict[str, str], items: List[Any]
+    ) -> Tuple[List[Any], Dict[str, str]]:
+        per_page = min(int(params.get("per_page", DEFAULT_PER_PAGE)), self.max_per_page)
+        page = max(int(params.get("page", 1)), 1)
+        last = max((len(items) + per_page - 1) // per_page, 1)
+        headers = {}
+        if page < last:
+            base = f"http://{req.headers.get('Host')}{path}"
+
+            def link(n: int) -> str:
+                return f"{base}?{urlencode({**params, 'page': n})}"
+
+            headers["Link"] = f'<{link(page + 1)}>; rel="next", <{link(last)}>; rel="last"'
+        return items[(page - 1) * per_page : page * per_page], headers
+
+    def _search(self, params: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        terms = dict(term.split(":", 1) for term in params.get("q", "").split() if ":" in term)
+        repo = terms.pop("repo", None)
+        terms.pop("is", None)
+        if repo not in self.data.bundles:
+            return {"total_count": 0, "incomplete_results": False, "items": []}
+        date_field = next((f for f in ("updated", "created") if f in terms), None)
+        window = terms.pop(date_field).split("..") if date_field else None
+        hits = []
+        for number, bundle in sorted(self.data.bundles[repo].items()):
+            pr = bundle["pull_request"]
+            if window and not _parse_iso(window[0]) <= _parse_iso(pr[f"{date_field}_at"]) <= _parse_iso(window[1]):
+                continue
+            if all(login in self._participants(bundle, qualifier) for qualifier, login in terms.items()):
+                hits.append({"number": number, "user": pr["user"], "created_at": pr["created_at"], "updated_at": pr["updated_at"], "pull_request": {}})
+        per_page = min(int(params.get("per_page", DEFAULT_PER_PAGE)), MAX_PER_PAGE)
+        page = max(int(params.get("page", 1)), 1)
+        return {"total_count": len(hits), "incomplete_results": False, "items": hits[(page - 1) * per_page : page * per_page]}
+
+    @staticmethod
+    def _participants(bundle: Dict[str, Any], qualifier: str) -> set:
+        author = {bundle["pull_request"]["user"]["login"]}
+        reviewers = {r["user"]["login"] for r in bundle["reviews"]}
+        commenters = {c["user"]["login"] for c in bundle["issue_comments"] + bundle["review_comments"]}
+        if qualifier == "author":
+            return author
+        if qualifier == "reviewed-by":
+            return reviewers
+        if qualifier == "commenter":
+            return commenters
+        return author | reviewers | commenters
+
+    def _send(self, req: BaseHTTPRequestHandler, status: int, payload: Any, headers: Optional[Dict[str, str]] = None):
+        self._send_raw(req, status, json.dumps(payload).encode(), headers or {})
+
+    @staticmethod
+    def _send_raw(req: BaseHTTPRequestHandler, status: int, body: bytes, headers: Dict[str, str]):
+        req.send_response(status)
+        req.send_header("Content-Type", "application/json; charset=utf-8")
+        req.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            req.send_header(name, value)
+        req.end_headers()
+        if body:
+            req.wfile.write(body)
+
+
+__all__ = ["FakeGitHubData", "FakeGitHubServer"]
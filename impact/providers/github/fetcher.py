@@ -1,9 +1,48 @@
 from __future__ import annotations
 
+import logging
+import math
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Iterable, List, Optional, Set
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
-from impact.providers.github.client import GitHubClient
+from impact.providers.github.client import MAX_PER_PAGE, GitHubClient
+
+log = logging.getLogger(__name__)
+
+# Bundle key -> (endpoint path template, paginated). Shared by the sync and async fetchers.
+PR_BUNDLE_ENDPOINTS: Dict[str, Tuple[str, bool]] = {
+    "pull_request": ("/repos/{repo}/pulls/{number}", False),
+    "timeline": ("/repos/{repo}/issues/{number}/timeline", True),
+    "reviews": ("/repos/{repo}/pulls/{number}/reviews", True),
+    "review_comments": ("/repos/{repo}/pulls/{number}/comments", True),
+    "issue_comments": ("/repos/{repo}/issues/{number}/comments", True),
+    "commits": ("/repos/{repo}/pulls/{number}/commits", True),
+    "files": ("/repos/{repo}/pulls/{number}/files", True),
+}
+
+
+def bundle_endpoints(resources: Optional[Iterable[str]] = None) -> Dict[str, Tuple[str, bool]]:
+    """
+    PR_BUNDLE_ENDPOINTS narrowed to the requested bundle keys. The PR object itself is
+    always fetched; None means every resource.
+    """
+    if resources is None:
+        return PR_BUNDLE_ENDPOINTS
+    wanted = set(resources)
+    unknown = wanted - set(PR_BUNDLE_ENDPOINTS)
+    if unknown:
+        raise ValueError(f"Unknown PR bundle resources: {sorted(unknown)}")
+    return {key: spec for key, spec in PR_BUNDLE_ENDPOINTS.items() if key == "pull_request" or key in wanted}
+
+
+# The search API returns at most this many results per query, however many match.
+SEARCH_RESULT_CAP = 1000
+# Qualifiers used to discover PRs a user touched. `involves` covers author, assignee,
+# mentions and commenters; `reviewed-by` adds reviews left without a comment or request.
+DEFAULT_SEARCH_QUALIFIERS: Tuple[str, ...] = ("involves", "reviewed-by")
+# Search dates only go back to GitHub's launch; used as the lower bound of open-ended ranges.
+SEARCH_EPOCH = datetime(2008, 1, 1, tzinfo=timezone.utc)
 
 
 class GitHubFetcher:
@@ -30,7 +69,8 @@ class GitHubFetcher:
             "direction": "desc",
         }
         results = []
-        for pr in self.client.paginate(f"/repos/{repo}/pulls", params=params):
+        # Serial pagination: we usually stop long before the last page.
+        for pr in self.client.paginate(f"/repos/{repo}/pulls", params=params, parallel=False):
             updated_at = datetime.fromisoformat(pr["updated_at"].replace("Z", "+00:00"))
             # API returns in descending updated order; stop when we fall below the lower bound.
             if since and updated_at < since:
@@ -40,16 +80,79 @@ class GitHubFetcher:
             results.append(pr)
         return results
 
-    def fetch_pr_bundle(self, repo: str, number: int) -> Dict[str, Any]:
+    # ---------------------------
+    # Search-based discovery
+    # ---------------------------
+    def _search_page(self, query: str, page: int) -> Dict[str, Any]:
+        resp = self.client.get("/search/issues", params={"q": query, "per_page": MAX_PER_PAGE, "page": page})
+        data = resp.json()
+        # Search has its own small budget (30/min); wait for it here rather than burning retries.
+        # A 403 that still gets through is retried by the client after the same reset.
+        if resp.headers.get("X-RateLimit-Remaining") == "0" and resp.headers.get("X-RateLimit-Reset"):
+            sleep_for = max(int(resp.headers["X-RateLimit-Reset"]) - time.time(), 0) + 1
+            log.info("Search rate limit exhausted; sleeping %.0fs", sleep_for)
+            time.sleep(sleep_for)
+        return data
+
+    def _search_range(self, base_query: str, date_field: str, since: datetime, until: datetime) -> Iterator[Dict[str, Any]]:
+        """Yield every search hit in [since, until], halving the range while it exceeds the result cap."""
+        query = f"{base_query} {date_field}:{self._since_param(since)}..{self._since_param(until)}"
+        first = self._search_page(query, 1)
+        total = first.get("total_count", 0)
+        if total > SEARCH_RESULT_CAP and until - since > timedelta(seconds=1):
+            mid = since + (until - since) / 2
+            mid = mid.replace(microsecond=0)
+            log.debug("Splitting search %r (%s results) at %s", query, total, mid)
+            yield from self._search_range(base_query, date_field, since, mid)
+            yield from self._search_range(base_query, date_field, mid + timedelta(seconds=1), until)
+            return
+        if total > SEARCH_RESULT_CAP:
+            log.warning("Search %r has %s results in a 1s range; only the first %s are reachable", query, total, SEARCH_RESULT_CAP)
+        yield from first.get("items", [])
+        pages = math.ceil(min(total, SEARCH_RESULT_CAP) / MAX_PER_PAGE)
+        for page in range(2, pages + 1):
+            yield from self._search_page(query, page).get("items", [])
+
+    def search_prs(
+        self,
+        repo: str,
+        user_login: str,
+        since: Optional[datetime],
+        until: Optional[datetime],
+        qualifiers: Sequence[str] = DEFAULT_SEARCH_QUALIFIERS,
+        date_field: str = "updated",
+    ) -> List[Dict[str, Any]]:
+        """
+        Discover PRs in `repo` that `user_login` touched, via the search API instead of
+        listing every PR. Runs one query per qualifier (author:, reviewed-by:, ...) bounded
+        by `date_field` (updated/created), splitting date ranges automatically so no query
+        exceeds the 1000-result cap. Returns issue-shaped search items, deduplicated by number.
+        """
+        since = since or SEARCH_EPOCH
+        until = until or datetime.now(timezone.utc)
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        if until.tzinfo is None:
+            until = until.replace(tzinfo=timezone.utc)
+        since = since.replace(microsecond=0)
+        until = until.replace(microsecond=0)
+        found: Dict[int, Dict[str, Any]] = {}
+        for qualifier in qualifiers:
+            base_query = f"repo:{repo} is:pr {qualifier}:{user_login}"
+            for item in self._search_range(base_query, date_field, since, until):
+                found.setdefault(item["number"], item)
+        return [found[number] for number in sorted(found)]
+
+    def fetch_pr_bundle(self, repo: str, number: int, resources: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Fetch the PR and the requested bundle resources (all of them when `resources` is None)."""
         bundle: Dict[str, Any] = {}
-        bundle["pull_request"] = self.client.get(f"/repos/{repo}/pulls/{number}").json()
-        bundle["timeline"] = list(self.client.paginate(f"/repos/{repo}/issues/{number}/timeline"))
-        bundle["reviews"] = list(self.client.paginate(f"/repos/{repo}/pulls/{number}/reviews"))
-        bundle["review_comments"] = list(self.client.paginate(f"/repos/{repo}/pulls/{number}/comments"))
-        bundle["issue_comments"] = list(self.client.paginate(f"/repos/{repo}/issues/{number}/comments"))
-        bundle["commits"] = list(self.client.paginate(f"/repos/{repo}/pulls/{number}/commits"))
-        bundle["files"] = list(self.client.paginate(f"/repos/{repo}/pulls/{number}/files"))
+        for key, (template, paginated) in bundle_endpoints(resources).items():
+            path = template.format(repo=repo, number=number)
+            if paginated:
+                bundle[key] = list(self.client.paginate(path))
+            else:
+                bundle[key] = self.client.get(path).json()
         return bundle
 
 
-__all__ = ["GitHubFetcher"]
+__all__ = ["GitHubFetcher", "PR_BUNDLE_ENDPOINTS", "bundle_endpoints"]
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import List, Optional, Tuple
+
+import httpx
+
+from impact.providers.github.tokens import TokenPool
+
+log = logging.getLogger(__name__)
+
+# GitHub asks clients to wait at least a minute after a secondary limit without Retry-After.
+DEFAULT_SECONDARY_BACKOFF = 60.0
+# Below this share of the window's budget we stop ramping up and drop to min concurrency.
+LOW_BUDGET_FRACTION = 0.1
+DEFAULT_HOURLY_LIMIT = 5000
+
+
+def _is_secondary_limit(resp: httpx.Response) -> bool:
+    if resp.status_code not in (403, 429):
+        return False
+    return "Retry-After" in resp.headers or "secondary rate limit" in resp.text.lower()
+
+
+class RateGovernor:
+    """
+    Adaptive pacing and concurrency control for GitHub requests.
+
+    Every response is observed: once less than `pace_below` of the pooled budget
+    is left, the rate-limit headers set a request interval that spreads what
+    remains evenly until each token's reset (above it requests are unpaced, so
+    small fetches are not slowed down), and concurrency follows AIMD - it grows by one
+    after a run of clean responses and halves on a secondary limit, while
+    Retry-After / secondary-limit responses pause all requests. Callers take a
+    slot (`slot()` for threads, `async_slot()` for coroutines) and sleep for
+    `reserve()` before sending.
+    """
+
+    def __init__(
+        self,
+        tokens: Optional[TokenPool] = None,
+        min_concurrency: int = 1,
+        max_concurrency: int = 8,
+        safety: float = 0.9,
+        pace_below: float = 0.5,
+        secondary_backoff: float = DEFAULT_SECONDARY_BACKOFF,
+    ):
+        if not 1 <= min_concurrency <= max_concurrency:
+            raise ValueError("Require 1 <= min_concurrency <= max_concurrency")
+        self.tokens = tokens
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.safety = safety
+        self.pace_below = pace_below
+        self.secondary_backoff = secondary_backoff
+        self.concurrency = min_concurrency
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        # Coroutines waiting in async_slot(), woken (on their own loop) when a slot may be free.
+        self._async_waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = []
+        self._clean_streak = 0
+        self._next_send = 0.0
+        self._paused_until = 0.0
+        # Observability for benchmarks and logs.
+        self.slept_seconds = 0.0
+        self.secondary_limits = 0
+
+    # ---------------------------
+    # Budget
+    # ---------------------------
+    def _budget(self, now: float) -> Optional[Tuple[float, float]]:
+        """(requests/s the pooled budget allows, fraction of budget left), or None if unknown."""
+        if self.tokens is None:
+            return None
+        rate = 0.0
+        remaining = 0
+        limit = 0
+        for token in self.tokens.tokens:
+            b = self.tokens.budget(token)
+            if b.remaining is None or b.reset is None or now >= b.reset:
+                return None  # a fresh or rolled-over token: budget is not the constraint
+            rate += max(b.remaining, 0) / max(b.reset - now, 1.0)
+            remaining += max(b.remaining, 0)
+            limit += b.limit or DEFAULT_HOURLY_LIMIT
+        return rate * self.safety, remaining / limit
+
+    def request_interval(self) -> float:
+        """Seconds between sends that spends the known budget evenly until reset."""
+        budget = self._budget(time.time())
+        if budget is None or budget[0] <= 0 or budget[1] >= self.pace_below:
+            return 0.0
+        return 1.0 / budget[0]
+
+    def reserve(self) -> float:
+        """Claim the next send slot and return how long the caller must wait before sending."""
+        interval = self.request_interval()
+        with self._cond:
+            now = time.time()
+            start = max(now, self._next_send, self._paused_until)
+            self._next_send = start + interval
+            wait = start - now
+            self.slept_seconds += wait
+        return wait
+
+    # ---------------------------
+    # Feedback
+    # ---------------------------
+    def observe(self, resp: httpx.Response):
+        now = time.time()
+        with self._cond:
+            if _is_secondary_limit(resp):
+                retry_after = resp.headers.get("Retry-After")
+                backoff = float(retry_after) if retry_after and retry_after.isdigit() else self.secondary_backoff
+                self._paused_until = max(self._paused_until, now + backoff)
+                self.concurrency = max(self.min_concurrency, self.concurrency // 2)
+                self._clean_streak = 0
+                self.secondary_limits += 1
+                log.warning("Secondary rate limit hit; pausing %.0fs, concurrency -> %s", backoff, self.concurrency)
+                return
+            if resp.status_code >= 400:
+                self._clean_streak = 0
+                return
+            budget = self._budget(now)
+            if budget is not None and budget[1] < LOW_BUDGET_FRACTION:
+                self.concurrency = self.min_concurrency
+                self._clean_streak = 0
+                return
+            self._clean_streak += 1
+            if self._clean_streak >= 2 * self.concurrency and self.concurrency < self.max_concurrency:
+                self.concurrency += 1
+                self._clean_streak = 0
+                self._notify()
+
+    # ---------------------------
+    # Concurrency slots
+    # ---------------------------
+    def _notify(self):
+        """Wake every waiter, threads and coroutines alike; call with _cond held."""
+        self._cond.notify_all()
+        for loop, event in self._async_waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:  # the waiter's loop has closed
+                pass
+        self._async_waiters.clear()
+
+    def _leave(self):
+        with self._cond:
+            self._in_flight -= 1
+            self._notify()
+
+    @contextmanager
+    def slot(self):
+        with self._cond:
+            while self._in_flight >= self.concurrency:
+                self._cond.wait()
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            self._leave()
+
+    @asynccontextmanager
+    async def async_slot(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                if self._in_flight < self.concurrency:
+                    self._in_flight += 1
+                    break
+                # Registered under the lock, so a release after this point always wakes us.
+                waiter = (loop, asyncio.Event())
+                self._async_waiters.append(waiter)
+            try:
+                await waiter[1].wait()
+            except BaseException:
+                with self._cond:
+                    if waiter in self._async_waiters:
+                        self._async_waiters.remove(waiter)
+                raise
+        try:
+            yield
+        finally:
+            self._leave()
+
+
+__all__ = ["RateGovernor"]
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Mapping, Optional, Sequence, Tuple
+
+MAX_POOL_SLEEP = 900  # cap to 15 minutes, matching the single-token client
+
+
+@dataclass
+class TokenBudget:
+    token: str
+    # None until the first response for this token reports its budget.
+    remaining: Optional[int] = None
+    reset: Optional[int] = None  # epoch seconds
+    limit: Optional[int] = None  # requests per window
+
+    def available(self, now: float, reserve: int = 0) -> Optional[int]:
+        """Usable requests left, or None if unknown (treated as fresh)."""
+        if self.remaining is None:
+            return None
+        if self.reset is not None and now >= self.reset:
+            return None  # window rolled over; budget refreshed server-side
+        return self.remaining - reserve
+
+
+class TokenPool:
+    """
+    A set of GitHub tokens with per-token rate-limit accounting.
+
+    Budgets are updated from the X-RateLimit-Remaining / X-RateLimit-Reset headers
+    of every response. Each request goes to the token with the most remaining
+    budget; callers only wait when every token is exhausted, and then only until
+    the earliest reset. A pool of one token behaves like the plain client.
+    Safe to share between threads.
+    """
+
+    def __init__(self, tokens: Sequence[str]):
+        tokens = [t for t in dict.fromkeys(tokens) if t]
+        if not tokens:
+            raise ValueError("TokenPool needs at least one token")
+        self._budgets = {t: TokenBudget(t) for t in tokens}
+        self._lock = threading.Lock()
+        # Total time callers spent waiting for an exhausted pool to reset.
+        self.slept_seconds = 0.0
+
+    @property
+    def tokens(self) -> Tuple[str, ...]:
+        return tuple(self._budgets)
+
+    def __len__(self) -> int:
+        return len(self._budgets)
+
+    def budget(self, token: str) -> TokenBudget:
+        return self._budgets[token]
+
+    def next_token(self, reserve: int = 0) -> Tuple[Optional[str], float]:
+        """
+        Pick the token with the most remaining budget and reserve one request on it.
+        Returns (token, 0) or, when every token is exhausted, (None, seconds_to_wait).
+        """
+        now = time.time()
+        with self._lock:
+            best: Optional[TokenBudget] = None
+            best_left = -1.0
+            for b in self._budgets.values():
+                left = b.available(now, reserve)
+                score = float("inf") if left is None else left
+                if score > 0 and score > best_left:
+                    best, best_left = b, score
+            if best is not None:
+                if best_left != float("inf"):
+                    best.remaining -= 1
+                return best.token, 0.0
+            return None, self._wait_seconds(now)
+
+    def _wait_seconds(self, now: float) -> float:
+        resets = [b.reset for b in self._budgets.values() if b.reset is not None]
+        if not resets:
+            return 1.0
+        return min(max(min(resets) - now, 0) + 1, MAX_POOL_SLEEP)
+
+    def wait_seconds(self, reserve: int = 0) -> float:
+        """Seconds until some token has more than `reserve` requests left (0 if one already does)."""
+        now = time.time()
+        with self._lock:
+            for b in self._budgets.values():
+                left = b.available(now, reserve)
+                if left is None or left > 0:
+                    return 0.0
+            return self._wait_seconds(now)
+
+    def acquire(self, reserve: int = 0) -> str:
+        """Blocking variant of next_token: sleeps until a token has budget."""
+        while True:
+            token, wait = self.next_token(reserve)
+            if token is not None:
+                return token
+            self.slept_seconds += wait
+            time.sleep(wait)
+
+    def update(self, token: str, headers: Mapping[str, str]):
+        """Record the core budget reported by a response made with `token`."""
+        # GraphQL and search have their own budgets; only core REST headers feed the pool.
+        if headers.get("X-RateLimit-Resource", "core") != "core":
+            return
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        limit = headers.get("X-RateLimit-Limit")
+        with self._lock:
+            b = self._budgets.get(token)
+            if b is None:
+                return
+            if remaining is not None:
+                b.remaining = int(remaining)
+            if reset is not None:
+                b.reset = int(reset)
+            if limit is not None:
+                b.limit = int(limit)
+
+    def set_budget(self, token: str, remaining: int, reset: Optional[int], limit: Optional[int] = None):
+        with self._lock:
+            b = self._budgets[token]
+            b.remaining = remaining
+            b.reset = reset
+            b.limit = limit
+
+
+__all__ = ["TokenPool", "TokenBudget"]
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Ensure repo root on sys.path
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from impact.providers.github.fake_server import FakeGitHubData, FakeGitHubServer
+from impact.providers.github_live import GitHubLiveFetcher, LiveFetchConfig
+
+REPO = "acme/widgets"
+USER = "dev0"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the GitHub fetch pipeline against a local fake API server.")
+    parser.add_argument("--prs", type=int, default=50, help="Synthetic PRs to serve (default 50)")
+    parser.add_argument("--from-dump", help="Serve a recorded canonical dump instead of synthetic PRs")
+    parser.add_argument("--user", default=USER, help="Assessed user login (default: the synthetic data's user)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds of latency per request (default 0.05)")
+    parser.add_argument("--jitter", type=float, default=0.02, help="Extra random latency per request, in seconds (default 0.02)")
+    parser.add_argument("--rate-limit", type=int, default=5000, help="Requests per token per window (default 5000)")
+    parser.add_argument("--reset-after", type=float, default=3600.0, help="Rate-limit window in seconds (default 3600)")
+    parser.add_argument("--max-per-page", type=int, default=100, help="Largest page the server returns (default 100)")
+    parser.add_argument("--tokens", type=int, default=1, help="Number of tokens in the pool (default 1)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Fetcher concurrency ceiling (default 8)")
+    parser.add_argument("--async", dest="async_fetch", action="store_true", help="Use the asyncio fetch path")
+    parser.add_argument("--discovery", choices=["list", "search"], default="list", help="PR discovery mode")
+    parser.add_argument("--cache-dir", help="Response cache directory; rerun with the same one to measure 304 reuse")
+    parser.add_argument("--out", help="Dump directory (default: a temporary directory)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log fetch progress")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    data = FakeGitHubData.from_dump(Path(args.from_dump)) if args.from_dump else FakeGitHubData.synthetic(REPO, USER, prs=args.prs)
+    repos = sorted(data.bundles)
+
+    with tempfile.TemporaryDirectory() as tmp, FakeGitHubServer(
+        data,
+        latency=args.latency,
+        jitter=args.jitter,
+        rate_limit=args.rate_limit,
+        reset_after=args.reset_after,
+        max_per_page=args.max_per_page,
+    ) as server:
+        cfg = LiveFetchConfig(
+            user_login=args.user,
+            repos=repos,
+            start=datetime(2000, 1, 1, tzinfo=timezone.utc),
+            end=datetime.now(timezone.utc),
+            token="bench-token-0",
+            extra_tokens=[f"bench-token-{i}" for i in range(1, args.tokens)],
+            out_dir=Path(args.out or tmp),
+            async_fetch=args.async_fetch,
+            discovery=args.discovery,
+            max_concurrency=args.concurrency,
+            cache_dir=Path(args.cache_dir) if args.cache_dir else None,
+            base_url=server.url,
+        )
+        fetcher = GitHubLiveFetcher(cfg)
+        started = time.perf_counter()
+        fetcher.run()
+        elapsed = time.perf_counter() - started
+
+    fetched = server.requests["pull_request"]
+    api_requests = server.total_requests - server.requests["rate_limit"]
+    slept = fetcher.governor.slept_seconds + fetcher.tokens.slept_seconds
+    print(f"PRs fetched:        {fetched} of {len(data)} served")
+    print(f"Wall time:          {elapsed:.2f}s")
+    print(f"PRs/s:              {fetched / elapsed:.2f}")
+    print(f"Requests:           {api_requests} ({api_requests / max(fetched, 1):.1f}/PR)")
+    print(f"304 Not Modified:   {server.not_modified}")
+    print(f"403 rate limited:   {server.rate_limited}")
+    print(f"Time sleeping:      {slept:.2f}s (governor {fetcher.governor.slept_seconds:.2f}s, token pool {fetcher.tokens.slept_seconds:.2f}s)")
+    print(f"Final concurrency:  {fetcher.governor.concurrency}")
+    print("Requests by endpoint: " + ", ".join(f"{kind}={n}" for kind, n in sorted(server.requests.items())))
+
+
+if __name__ == "__main__":
+    main()
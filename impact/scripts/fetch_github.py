@@ -12,17 +12,61 @@ ROOT = Path(__file__).resolve().parents[2]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+from impact.metrics import required_resources
 from impact.providers.github_live import GitHubLiveFetcher, LiveFetchConfig
 
 
 def parse_args():
     parser = argparse.ArgumentParser(description="Fetch live GitHub data and emit canonical dump.")
-    parser.add_argument("--token", required=False, help="GitHub token (or set GITHUB_TOKEN)")
+    parser.add_argument("--token", required=False, help="GitHub token (or set GITHUB_TOKEN); comma-separate several to use a token pool")
     parser.add_argument("--user", required=True, help="Assessed user login")
     parser.add_argument("--repos", required=True, help="Comma-separated list of repos (owner/repo). Use @all for all provided.")
     parser.add_argument("--from", dest="since", help="ISO start date (default: 365 days ago)")
     parser.add_argument("--to", dest="until", help="ISO end date (default: now)")
     parser.add_argument("--out", required=True, help="Output folder for dump")
+    parser.add_argument("--async", dest="async_fetch", action="store_true", help="Fetch PR endpoints concurrently via the asyncio client")
+    parser.add_argument("--concurrency", type=int, default=8, help="Upper bound on in-flight requests; the rate governor adapts below it (default 8)")
+    parser.add_argument(
+        "--discovery",
+        choices=["list", "search"],
+        default="list",
+        help="How to find candidate PRs: list every PR per repo, or query the search API for PRs the user touched",
+    )
+    parser.add_argument("--graphql", action="store_true", help="Fetch PR bundles via batched GraphQL queries")
+    parser.add_argument("--graphql-batch-size", type=int, default=10, help="PRs per GraphQL query (default 10)")
+    parser.add_argument("--cache-dir", help="Directory for the persistent ETag/Last-Modified response cache")
+    parser.add_argument(
+        "--resources",
+        help="Comma-separated PR resources to fetch besides the PR itself (reviews, review_comments, issue_comments, "
+        "commits, files, timeline); default all",
+    )
+    parser.add_argument(
+        "--metrics",
+        nargs="*",
+        help="Metric slugs the dump is for; only the resources they read are fetched (overrides --resources)",
+    )
+    parser.add_argument(
+        "--compression",
+        choices=["none", "gzip", "zstd"],
+        default="none",
+        help="Compress the canonical JSONL files (zstd needs the 'zstandard' package)",
+    )
+    parser.add_argument(
+        "--store",
+        choices=["jsonl", "sqlite", "shared"],
+        default="jsonl",
+        help="Dump format: canonical JSONL files, one indexed SQLite database (dump.sqlite), "
+        "or references into --pr-store",
+    )
+    parser.add_argument(
+        "--pr-store",
+        help="Shared PR store directory: reuse bundles other dumps already fetched, and add new ones",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Extend the dump already in --out up to --to, fetching only PRs updated since its last run",
+    )
     return parser.parse_args()
 
 
@@ -34,8 +78,8 @@ def parse_date(val: str, default: datetime) -> datetime:
 
 def main():
     args = parse_args()
-    token = args.token or os.environ.get("GITHUB_TOKEN")
-    if not token:
+    tokens = [t.strip() for t in (args.token or os.environ.get("GITHUB_TOKEN") or "").split(",") if t.strip()]
+    if not tokens:
         raise SystemExit("GitHub token required via --token or GITHUB_TOKEN")
 
     now = datetime.now(timezone.utc)
@@ -45,14 +89,32 @@ def main():
 
     repos = [r.strip() for r in args.repos.split(",") if r.strip()]
 
+    resources = None
+    if args.metrics:
+        resources = sorted(required_resources(args.metrics))
+    elif args.resources:
+        resources = [r.strip() for r in args.resources.split(",") if r.strip()]
+
     out_dir = Path(args.out)
     cfg = LiveFetchConfig(
         user_login=args.user,
         repos=repos,
         start=start,
         end=end,
-        token=token,
+        token=tokens[0],
         out_dir=out_dir,
+        extra_tokens=tokens[1:],
+        async_fetch=args.async_fetch,
+        max_concurrency=args.concurrency,
+        cache_dir=Path(args.cache_dir) if args.cache_dir else None,
+        graphql=args.graphql,
+        discovery=args.discovery,
+        graphql_batch_size=args.graphql_batch_size,
+        incremental=args.incremental,
+        resources=resources,
+        compression=None if args.compression == "none" else args.compression,
+        store=args.store,
+        pr_store=Path(args.pr_store) if args.pr_store else None,
     )
     fetcher = GitHubLiveFetcher(cfg)
     bundle = fetcher.run()
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Ensure repo root on sys.path
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from impact.persistence.pr_store import GC_GRACE_SECONDS, SharedPRStore
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Delete shared PR store entries no dump references.")
+    parser.add_argument("store", help="Shared PR store directory")
+    parser.add_argument(
+        "--grace",
+        type=float,
+        default=GC_GRACE_SECONDS,
+        help=f"Keep unreferenced entries written or read within this many seconds (default {GC_GRACE_SECONDS:.0f})",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be deleted")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO)
+    freed, freed_bytes = SharedPRStore(Path(args.store)).gc(grace_seconds=args.grace, dry_run=args.dry_run)
+    verb = "Would free" if args.dry_run else "Freed"
+    print(f"{verb} {freed} entries ({freed_bytes / 1024 / 1024:.1f} MiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,7 +12,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..',
 
 from impact.ingestion.dump import DumpIngestion
 from impact.ledger.ledger import Ledger
-from impact.metrics import get_metrics
+from impact.metrics import get_metrics, required_resources
 from impact.domain.models import MetricContext
 from impact.celery_app import app as celery_app
 from celery.exceptions import TimeoutError as CeleryTimeout
@@ -94,10 +94,16 @@ def main():
     parser.add_argument('--existing-dump', help='Use an existing dump directory; skips live fetch even if fetch flags are provided')
     parser.add_argument('--metrics', nargs='*', help='Metric slugs to run (e.g., pr_merge_effectiveness review_leverage)')
     parser.add_argument('--out', help='Output path for the report (not implemented yet)')
+    parser.add_argument('--parse-workers', type=int, help='Parse large JSONL dumps with this many worker processes')
+    parser.add_argument('--streaming-parse', action='store_true', help='Parse in two passes so memory follows the kept PRs rather than the whole dump')
+    parser.add_argument('--compact-ledger', action='store_true', help='Hold reviews, comments, commits and timeline events as compact slots records in the ledger')
+    trust = parser.add_mutually_exclusive_group()
+    trust.add_argument('--trusted-dump', dest='trusted', action='store_true', default=None, help='Skip per-record validation (spot checks only) even if the manifest does not mark the dump trusted')
+    trust.add_argument('--validate-dump', dest='trusted', action='store_false', help='Fully validate every record even if the manifest marks the dump trusted')
     # Optional: trigger live fetch via Celery before running report
     parser.add_argument('--fetch-user', help='User login to fetch (assessed user)')
     parser.add_argument('--fetch-repos', help='Comma-separated repos to fetch (owner/repo)')
-    parser.add_argument('--fetch-token', help='GitHub token; defaults to GITHUB_TOKEN env')
+    parser.add_argument('--fetch-token', help='GitHub token; defaults to GITHUB_TOKEN env. Comma-separate several to use a token pool')
     parser.add_argument('--fetch-from', dest='fetch_from', help='ISO start date (default: 365 days ago)')
     parser.add_argument('--fetch-to', dest='fetch_to', help='ISO end date (default: now)')
     parser.add_argument('--broker', help='Celery broker URL override (default env CELERY_BROKER_URL)')
@@ -113,8 +119,8 @@ def main():
 
     # Optional: live fetch via Celery (required if fetch flags provided and not reusing)
     if args.fetch_repos and args.fetch_user and not args.existing_dump:
-        token = args.fetch_token or os.environ.get("GITHUB_TOKEN")
-        if not token:
+        tokens = [t.strip() for t in (args.fetch_token or os.environ.get("GITHUB_TOKEN") or "").split(",") if t.strip()]
+        if not tokens:
             raise SystemExit("fetch requested but no GitHub token provided (--fetch-token or GITHUB_TOKEN)")
         repos = [r.strip() for r in args.fetch_repos.split(",") if r.strip()]
         now = datetime.now(timezone.utc)
@@ -135,10 +141,13 @@ def main():
             kwargs={
                 "user_login": args.fetch_user,
                 "repos": repos,
-                "token": token,
+                "token": tokens[0],
+                "extra_tokens": tokens[1:],
                 "out_dir": str(dump_dir),
                 "start_iso": start_iso,
                 "end_iso": end_iso,
+                # Only download what the selected metrics read; without --metrics fetch everything.
+                "resources": sorted(required_resources(args.metrics)) if args.metrics else None,
             },
         )
         print(f"Queued fetch task {task.id}, waiting for completion...")
@@ -150,7 +159,7 @@ def main():
     elif args.existing_dump and (args.fetch_repos or args.fetch_user):
         print("Existing dump specified; ignoring fetch flags.")
 
-    ingestion = DumpIngestion(str(dump_dir))
+    ingestion = DumpIngestion(str(dump_dir), workers=args.parse_workers, trusted=args.trusted, streaming=args.streaming_parse)
     bundle = ingestion.ingest()
 
     # Read manifest for user and dates if metrics are requested
@@ -185,7 +194,7 @@ def main():
     if args.metrics:
 
         # Create ledger
-        ledger = Ledger(bundle)
+        ledger = Ledger(bundle, compact=args.compact_ledger)
 
         # Create context
         context = MetricContext(
@@ -17,7 +17,26 @@ def _parse_iso(dt: Optional[str], default: datetime) -> datetime:
 
 
 @shared_task(bind=True)
-def run_fetch(self, user_login: str, repos: List[str], token: str, out_dir: str, start_iso: Optional[str] = None, end_iso: Optional[str] = None):
+def run_fetch(
+    self,
+    user_login: str,
+    repos: List[str],
+    token: str,
+    out_dir: str,
+    start_iso: Optional[str] = None,
+    end_iso: Optional[str] = None,
+    async_fetch: bool = False,
+    max_concurrency: int = 8,
+    cache_dir: Optional[str] = None,
+    extra_tokens: Optional[List[str]] = None,
+    graphql: bool = False,
+    discovery: str = "list",
+    incremental: bool = False,
+    resources: Optional[List[str]] = None,
+    compression: Optional[str] = None,
+    store: str = "jsonl",
+    pr_store_dir: Optional[str] = None,
+):
     now = datetime.now(timezone.utc)
     start = _parse_iso(start_iso, now - timedelta(days=365))
     end = _parse_iso(end_iso, now)
@@ -28,6 +47,17 @@ def run_fetch(self, user_login: str, repos: List[str], token: str, out_dir: str,
         end=end,
         token=token,
         out_dir=Path(out_dir),
+        extra_tokens=extra_tokens or [],
+        async_fetch=async_fetch,
+        max_concurrency=max_concurrency,
+        cache_dir=Path(cache_dir) if cache_dir else None,
+        graphql=graphql,
+        discovery=discovery,
+        incremental=incremental,
+        resources=resources,
+        compression=compression,
+        store=store,
+        pr_store=Path(pr_store_dir) if pr_store_dir else None,
     )
     fetcher = GitHubLiveFetcher(cfg)
     bundle = fetcher.run()
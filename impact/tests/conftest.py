@@ -5,8 +5,11 @@ These factories help reduce duplication across test modules and provide
 consistent test data creation patterns.
 """
 from datetime import datetime, timezone, timedelta
+from pathlib import Path
 from typing import Optional
 
+import pytest
+
 from impact.domain.models import (
     User,
     Repository,
@@ -22,6 +25,8 @@ from impact.domain.models import (
 )
 from impact.ledger.ledger import Ledger
 from impact.domain.models import MetricContext
+from impact.persistence.filesystem import FileSystemDumpWriter
+from impact.providers.github.fake_server import FakeGitHubData
 
 
 # Default base datetime for tests
@@ -209,3 +214,41 @@ def make_context(
         start_date=start_date or DEFAULT_START,
         end_date=end_date or (DEFAULT_START + timedelta(days=10)),
     )
+
+
+def write_synthetic_dump(
+    path: Path,
+    prs: int = 40,
+    developers: int = 10,
+    user: str = "dev0",
+    start: str = "2025-01-01T00:00:00Z",
+    end: str = "2025-12-31T00:00:00Z",
+    streaming: bool = False,
+    compression: Optional[str] = None,
+) -> FileSystemDumpWriter:
+    """Write a dump of `prs` synthetic acme/widgets PR bundles for `user` into `path`."""
+    data = FakeGitHubData.synthetic("acme/widgets", user, prs=prs, developers=developers)
+    writer = FileSystemDumpWriter(path, compression=compression)
+    manifest = {"user": user, "from": start, "to": end}
+    if compression is not None:
+        manifest["compression"] = compression
+    writer.write_manifest(manifest)
+    bundles = [data.bundle("acme/widgets", n) for n in range(1, prs + 1)]
+    if streaming:
+        with writer:
+            for bundle in bundles:
+                writer.write_pr_bundle(bundle)
+    else:
+        for bundle in bundles:
+            writer.write_pr_bundle(bundle)
+    return writer
+
+
+@pytest.fixture
+def synthetic_dump(tmp_path):
+    """Factory fixture: synthetic_dump(prs=..., ...) writes a synthetic dump into tmp_path and returns its writer."""
+
+    def make(**kwargs) -> FileSystemDumpWriter:
+        return write_synthetic_dump(tmp_path, **kwargs)
+
+    return make
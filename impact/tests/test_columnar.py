@@ -0,0 +1,62 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from impact.adapters.github import GitHubAdapter
+from impact.domain.columnar import MISSING_INT64, ColumnarBundle
+from impact.domain.models import ReviewState
+from impact.metrics.utils import calculate_merge_time_hours
+from impact.persistence.codec import parse_timestamp
+
+
+@pytest.fixture
+def dump(synthetic_dump):
+    return str(synthetic_dump(developers=8).base_dir)
+
+
+def test_columnar_bundle_round_trips(dump):
+    bundle = GitHubAdapter().parse_dump(dump)
+    columnar = GitHubAdapter().parse_dump_for_users(dump, ["dev0"]).columnar("dev0")
+    assert columnar.reviews["submitted_at"].dtype == np.int64
+    assert columnar.reviews["pull_request_number"].dtype == np.int32
+    assert columnar.reviews.categories["state"] == tuple(s.value for s in ReviewState)
+
+    restored = columnar.to_bundle()
+    assert restored.model_dump() == bundle.model_dump()
+    assert ColumnarBundle.from_bundle(bundle).to_bundle().model_dump() == bundle.model_dump()
+
+
+def test_columnar_queries_match_object_loops(dump):
+    bundle = GitHubAdapter().parse_dump(dump)
+    columnar = ColumnarBundle.from_bundle(bundle)
+
+    expected = [calculate_merge_time_hours(pr) for pr in bundle.pull_requests]
+    got = columnar.cycle_time_hours().tolist()
+    assert [None if math.isnan(h) else pytest.approx(h) for h in got] == expected
+
+    first = {}
+    for r in bundle.reviews:
+        pr = next(p for p in bundle.pull_requests if p.number == r.pull_request_number)
+        if r.user.id != pr.user.id:
+            first[pr.number] = min(first.get(pr.number, r.submitted_at), r.submitted_at)
+    latency = columnar.first_review_latency_hours()
+    for row, pr in enumerate(bundle.pull_requests):
+        if pr.number in first:
+            assert latency[row] == pytest.approx((first[pr.number] - pr.created_at).total_seconds() / 3600)
+        else:
+            assert math.isnan(latency[row])
+
+    start, end = parse_timestamp("2025-03-01T00:00:00Z"), parse_timestamp("2025-06-01T00:00:00Z")
+    mask = columnar.window_mask(columnar.reviews["submitted_at"], start, end)
+    assert int(mask.sum()) == sum(start <= r.submitted_at <= end for r in bundle.reviews)
+    assert MISSING_INT64 not in columnar.pull_requests["created_at"]
+    assert columnar.user_row("dev0") >= 0 and columnar.user_row("nobody") == -1
+
+    # Reviews whose PRs the bundle lacks, down to no PRs at all, are ignored.
+    orphaned = ColumnarBundle.from_records(bundle.users, bundle.repositories, [], [], bundle.reviews, [], [], [])
+    assert orphaned.first_review_latency_hours().shape == (0,)
+
+    logins = [columnar.pool[code] for code in columnar.users["login"].tolist()]
+    assert [columnar.user_row(login) for login in logins] == list(range(len(logins)))
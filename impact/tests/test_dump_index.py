@@ -0,0 +1,196 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from impact.adapters import github as github_adapter
+from impact.adapters.github import GitHubAdapter
+from impact.domain.models import UserType
+from impact.exceptions import DataValidationError
+from impact.persistence.codec import parse_timestamp
+from impact.persistence.filesystem import CANONICAL_FILES, FileSystemDumpWriter
+from impact.persistence.index import index_path, load_index, read_spans
+from impact.providers.github.fake_server import FakeGitHubData
+
+
+def _summary(bundle):
+    return (
+        sorted(pr.number for pr in bundle.pull_requests),
+        [(r.id, r.pull_request_number) for r in bundle.reviews],
+        [(c.id, c.pull_request_number) for c in bundle.comments],
+        [(c.sha, c.pull_request_number) for c in bundle.commits],
+        [(f.filename, f.pull_request_number) for f in bundle.files],
+        [(t.id, t.pull_request_number) for t in bundle.timeline],
+    )
+
+
+def test_indexed_parse_matches_full_parse_and_reads_only_kept_prs(tmp_path, synthetic_dump, monkeypatch):
+    writer = synthetic_dump(prs=60, developers=12)
+    for fname in CANONICAL_FILES.values():
+        assert load_index(writer.canonical_dir / fname) is not None
+
+    read = []
+    real_read_spans = github_adapter.read_spans
+
+    def counting_read_spans(path, spans):
+        for line in real_read_spans(path, spans):
+            read.append(json.loads(line))
+            yield line
+
+    monkeypatch.setattr(github_adapter, "read_spans", counting_read_spans)
+    indexed = GitHubAdapter().parse_dump(str(tmp_path))
+    kept = {pr.number for pr in indexed.pull_requests}
+    assert 0 < len(kept) < 60
+    assert {r["number"] for r in read if "head" in r} == kept
+
+    for fname in CANONICAL_FILES.values():
+        index_path(writer.canonical_dir / fname).unlink()
+    full = GitHubAdapter().parse_dump(str(tmp_path))
+    assert _summary(indexed) == _summary(full)
+
+
+def test_streamed_appends_and_dropped_prs_keep_indexes_exact(tmp_path, synthetic_dump):
+    synthetic_dump(prs=20, developers=12, streaming=True)
+    writer = FileSystemDumpWriter(tmp_path)
+    writer.drop_prs({("acme/widgets", 3), ("acme/widgets", 7)})
+    with writer:
+        writer.write_pr_bundle(FakeGitHubData.synthetic("acme/widgets", "dev0", prs=3, seed=1).bundle("acme/widgets", 3))
+    for fname in CANONICAL_FILES.values():
+        blocks = load_index(writer.canonical_dir / fname)
+        assert blocks is not None
+        assert 7 not in {b["pr"] for b in blocks}
+
+
+def _redacting_decoder(line):
+    item = json.loads(line)
+    if "body" in item:
+        item["body"] = "[redacted]"
+    return item
+
+
+def test_parallel_parse_matches_sequential_parse(tmp_path, synthetic_dump):
+    writer = synthetic_dump(prs=30, developers=12)
+    for fname in CANONICAL_FILES.values():
+        index_path(writer.canonical_dir / fname).unlink()
+
+    sequential = GitHubAdapter().parse_dump(str(tmp_path))
+    parallel = GitHubAdapter(workers=2, chunk_bytes=4096).parse_dump(str(tmp_path))
+    assert _summary(parallel) == _summary(sequential)
+    assert [u.login for u in parallel.users] == [u.login for u in sequential.users]
+
+    # The workers decode with the adapter's decoder, not the default one.
+    redacted = GitHubAdapter(workers=2, chunk_bytes=4096, decoder=_redacting_decoder).parse_dump(str(tmp_path))
+    assert _summary(redacted) == _summary(sequential)
+    assert {r.body for r in redacted.reviews} == {"[redacted]"}
+
+
+def test_fast_decoder_and_cached_timestamps_match_stdlib_parse(tmp_path, synthetic_dump):
+    synthetic_dump(prs=20, developers=12)
+    parse_timestamp.cache_clear()
+    fast = GitHubAdapter().parse_dump(str(tmp_path))
+    stdlib = GitHubAdapter(decoder=json.loads).parse_dump(str(tmp_path))
+    assert _summary(fast) == _summary(stdlib)
+    assert [pr.created_at for pr in fast.pull_requests] == [pr.created_at for pr in stdlib.pull_requests]
+    assert parse_timestamp("2025-03-01T12:00:00Z") == datetime(2025, 3, 1, 12, tzinfo=timezone.utc)
+    # Every PR's created_at is parsed for the window check and again for its model.
+    assert parse_timestamp.cache_info().hits >= 2 * len(fast.pull_requests)
+
+
+def test_trusted_parse_builds_same_records_and_spot_checks(tmp_path, synthetic_dump):
+    writer = synthetic_dump(prs=20, developers=12)
+    validated = GitHubAdapter(trusted=False).parse_dump(str(tmp_path))
+    trusted = GitHubAdapter(trusted=True).parse_dump(str(tmp_path))
+    assert trusted.model_dump() == validated.model_dump()
+    assert type(trusted.users[0].type) is UserType
+
+    reviews = writer.canonical_dir / "reviews.jsonl"
+    records = [json.loads(line) for line in reviews.read_text().splitlines()]
+    records[0]["id"] = "not-a-number"
+    reviews.write_text("".join(json.dumps(r) + "\n" for r in records))
+    index_path(reviews).unlink()
+    with pytest.raises(DataValidationError, match="ReviewRecord"):
+        GitHubAdapter(trusted=True).parse_dump(str(tmp_path))
+
+
+@pytest.mark.parametrize("compression", [None, "gzip"])
+def test_streaming_parse_only_hands_kept_prs_to_the_builder(tmp_path, synthetic_dump, monkeypatch, compression):
+    writer = synthetic_dump(developers=12, compression=compression)
+    for fname in CANONICAL_FILES.values():
+        index_path(writer.canonical_dir / fname).unlink(missing_ok=True)
+    full = GitHubAdapter().parse_dump(str(tmp_path))
+
+    seen = set()
+    real_build = GitHubAdapter.build_base
+
+    def recording_build(self, start_dt, end_dt, records, trusted=False, logins=None):
+        def recorded(fname):
+            for item in records(fname):
+                if fname == "pull_requests.jsonl":
+                    seen.add(item["number"])
+                yield item
+
+        return real_build(self, start_dt, end_dt, recorded, trusted, logins)
+
+    monkeypatch.setattr(GitHubAdapter, "build_base", recording_build)
+    streamed = GitHubAdapter(streaming=True).parse_dump(str(tmp_path))
+    assert _summary(streamed) == _summary(full)
+    assert seen == {pr.number for pr in full.pull_requests}
+
+    # A custom decoder sees str lines on every path, plain or compressed.
+    line_types = set()
+
+    def decoder(line):
+        line_types.add(type(line))
+        return json.loads(line)
+
+    assert _summary(GitHubAdapter(streaming=True, decoder=decoder).parse_dump(str(tmp_path))) == _summary(full)
+    assert line_types == {str}
+
+
+def test_multi_user_parse_views_match_single_user_parses(tmp_path, synthetic_dump, monkeypatch):
+    writer = synthetic_dump(prs=30, developers=12)
+    logins = ["dev0", "dev1", "dev2"]
+    expected = {}
+    for login in logins:
+        writer.write_manifest({"user": login, "from": "2025-01-01T00:00:00Z", "to": "2025-12-31T00:00:00Z"})
+        expected[login] = GitHubAdapter().parse_dump(str(tmp_path))
+
+    calls = []
+    real_build = GitHubAdapter.build_base
+    monkeypatch.setattr(
+        GitHubAdapter, "build_base", lambda self, *args, **kwargs: calls.append(1) or real_build(self, *args, **kwargs)
+    )
+    base = GitHubAdapter().parse_dump_for_users(str(tmp_path), logins)
+    everyone = GitHubAdapter().parse_dump_for_users(str(tmp_path))
+    assert len(calls) == 2
+    assert set(logins) <= set(everyone.logins())
+    for login in logins:
+        view = base.view(login)
+        assert base.kept_prs(login) == {pr.number for pr in view.pull_requests}
+        assert view.model_dump() == expected[login].model_dump()
+        assert everyone.view(login).model_dump() == expected[login].model_dump()
+
+
+def test_bundle_users_are_the_referenced_users_on_every_parse_path(tmp_path, synthetic_dump):
+    writer = synthetic_dump(prs=30, developers=12)
+    indexed = GitHubAdapter().parse_dump(str(tmp_path))
+    for fname in CANONICAL_FILES.values():
+        index_path(writer.canonical_dir / fname).unlink()
+    full = GitHubAdapter().parse_dump(str(tmp_path))
+    streamed = GitHubAdapter(streaming=True).parse_dump(str(tmp_path))
+
+    referenced = {r.user.login for r in full.reviews} | {c.user.login for c in full.comments}
+    referenced |= {c.author.login for c in full.commits} | {pr.user.login for pr in full.pull_requests}
+    assert referenced <= {u.login for u in full.users}
+    assert [u.login for u in indexed.users] == [u.login for u in full.users] == [u.login for u in streamed.users]
+
+
+def test_read_spans_splits_on_newlines_only(tmp_path):
+    # Writers that do not escape non-ASCII (orjson, other tools) leave these raw in strings.
+    lines = [json.dumps({"body": body}, ensure_ascii=False) + "\n" for body in ("a\u2028b", "c\x85d\u2029e", "f")]
+    path = tmp_path / "reviews.jsonl"
+    path.write_bytes("".join(lines).encode("utf-8"))
+    sizes = [len(line.encode("utf-8")) for line in lines]
+
+    assert list(read_spans(path, [(0, sizes[0] + sizes[1]), (sizes[0] + sizes[1], sizes[2])])) == lines
+    assert [json.loads(line)["body"] for line in read_spans(path, [(sizes[0], sizes[1])])] == ["c\x85d\u2029e"]
@@ -0,0 +1,174 @@
+import json
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+
+from impact.metrics import get_metrics, required_resources
+from impact.adapters.github_shared import GitHubSharedAdapter
+from impact.persistence.pr_store import SharedPRStore, SharedStoreDumpWriter
+from impact.providers.github.fake_server import FakeGitHubData, FakeGitHubServer
+from impact.providers.github.fetcher import PR_BUNDLE_ENDPOINTS
+from impact.providers.github_live import GitHubLiveFetcher, LiveFetchConfig
+
+
+def _config(server, out_dir, cache_dir):
+    return LiveFetchConfig(
+        user_login="dev0",
+        repos=["acme/widgets"],
+        start=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        end=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        token="t",
+        out_dir=out_dir,
+        cache_dir=cache_dir,
+        base_url=server.url,
+    )
+
+
+def test_live_fetch_against_fake_server_paginates_and_revalidates(tmp_path):
+    data = FakeGitHubData.synthetic("acme/widgets", "dev0", prs=6, developers=2, commits=5, files=3)
+    with FakeGitHubServer(data, max_per_page=2) as server:
+        first = GitHubLiveFetcher(_config(server, tmp_path / "a", tmp_path / "cache")).run()
+        fetched = server.requests["pull_request"]
+        assert fetched > 0
+        # 5 commits at 2 per page -> 3 pages per PR, served via Link rel="next"/"last".
+        assert server.requests["commits"] == 3 * fetched
+        assert server.not_modified == 0
+
+        second = GitHubLiveFetcher(_config(server, tmp_path / "b", tmp_path / "cache")).run()
+        assert server.not_modified == server.total_requests // 2 - 1  # everything but /rate_limit
+    assert len(first.commits) == len(second.commits) == 5 * len(first.pull_requests)
+    assert sorted(pr.number for pr in first.pull_requests) == sorted(pr.number for pr in second.pull_requests)
+
+
+def test_fake_server_enforces_rate_limit_per_token():
+    data = FakeGitHubData.synthetic(prs=1)
+    with FakeGitHubServer(data, rate_limit=2) as server:
+        url = f"{server.url}/repos/acme/widgets/pulls/1"
+        statuses = [httpx.get(url, headers={"Authorization": "Bearer a"}) for _ in range(3)]
+        other = httpx.get(url, headers={"Authorization": "Bearer b"})
+    assert [r.status_code for r in statuses] == [200, 200, 403]
+    assert statuses[1].headers["X-RateLimit-Remaining"] == "0"
+    assert "rate limit" in statuses[2].text.lower()
+    assert other.status_code == 200
+
+
+def test_fetch_plan_requests_only_resources_metrics_require(tmp_path):
+    assert required_resources(["pr_throughput", "cycle_time"]) == set()
+    for metric in get_metrics().values():
+        assert metric.requires <= set(PR_BUNDLE_ENDPOINTS)
+
+    data = FakeGitHubData.synthetic("acme/widgets", "dev0", prs=4, developers=1)
+    with FakeGitHubServer(data) as server:
+        cfg = _config(server, tmp_path / "dump", None)
+        cfg.resources = sorted(required_resources(["pr_throughput"]))
+        screened = GitHubLiveFetcher(cfg).run()
+        assert set(server.requests) == {"rate_limit", "pulls", "pull_request"}
+        assert len(screened.pull_requests) == 4 and not screened.reviews
+
+        # Asking for more than was fetched refetches the PRs instead of trusting the checkpoint.
+        cfg.resources = sorted(required_resources(["time_to_first_review"]))
+        reviewed = GitHubLiveFetcher(cfg).run()
+        assert server.requests["reviews"] == 4 and "commits" not in server.requests
+    assert len(reviewed.reviews) == 4 * 3
+
+
+@pytest.mark.parametrize("compression", ["gzip", "zstd"])
+def test_compressed_dump_round_trips_through_adapter(tmp_path, compression):
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+    data = FakeGitHubData.synthetic("acme/widgets", "dev0", prs=5, developers=2)
+    with FakeGitHubServer(data) as server:
+        plain = GitHubLiveFetcher(_config(server, tmp_path / "plain", None)).run()
+        cfg = _config(server, tmp_path / "packed", None)
+        cfg.compression = compression
+        packed = GitHubLiveFetcher(cfg).run()
+
+    suffix = {"gzip": ".gz", "zstd": ".zst"}[compression]
+    manifest = json.loads((tmp_path / "packed" / "dump_manifest.json").read_text())
+    assert manifest["compression"] == compression
+    plain_file = tmp_path / "plain" / "canonical" / "commits.jsonl"
+    packed_file = tmp_path / "packed" / "canonical" / f"commits.jsonl{suffix}"
+    assert packed_file.stat().st_size < plain_file.stat().st_size
+    assert sorted(c.sha for c in packed.commits) == sorted(c.sha for c in plain.commits)
+    assert len(packed.comments) == len(plain.comments) and len(packed.reviews) == len(plain.reviews)
+
+
+def test_candidates_share_pr_store_and_gc_keeps_referenced_bundles(tmp_path):
+    data = FakeGitHubData.synthetic("acme/widgets", "dev0", prs=6, developers=2)
+    store = SharedPRStore(tmp_path / "store")
+    with FakeGitHubServer(data) as server:
+        bundles = []
+        for candidate in ("a", "b"):
+            cfg = _config(server, tmp_path / candidate, None)
+            cfg.store, cfg.pr_store = "shared", tmp_path / "store"
+            bundles.append(GitHubLiveFetcher(cfg).run())
+        fetched = server.requests["pull_request"]
+        plain = GitHubLiveFetcher(_config(server, tmp_path / "plain", None)).run()
+
+    # The second dump only references what the first one fetched.
+    assert fetched == len(list((tmp_path / "store" / "objects").glob("*/*.json"))) == len(bundles[0].pull_requests)
+    assert not (tmp_path / "b" / "canonical").exists()
+    for bundle in bundles:
+        assert sorted(c.sha for c in bundle.commits) == sorted(c.sha for c in plain.commits)
+        assert len(bundle.reviews) == len(plain.reviews) and len(bundle.timeline) == len(plain.timeline)
+
+    assert store.gc(grace_seconds=0) == (0, 0)
+    shutil.rmtree(tmp_path / "a")
+    assert store.gc(grace_seconds=0) == (0, 0)
+    shutil.rmtree(tmp_path / "b")
+    assert store.gc(grace_seconds=0)[0] == fetched
+    assert not list(store.roots_dir.iterdir())
+
+
+def test_pr_store_merges_bundles_fetched_with_different_resources(tmp_path):
+    store = SharedPRStore(tmp_path / "store")
+    bundle = FakeGitHubData.synthetic("acme/widgets", "dev0", prs=3).bundle("acme/widgets", 1)
+    updated_at = bundle["pull_request"]["updated_at"]
+    reviews = {"pull_request": bundle["pull_request"], "reviews": bundle["reviews"]}
+    commits = {"pull_request": bundle["pull_request"], "commits": bundle["commits"]}
+
+    key = store.put("acme/widgets", 1, updated_at, reviews, ["reviews"])
+    assert store.put("acme/widgets", 1, updated_at, commits, ["commits"]) == key
+
+    assert store.load(key)["resources"] == ["commits", "reviews"]
+    assert store.get("acme/widgets", 1, updated_at, ["reviews"]) == reviews
+    assert store.get("acme/widgets", 1, updated_at, ["commits"]) == commits
+    assert store.get("acme/widgets", 1, updated_at, ["reviews", "commits"]) == {**reviews, **commits}
+    assert store.get("acme/widgets", 1, updated_at, ["files"]) is None
+
+
+def _put_resource(directory, bundle, resource):
+    return SharedPRStore(directory).put("acme/widgets", 1, bundle["pull_request"]["updated_at"], bundle, [resource])
+
+
+def test_pr_store_merges_puts_from_concurrent_processes(tmp_path):
+    bundle = FakeGitHubData.synthetic("acme/widgets", "dev0", prs=3).bundle("acme/widgets", 1)
+    resources = [k for k in bundle if k != "pull_request"]
+    with ProcessPoolExecutor(max_workers=len(resources)) as pool:
+        keys = set(pool.map(
+            _put_resource,
+            [tmp_path / "store"] * len(resources),
+            [{"pull_request": bundle["pull_request"], r: bundle[r]} for r in resources],
+            resources,
+        ))
+
+    (key,) = keys
+    assert SharedPRStore(tmp_path / "store").load(key)["resources"] == sorted(resources)
+
+
+def test_parsing_a_shared_store_dump_does_not_register_it(tmp_path):
+    data = FakeGitHubData.synthetic("acme/widgets", "dev0", prs=3)
+    store = SharedPRStore(tmp_path / "store")
+    with SharedStoreDumpWriter(tmp_path / "dump", store) as writer:
+        writer.write_manifest({"user": "dev0", "from": "2025-01-01T00:00:00Z", "to": "2026-01-01T00:00:00Z", "pr_store": str(tmp_path / "store")})
+        for number in (1, 2, 3):
+            writer.write_pr_bundle(data.bundle("acme/widgets", number))
+    shutil.copytree(tmp_path / "dump", tmp_path / "copy")
+
+    parsed = GitHubSharedAdapter().parse_dump(str(tmp_path / "copy"))
+
+    assert parsed.pull_requests
+    assert [marker.read_text() for marker in store.roots_dir.iterdir()] == [str((tmp_path / "dump").resolve())]
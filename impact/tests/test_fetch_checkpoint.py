@@ -0,0 +1,157 @@
+import json
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import httpx
+
+from impact.persistence.checkpoint import FetchJournal
+from impact.persistence.filesystem import FileSystemDumpWriter
+from impact.providers import github_live
+from impact.providers.github.client import GitHubClient
+from impact.providers.github_live import GitHubLiveFetcher, LiveFetchConfig
+
+REPO = "org/widgets"
+ALICE = {"login": "alice", "id": 1, "type": "User"}
+ORG = {"login": "org", "id": 9, "type": "Organization"}
+
+
+def _pr(number, updated_at):
+    branch = {"label": "org:main", "ref": "main", "sha": "abc", "user": ORG}
+    return {
+        "id": 100 + number,
+        "number": number,
+        "title": f"PR {number}",
+        "state": "closed",
+        "user": ALICE,
+        "created_at": "2026-01-02T00:00:00Z",
+        "updated_at": updated_at,
+        "base": {**branch, "repo": {"id": 77, "name": "widgets", "full_name": REPO, "owner": ORG}},
+        "head": branch,
+    }
+
+
+def _api(prs, requests):
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/rate_limit":
+            return httpx.Response(200, json={"resources": {"core": {"remaining": 5000, "reset": 0, "limit": 5000}}})
+        if path == f"/repos/{REPO}/pulls":
+            return httpx.Response(200, json=sorted(prs.values(), key=lambda p: p["updated_at"], reverse=True))
+        number = int(path.split("/")[5])
+        requests[number] += 1
+        if path == f"/repos/{REPO}/pulls/{number}":
+            return httpx.Response(200, json=prs[number])
+        if path.endswith("/commits"):
+            return httpx.Response(200, json=[{"sha": f"c{number}", "commit": {"author": {"date": "2026-01-02T00:00:00Z"}}}])
+        return httpx.Response(200, json=[])
+
+    return handler
+
+
+def _fetcher(tmp_path, monkeypatch, prs, requests, end, incremental=False):
+    transport = httpx.MockTransport(_api(prs, requests))
+    monkeypatch.setattr(github_live, "GitHubClient", lambda *a, **kw: GitHubClient(*a, transport=transport, **kw))
+    cfg = LiveFetchConfig(
+        user_login="alice",
+        repos=[REPO],
+        start=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        end=end,
+        token="t",
+        out_dir=tmp_path / "dump",
+        incremental=incremental,
+    )
+    return GitHubLiveFetcher(cfg)
+
+
+def _lines(tmp_path, name, root=None):
+    root = root or tmp_path / "dump"
+    return [json.loads(line) for line in (root / "canonical" / name).read_text().splitlines()]
+
+
+def test_rerun_skips_finished_prs_and_refetches_updated_or_partial(tmp_path, monkeypatch):
+    end = datetime(2026, 2, 1, tzinfo=timezone.utc)
+    prs = {1: _pr(1, "2026-01-05T00:00:00Z"), 2: _pr(2, "2026-01-06T00:00:00Z")}
+    requests = Counter()
+    _fetcher(tmp_path, monkeypatch, prs, requests, end).run()
+    assert requests == {1: 7, 2: 7}
+
+    # A crash left PR 3's pull_request line behind without a journal entry, and PR 2 changed.
+    prs[3] = _pr(3, "2026-01-07T00:00:00Z")
+    with (tmp_path / "dump" / "canonical" / "pull_requests.jsonl").open("a") as f:
+        f.write(json.dumps(prs[3]) + "\n")
+    prs[2] = _pr(2, "2026-01-08T00:00:00Z")
+    requests.clear()
+    bundle = _fetcher(tmp_path, monkeypatch, prs, requests, end).run()
+
+    assert requests == {2: 7, 3: 7}
+    assert sorted(p["number"] for p in _lines(tmp_path, "pull_requests.jsonl")) == [1, 2, 3]
+    assert sorted(c["pull_request_number"] for c in _lines(tmp_path, "commits.jsonl")) == [1, 2, 3]
+    assert sorted(pr.number for pr in bundle.pull_requests) == [1, 2, 3]
+    assert FetchJournal(tmp_path / "dump").is_current(REPO, 2, "2026-01-08T00:00:00Z")
+
+
+def test_incremental_run_extends_window_and_fetches_only_recent_updates(tmp_path, monkeypatch):
+    prs = {1: _pr(1, "2026-01-05T00:00:00Z")}
+    requests = Counter()
+    _fetcher(tmp_path, monkeypatch, prs, requests, datetime(2026, 1, 10, tzinfo=timezone.utc)).run()
+
+    prs[2] = _pr(2, "2026-01-15T00:00:00Z")
+    requests.clear()
+    new_end = datetime(2026, 1, 20, tzinfo=timezone.utc)
+    bundle = _fetcher(tmp_path, monkeypatch, prs, requests, new_end, incremental=True).run()
+
+    assert requests == {2: 7}
+    manifest = json.loads((tmp_path / "dump" / "dump_manifest.json").read_text())
+    assert (manifest["from"], manifest["to"]) == ("2026-01-01T00:00:00Z", "2026-01-20T00:00:00Z")
+    assert sorted(pr.number for pr in bundle.pull_requests) == [1, 2]
+
+
+def test_streaming_writer_accepts_concurrent_producers_and_finalizes_atomically(tmp_path):
+    writer = FileSystemDumpWriter(tmp_path, batch_size=7)
+    written = []
+    bundles = [
+        {"pull_request": _pr(n, "2026-01-05T00:00:00Z"), "commits": [{"sha": f"c{n}-{i}"} for i in range(3)]}
+        for n in range(40)
+    ]
+    with writer:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda b: writer.write_pr_bundle(b, on_written=lambda: written.append(b)), bundles))
+        # Until finalize() the dump's files stay out of place.
+        assert not (tmp_path / "canonical" / "pull_requests.jsonl").exists()
+
+    assert len(written) == 40
+    commits = _lines(tmp_path, "commits.jsonl", root=tmp_path)
+    assert sorted(c["sha"] for c in commits) == sorted(f"c{n}-{i}" for n in range(40) for i in range(3))
+    assert writer.pr_numbers() == set(range(40))
+    assert not list((tmp_path / "canonical").glob("*.partial"))
+
+
+def test_writer_adopts_partial_files_left_by_a_crash(tmp_path):
+    canonical = tmp_path / "canonical"
+    canonical.mkdir()
+    line = json.dumps(_pr(1, "2026-01-05T00:00:00Z"))
+    (canonical / "pull_requests.jsonl.partial").write_text(line + "\n" + line[:20])
+
+    writer = FileSystemDumpWriter(tmp_path)
+    assert writer.pr_numbers() == {1}
+    assert (canonical / "pull_requests.jsonl").read_text() == line + "\n"
+
+
+def test_dropping_and_forgetting_a_pr_leaves_the_same_number_in_other_repos(tmp_path):
+    other = "org/gadgets"
+    other_pr = _pr(1, "2026-01-05T00:00:00Z")
+    other_pr["base"] = {**other_pr["base"], "repo": {"id": 78, "name": "gadgets", "full_name": other, "owner": ORG}}
+    writer = FileSystemDumpWriter(tmp_path)
+    journal = FetchJournal(tmp_path)
+    for pr in (_pr(1, "2026-01-05T00:00:00Z"), other_pr):
+        repo = pr["base"]["repo"]["full_name"]
+        writer.write_pr_bundle({"pull_request": pr, "commits": [{"sha": f"{repo}-c"}]})
+        journal.record(repo, 1, pr["updated_at"])
+
+    writer.drop_prs({(REPO, 1)})
+    journal.forget({(REPO, 1)})
+
+    assert writer.pr_keys() == {(other, 1)}
+    assert [c["sha"] for c in _lines(tmp_path, "commits.jsonl", root=tmp_path)] == [f"{other}-c"]
+    assert FetchJournal(tmp_path).keys() == [(other, 1)]
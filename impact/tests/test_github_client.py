@@ -0,0 +1,321 @@
+import asyncio
+
+import httpx
+
+from impact.providers.github.async_client import AsyncGitHubClient
+from impact.providers.github.async_fetcher import AsyncGitHubFetcher
+from impact.providers.github.fetcher import PR_BUNDLE_ENDPOINTS
+
+
+def _bundle_handler(state: dict):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        await asyncio.sleep(0.01)
+        state["in_flight"] -= 1
+        path = request.url.path
+        if path.endswith("/pulls/7"):
+            return httpx.Response(200, json={"number": 7})
+        if path.endswith("/commits") and request.url.params.get("page") != "2":
+            link = f'<{request.url.copy_with(params={"page": "2"})}>; rel="next"'
+            return httpx.Response(200, json=[{"sha": "a"}], headers={"Link": link})
+        if path.endswith("/commits"):
+            return httpx.Response(200, json=[{"sha": "b"}])
+        return httpx.Response(200, json=[])
+
+    return handler
+
+
+def test_async_fetcher_fans_out_endpoints_under_cap():
+    state = {"in_flight": 0, "peak": 0}
+
+    async def run():
+        async with AsyncGitHubClient(
+            "t", base_url="https://gh.test", max_concurrency=3, transport=httpx.MockTransport(_bundle_handler(state))
+        ) as client:
+            fetcher = AsyncGitHubFetcher(client)
+            results = [r async for r in fetcher.fetch_pr_bundles([("o/r", 7), ("o/r", 7)])]
+        return results
+
+    results = asyncio.run(run())
+
+    assert len(results) == 2
+    for repo, number, bundle in results:
+        assert (repo, number) == ("o/r", 7)
+        assert set(bundle) == set(PR_BUNDLE_ENDPOINTS)
+        assert bundle["pull_request"] == {"number": 7}
+        assert [c["sha"] for c in bundle["commits"]] == ["a", "b"]
+    # Requests overlapped, but never beyond the configured cap.
+    assert 1 < state["peak"] <= 3
+
+
+def test_async_fetcher_keeps_at_most_the_cap_of_prs_in_flight():
+    state = {"in_flight": 0, "peak": 0}
+    pulled = []
+
+    def backlog():
+        for n in range(20):
+            pulled.append(n)
+            yield "o/r", 7
+
+    async def run():
+        async with AsyncGitHubClient(
+            "t", base_url="https://gh.test", max_concurrency=2, transport=httpx.MockTransport(_bundle_handler(state))
+        ) as client:
+            fetcher = AsyncGitHubFetcher(client)
+            seen = 0
+            async for _ in fetcher.fetch_pr_bundles(backlog()):
+                seen += 1
+                # The backlog is pulled only as slots free up.
+                assert len(pulled) <= seen + 2
+            return seen
+
+    assert asyncio.run(run()) == 20
+
+
+def test_conditional_cache_serves_304_and_persists(tmp_path):
+    from impact.providers.github.cache import ResponseCache
+    from impact.providers.github.client import GitHubClient
+
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json=[{"id": 1}], headers={"ETag": '"v1"'})
+
+    for _ in range(2):
+        client = GitHubClient(
+            "t", base_url="https://gh.test", transport=httpx.MockTransport(handler), cache=ResponseCache(tmp_path)
+        )
+        assert list(client.paginate("/repos/o/r/pulls/1/reviews", params={"per_page": 100})) == [{"id": 1}]
+        client.close()
+
+    assert seen == [None, '"v1"']
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    from impact.providers.github.cache import ResponseCache
+
+    def resp(body: str) -> httpx.Response:
+        return httpx.Response(200, text=body, headers={"ETag": '"x"'})
+
+    cache = ResponseCache(tmp_path, max_bytes=8_000)
+    cache.store("https://gh.test/a", None, resp("a" * 3000))
+    cache.store("https://gh.test/b", None, resp("b" * 3000))
+    assert cache.lookup("https://gh.test/a") is not None  # touch a, b becomes LRU
+    cache.store("https://gh.test/c", None, resp("c" * 3000))
+
+    assert cache.total_bytes <= 8_000
+    assert cache.lookup("https://gh.test/b") is None
+    assert cache.lookup("https://gh.test/a").body == b"a" * 3000
+    assert cache.lookup("https://gh.test/c") is not None
+
+
+def test_token_pool_routes_to_largest_budget_and_waits_only_when_all_exhausted():
+    import time
+
+    from impact.providers.github.tokens import TokenPool
+
+    pool = TokenPool(["a", "b"])
+    reset = int(time.time()) + 60
+    pool.update("a", {"X-RateLimit-Remaining": "10", "X-RateLimit-Reset": str(reset)})
+    pool.update("b", {"X-RateLimit-Remaining": "12", "X-RateLimit-Reset": str(reset)})
+
+    picks = [pool.next_token()[0] for _ in range(4)]
+    assert picks == ["b", "b", "a", "b"]  # reservation decrements the chosen budget
+
+    pool.update("a", {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(reset)})
+    assert pool.next_token()[0] == "b"
+    pool.update("b", {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(reset - 30)})
+    token, wait = pool.next_token()
+    assert token is None
+    assert 0 < wait <= 32
+
+
+def test_client_spreads_requests_over_token_pool():
+    from impact.providers.github.client import GitHubClient
+    from impact.providers.github.tokens import TokenPool
+
+    budgets = {"Bearer a": 3, "Bearer b": 5}
+    used = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        auth = request.headers["Authorization"]
+        used.append(auth)
+        budgets[auth] -= 1
+        return httpx.Response(200, json={}, headers={"X-RateLimit-Remaining": str(budgets[auth]), "X-RateLimit-Reset": "9999999999"})
+
+    client = GitHubClient(TokenPool(["a", "b"]), base_url="https://gh.test", transport=httpx.MockTransport(handler))
+    for _ in range(6):
+        client.get("/x")
+    client.close()
+
+    assert set(used) == {"Bearer a", "Bearer b"}
+    assert budgets == {"Bearer a": 1, "Bearer b": 1}
+
+
+def test_rate_governor_adapts_concurrency_and_pacing():
+    import time
+
+    from impact.providers.github.governor import RateGovernor
+    from impact.providers.github.tokens import TokenPool
+
+    pool = TokenPool(["a"])
+    gov = RateGovernor(pool, max_concurrency=4)
+    ok = httpx.Response(200)
+    for _ in range(20):
+        gov.observe(ok)
+    assert gov.concurrency == 4
+    assert gov.reserve() == 0.0  # unknown budget: unpaced
+
+    gov.observe(httpx.Response(403, text="You have exceeded a secondary rate limit", headers={"Retry-After": "30"}))
+    assert gov.concurrency == 2
+    assert 29 < gov.reserve() <= 30
+
+    # Plenty of budget left: no pacing; low budget: spread the rest until reset.
+    gov = RateGovernor(pool, max_concurrency=4)
+    reset = int(time.time()) + 1000
+    pool.set_budget("a", 4000, reset, 5000)
+    assert gov.request_interval() == 0.0
+    pool.set_budget("a", 100, reset, 5000)
+    assert 10 < gov.request_interval() < 12
+    gov.observe(ok)
+    assert gov.concurrency == 1
+
+
+def test_rate_governor_async_slots_wake_on_release_without_polling():
+    from impact.providers.github.governor import RateGovernor
+
+    gov = RateGovernor(min_concurrency=2, max_concurrency=2)
+    gov.concurrency = 2
+    state = {"in_flight": 0, "peak": 0}
+
+    async def worker(release: asyncio.Event):
+        async with gov.async_slot():
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+            await release.wait()
+            state["in_flight"] -= 1
+
+    async def run():
+        release = asyncio.Event()
+        tasks = [asyncio.create_task(worker(release)) for _ in range(6)]
+        cancelled = asyncio.create_task(worker(release))
+        await asyncio.sleep(0.01)
+        # Two hold slots; the rest are parked on events, not spinning.
+        assert len(gov._async_waiters) == 5
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        assert len(gov._async_waiters) == 4
+        release.set()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+    assert state["peak"] == 2 and gov._in_flight == 0 and not gov._async_waiters
+
+
+def test_paginate_fetches_remaining_pages_concurrently_in_order():
+    import threading
+    import time
+
+    from impact.providers.github.client import GitHubClient
+
+    lock = threading.Lock()
+    state = {"in_flight": 0, "peak": 0, "per_page": set()}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        with lock:
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+            state["per_page"].add(request.url.params.get("per_page"))
+        page = int(request.url.params.get("page", "1"))
+        time.sleep(0.05 if page == 2 else 0.01)  # page 2 finishes last
+        with lock:
+            state["in_flight"] -= 1
+        base = "https://gh.test/repos/o/r/issues/1/timeline?per_page=100"
+        headers = {}
+        if page == 1:
+            headers["Link"] = f'<{base}&page=2>; rel="next", <{base}&page=4>; rel="last"'
+        return httpx.Response(200, json=[{"page": page, "i": i} for i in range(2)], headers=headers)
+
+    client = GitHubClient("t", base_url="https://gh.test", transport=httpx.MockTransport(handler))
+    items = list(client.paginate("/repos/o/r/issues/1/timeline"))
+    client.close()
+
+    assert [(it["page"], it["i"]) for it in items] == [(p, i) for p in range(1, 5) for i in range(2)]
+    assert state["per_page"] == {"100"}
+    assert state["peak"] > 1
+
+
+def test_search_discovery_splits_ranges_over_result_cap():
+    from datetime import datetime, timezone
+
+    from impact.providers.github.client import GitHubClient
+    from impact.providers.github.fetcher import GitHubFetcher
+
+    # PR n was updated on day n of January; each qualifier matches every PR.
+    def updated(n):
+        return datetime(2026, 1, n, 12, tzinfo=timezone.utc)
+
+    queries = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        q = request.url.params["q"]
+        queries.append(q)
+        lo, hi = q.split("updated:")[1].split("..")
+        lo = datetime.fromisoformat(lo.replace("Z", "+00:00"))
+        hi = datetime.fromisoformat(hi.replace("Z", "+00:00"))
+        hits = [n for n in range(1, 31) if lo <= updated(n) <= hi]
+        # Pretend each PR stands for 100 results so a wide range exceeds the 1000 cap.
+        total = len(hits) * 100
+        page = int(request.url.params["page"])
+        items = [{"number": n} for n in hits] if page == 1 else []
+        return httpx.Response(200, json={"total_count": total, "items": items})
+
+    client = GitHubClient("t", base_url="https://gh.test", transport=httpx.MockTransport(handler))
+    fetcher = GitHubFetcher(client)
+    found = fetcher.search_prs(
+        "o/r", "alice", datetime(2026, 1, 1, tzinfo=timezone.utc), datetime(2026, 1, 31, tzinfo=timezone.utc),
+        qualifiers=("reviewed-by",),
+    )
+    client.close()
+
+    assert [pr["number"] for pr in found] == list(range(1, 31))
+    assert all("repo:o/r is:pr reviewed-by:alice" in q for q in queries)
+    assert len(queries) > 1
+
+
+def test_search_rate_limit_retry_waits_for_the_reset(monkeypatch):
+    import time
+
+    from impact.providers.github.client import GitHubClient
+    from impact.providers.github.fetcher import GitHubFetcher
+
+    reset = time.time() + 120
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if len(calls) == 1:
+            return httpx.Response(
+                403,
+                text="API rate limit exceeded",
+                headers={
+                    "X-RateLimit-Resource": "search",
+                    "X-RateLimit-Remaining": "0",
+                    "X-RateLimit-Reset": str(int(reset)),
+                },
+            )
+        return httpx.Response(200, json={"total_count": 0, "items": []})
+
+    slept = []
+    monkeypatch.setattr(GitHubClient.get.retry, "sleep", slept.append)
+    client = GitHubClient("t", base_url="https://gh.test", transport=httpx.MockTransport(handler))
+    GitHubFetcher(client)._search_page("repo:o/r is:pr", 1)
+    client.close()
+
+    assert calls == ["/search/issues", "/search/issues"]
+    # Waited out the search window instead of the capped 1-30s backoff.
+    assert len(slept) == 1 and slept[0] > 100
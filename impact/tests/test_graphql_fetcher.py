@@ -0,0 +1,266 @@
+import json
+import re
+from collections import Counter
+
+import httpx
+
+from impact.adapters.github import GitHubAdapter
+from impact.domain.models import MetricContext
+from impact.ledger.ledger import Ledger
+from impact.metrics import get_metrics
+from impact.persistence.filesystem import FileSystemDumpWriter
+from impact.providers.github.client import GitHubClient
+from impact.providers.github.fake_server import FakeGitHubData, FakeGitHubServer
+from impact.providers.github.fetcher import GitHubFetcher
+from impact.providers.github.graphql import TIMELINE_EVENTS, GitHubGraphQLFetcher
+
+ALICE = {"login": "alice", "databaseId": 1, "avatarUrl": None, "__typename": "User"}
+BOB = {"login": "bob", "databaseId": 2, "avatarUrl": None, "__typename": "User"}
+ORG = {"login": "org", "databaseId": 9, "avatarUrl": None, "__typename": "Organization"}
+
+
+def _page(nodes, cursor=None):
+    return {"pageInfo": {"hasNextPage": cursor is not None, "endCursor": cursor}, "nodes": nodes}
+
+
+def _review(db_id, state, at):
+    return {"databaseId": db_id, "author": BOB, "body": "r", "state": state, "submittedAt": at}
+
+
+PR = {
+    "id": "PR_node",
+    "databaseId": 500,
+    "number": 5,
+    "title": "Add widgets",
+    "body": None,
+    "state": "MERGED",
+    "createdAt": "2026-01-02T00:00:00Z",
+    "updatedAt": "2026-01-04T00:00:00Z",
+    "closedAt": "2026-01-04T00:00:00Z",
+    "mergedAt": "2026-01-04T00:00:00Z",
+    "merged": True,
+    "mergeCommit": {"oid": "m1"},
+    "additions": 3,
+    "deletions": 1,
+    "changedFiles": 1,
+    "author": ALICE,
+    "mergedBy": BOB,
+    "baseRefName": "main",
+    "baseRefOid": "b1",
+    "headRefName": "feature",
+    "headRefOid": "h1",
+    "headRepositoryOwner": ALICE,
+    "baseRepository": {"databaseId": 77, "name": "widgets", "nameWithOwner": "org/widgets", "owner": ORG},
+    "totalCommits": {"totalCount": 1},
+    "totalComments": {"totalCount": 1},
+    "reviews": _page([_review(11, "CHANGES_REQUESTED", "2026-01-02T05:00:00Z")], cursor="c1"),
+    "reviewThreads": _page(
+        [
+            {
+                "id": "T1",
+                "comments": _page(
+                    [
+                        {
+                            "databaseId": 21,
+                            "author": BOB,
+                            "body": "nit",
+                            "createdAt": "2026-01-02T05:00:00Z",
+                            "updatedAt": None,
+                            "path": "w.py",
+                            "position": 3,
+                            "pullRequestReview": {"databaseId": 11},
+                            "replyTo": None,
+                        }
+                    ]
+                ),
+            }
+        ]
+    ),
+    "comments": _page([{"databaseId": 31, "author": None, "body": "hi", "createdAt": "2026-01-03T00:00:00Z", "updatedAt": None}]),
+    "commits": _page(
+        [
+            {
+                "commit": {
+                    "oid": "s1",
+                    "message": "wip",
+                    "author": {"name": "A", "email": "a@x", "date": "2026-01-03T01:00:00Z", "user": {"login": "alice", "databaseId": 1, "avatarUrl": None}},
+                    "committer": {"name": "A", "email": "a@x", "date": "2026-01-03T01:00:00Z", "user": {"login": "alice", "databaseId": 1, "avatarUrl": None}},
+                }
+            }
+        ]
+    ),
+    "files": _page([{"path": "w.py", "additions": 3, "deletions": 1, "changeType": "MODIFIED"}]),
+    "timelineItems": _page([{"__typename": "MergedEvent", "id": "ME_1", "createdAt": "2026-01-04T00:00:00Z", "actor": BOB}]),
+}
+
+
+def stub_graphql_server(queries):
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/graphql"
+        body = json.loads(request.content)
+        queries.append(body)
+        if "pr0: pullRequest(number: 5)" in body["query"]:
+            return httpx.Response(200, json={"data": {"repository": {"pr0": PR}}})
+        if 'reviews(first: 100, after: "c1")' in body["query"]:
+            assert body["variables"]["number"] == 5
+            page = _page([_review(12, "APPROVED", "2026-01-03T05:00:00Z")])
+            return httpx.Response(200, json={"data": {"repository": {"pullRequest": {"reviews": page}}}})
+        return httpx.Response(200, json={"errors": [{"message": "unexpected query"}]})
+
+    return handler
+
+
+def test_graphql_bundles_parse_like_rest_dumps(tmp_path):
+    queries = []
+    client = GitHubClient("t", base_url="https://gh.test", transport=httpx.MockTransport(stub_graphql_server(queries)))
+    fetcher = GitHubGraphQLFetcher(client)
+    bundles = list(fetcher.fetch_pr_bundles("org/widgets", [5]))
+    client.close()
+
+    assert len(queries) == 2  # one batched query plus one cursor page for reviews
+    bundle = bundles[0]
+    assert [r["id"] for r in bundle["reviews"]] == [11, 12]
+    assert bundle["issue_comments"][0]["user"]["login"] == "ghost"
+
+    writer = FileSystemDumpWriter(tmp_path)
+    writer.write_manifest(
+        {"provider": "github", "user": "bob", "from": "2026-01-01T00:00:00Z", "to": "2026-01-31T00:00:00Z"}
+    )
+    writer.write_pr_bundle(bundle)
+    parsed = GitHubAdapter().parse_dump(str(tmp_path))
+
+    pr = parsed.pull_requests[0]
+    assert (pr.number, pr.merged, pr.state.value, pr.repository.full_name) == (5, True, "closed", "org/widgets")
+    assert pr.merged_by.login == "bob"
+    assert [r.state.value for r in parsed.reviews] == ["changes_requested", "approved"]
+    assert [(t.event, t.actor.login, t.pull_request_number) for t in parsed.timeline] == [("merged", "bob", 5)]
+    assert parsed.timeline[0].id == bundle["timeline"][0]["id"] > 0
+    review_comment = next(c for c in parsed.comments if c.type.value == "review")
+    assert (review_comment.review_id, review_comment.path) == (11, "w.py")
+    assert [c.sha for c in parsed.commits] == ["s1"]
+    assert [(f.filename, f.status) for f in parsed.files] == [("w.py", "modified")]
+
+
+# ---------------------------
+# The same FakeGitHubData over GraphQL
+# ---------------------------
+def _actor(user):
+    if not user:
+        return None
+    return {"login": user["login"], "databaseId": user["id"], "avatarUrl": user.get("avatar_url"), "__typename": user.get("type", "User")}
+
+
+def _git_actor(date, user=None):
+    return {"name": None, "email": None, "date": date, "user": user and {"login": user["login"], "databaseId": user["id"], "avatarUrl": None}}
+
+
+def _timeline_node(event):
+    kind = event["event"]
+    if kind == "commented":
+        return {"__typename": "IssueComment", "id": f"IC_{event['id']}", "databaseId": event["id"], "author": _actor(event["user"]), "body": event["body"], "createdAt": event["created_at"]}
+    if kind == "reviewed":
+        return {
+            "__typename": "PullRequestReview", "id": f"PRR_{event['id']}", "databaseId": event["id"], "author": _actor(event["user"]),
+            "body": event["body"], "state": event["state"].upper(), "submittedAt": event["submitted_at"],
+        }
+    if kind == "committed":
+        commit = {"oid": event["sha"], "message": event["message"], "author": _git_actor(event["author"]["date"]), "committer": _git_actor(event["committer"]["date"])}
+        return {"__typename": "PullRequestCommit", "id": f"PRC_{event['sha']}", "commit": commit}
+    typename = next(t for t, e in TIMELINE_EVENTS.items() if e == kind)
+    return {"__typename": typename, "id": f"E_{event['id']}", "createdAt": event["created_at"], "actor": _actor(event["actor"])}
+
+
+def _graphql_pr(bundle):
+    """The GraphQL pullRequest node GitHub would serve for a REST-shaped FakeGitHubData bundle."""
+    pr = bundle["pull_request"]
+    repo = pr["base"]["repo"]
+    return {
+        "id": f"PR_{pr['id']}", "databaseId": pr["id"], "number": pr["number"], "title": pr["title"], "body": pr["body"],
+        "state": "MERGED" if pr["merged"] else pr["state"].upper(),
+        "createdAt": pr["created_at"], "updatedAt": pr["updated_at"], "closedAt": pr["closed_at"], "mergedAt": pr["merged_at"],
+        "merged": pr["merged"], "mergeCommit": {"oid": pr["merge_commit_sha"]},
+        "additions": pr["additions"], "deletions": pr["deletions"], "changedFiles": pr["changed_files"],
+        "author": _actor(pr["user"]), "mergedBy": _actor(pr["merged_by"]),
+        "baseRefName": pr["base"]["ref"], "baseRefOid": pr["base"]["sha"],
+        "headRefName": pr["head"]["ref"], "headRefOid": pr["head"]["sha"], "headRepositoryOwner": _actor(pr["head"]["user"]),
+        "baseRepository": {"databaseId": repo["id"], "name": repo["name"], "nameWithOwner": repo["full_name"], "owner": _actor(repo["owner"])},
+        "totalCommits": {"totalCount": pr["commits"]}, "totalComments": {"totalCount": pr["comments"]},
+        "reviews": _page([
+            {"databaseId": r["id"], "author": _actor(r["user"]), "body": r["body"], "state": r["state"], "submittedAt": r["submitted_at"]}
+            for r in bundle["reviews"]
+        ]),
+        "reviewThreads": _page([
+            {
+                "id": f"T_{c['id']}",
+                "comments": _page([{
+                    "databaseId": c["id"], "author": _actor(c["user"]), "body": c["body"], "createdAt": c["created_at"],
+                    "updatedAt": c["updated_at"], "path": c["path"], "position": c["position"], "pullRequestReview": None, "replyTo": None,
+                }]),
+            }
+            for c in bundle["review_comments"]
+        ]),
+        "comments": _page([
+            {"databaseId": c["id"], "author": _actor(c["user"]), "body": c["body"], "createdAt": c["created_at"], "updatedAt": c["updated_at"]}
+            for c in bundle["issue_comments"]
+        ]),
+        "commits": _page([
+            {"commit": {
+                "oid": c["sha"], "message": c["commit"]["message"],
+                "author": _git_actor(c["commit"]["author"]["date"], c["author"]), "committer": _git_actor(None, c["committer"]),
+            }}
+            for c in bundle["commits"]
+        ]),
+        "files": _page([
+            {"path": f["filename"], "additions": f["additions"], "deletions": f["deletions"], "changeType": f["status"].upper()}
+            for f in bundle["files"]
+        ]),
+        "timelineItems": _page([_timeline_node(e) for e in bundle["timeline"]]),
+    }
+
+
+def fake_graphql_server(data, repo):
+    def handler(request: httpx.Request) -> httpx.Response:
+        query = json.loads(request.content)["query"]
+        prs = {
+            alias: _graphql_pr(data.bundle(repo, int(number)))
+            for alias, number in re.findall(r"(pr\d+): pullRequest\(number: (\d+)\)", query)
+        }
+        return httpx.Response(200, json={"data": {"repository": prs}})
+
+    return handler
+
+
+def test_rest_and_graphql_dumps_of_the_same_prs_give_the_same_metrics(tmp_path):
+    repo = "acme/widgets"
+    data = FakeGitHubData.synthetic(repo, "dev0", prs=12, developers=4)
+    numbers = range(1, 13)
+    with FakeGitHubServer(data) as server:
+        client = GitHubClient("t", base_url=server.url)
+        rest = [GitHubFetcher(client).fetch_pr_bundle(repo, n) for n in numbers]
+        client.close()
+    client = GitHubClient("t", base_url="https://gh.test", transport=httpx.MockTransport(fake_graphql_server(data, repo)))
+    graphql = list(GitHubGraphQLFetcher(client, batch_size=5).fetch_pr_bundles(repo, numbers))
+    client.close()
+
+    bundles = {}
+    for name, fetched in (("rest", rest), ("graphql", graphql)):
+        writer = FileSystemDumpWriter(tmp_path / name)
+        writer.write_manifest({"user": "dev0", "from": "2025-01-01T00:00:00Z", "to": "2025-12-31T00:00:00Z"})
+        for bundle in fetched:
+            writer.write_pr_bundle(bundle)
+        bundles[name] = GitHubAdapter().parse_dump(str(tmp_path / name))
+
+    # The raw timelines hold the same events, comments, reviews and commits in REST's shape.
+    for r, g in zip(rest, graphql):
+        assert Counter(e["event"] for e in g["timeline"]) == Counter(e["event"] for e in r["timeline"])
+        for kind in ("commented", "reviewed", "committed"):
+            shapes = [{k for k in e if k != "node_id"} for e in g["timeline"] if e["event"] == kind]
+            assert shapes == [set(e) for e in r["timeline"] if e["event"] == kind]
+    assert {"commented", "reviewed"} <= {t.event for t in bundles["graphql"].timeline}
+
+    for metric_class in get_metrics().values():
+        details = [
+            metric_class().run(MetricContext(ledger=Ledger(bundles[name]), user_login="dev0")).details
+            for name in ("rest", "graphql")
+        ]
+        assert details[0] == details[1], metric_class.__name__
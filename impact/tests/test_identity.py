@@ -0,0 +1,35 @@
+import json
+import pickle
+
+import pytest
+
+from impact.adapters.github import GitHubAdapter
+from impact.domain.identity import denormalize_bundle, normalize_bundle
+from impact.exceptions import DataValidationError
+
+
+@pytest.mark.parametrize("trusted", [False, True])
+def test_adapter_shares_one_instance_per_user_and_repository(synthetic_dump, trusted):
+    bundle = GitHubAdapter(trusted=trusted).parse_dump(str(synthetic_dump().base_dir))
+    users = {u.id: u for u in bundle.users}
+    assert all(r.user is users[r.user.id] for r in bundle.reviews)
+    assert all(c.author is users[c.author.id] for c in bundle.commits)
+    assert all(pr.base.repo is pr.repository is bundle.repositories[0] for pr in bundle.pull_requests)
+    assert all(pr.user is users[pr.user.id] for pr in bundle.pull_requests)
+
+
+def test_normalized_bundle_writes_identities_once_and_round_trips(synthetic_dump):
+    bundle = GitHubAdapter(trusted=False).parse_dump(str(synthetic_dump().base_dir))
+    normalized = normalize_bundle(bundle)
+    assert len(normalized["users"]) == len({u["id"] for u in normalized["users"]})
+    assert all(isinstance(r["user"], int) for r in normalized["reviews"])
+
+    restored = denormalize_bundle(json.loads(json.dumps(normalized)))
+    assert restored.model_dump() == bundle.model_dump()
+    assert restored.reviews[0].user is next(u for u in restored.users if u.id == restored.reviews[0].user.id)
+    assert len(json.dumps(normalized)) < len(bundle.model_dump_json())
+    assert len(pickle.dumps(normalized)) < len(pickle.dumps(bundle.model_dump()))
+
+    normalized["reviews"][0]["user"] = -1
+    with pytest.raises(DataValidationError, match="unknown user"):
+        denormalize_bundle(normalized)
@@ -1,7 +1,25 @@
+import random
+import threading
+from datetime import datetime, timedelta, timezone
+
 import pytest
-from datetime import datetime, timezone
+
+from impact.adapters.github import GitHubAdapter
 from impact.ledger.ledger import Ledger
-from impact.domain.models import User, Repository, PullRequest, PullRequestState, ReviewRecord, ReviewState, Branch
+from impact.ledger.records import LedgerComment, LedgerReview
+from impact.metrics import get_metrics
+from impact.metrics.plugins.pr_throughput import PRThroughput
+from impact.domain.models import (
+    Branch,
+    CanonicalBundle,
+    MetricContext,
+    PullRequest,
+    PullRequestState,
+    Repository,
+    ReviewRecord,
+    ReviewState,
+    User,
+)
 
 
 def test_ledger_indexes():
@@ -29,7 +47,6 @@ def test_ledger_indexes():
     review2 = ReviewRecord(id=2, user=user, body="Review", state=ReviewState.APPROVED, submitted_at=datetime(2024, 12, 3, tzinfo=timezone.utc), pull_request_number=2)
     review3 = ReviewRecord(id=3, user=user, body="Review", state=ReviewState.APPROVED, submitted_at=datetime(2024, 12, 5, tzinfo=timezone.utc), pull_request_number=3)
 
-    from impact.domain.models import CanonicalBundle
     bundle = CanonicalBundle(
         users=[user, owner],
         repositories=[repo],
@@ -86,7 +103,6 @@ def test_ledger_time_filtering():
     review2 = ReviewRecord(id=2, user=user, body="Review", state=ReviewState.APPROVED, submitted_at=datetime(2024, 12, 3, tzinfo=timezone.utc), pull_request_number=2)
     review3 = ReviewRecord(id=3, user=user, body="Review", state=ReviewState.APPROVED, submitted_at=datetime(2024, 12, 5, tzinfo=timezone.utc), pull_request_number=3)
 
-    from impact.domain.models import CanonicalBundle
     bundle = CanonicalBundle(
         users=[user, owner],
         repositories=[repo],
@@ -108,3 +124,97 @@ def test_ledger_time_filtering():
 
     reviews = ledger.get_reviews_for_user('alice', start, end)
     assert len(reviews) == 3
+
+
+def test_compact_ledger_records_match_models_and_metrics(synthetic_dump):
+    bundle = GitHubAdapter().parse_dump(str(synthetic_dump(prs=30, developers=8).base_dir))
+
+    plain, compact = Ledger(bundle), Ledger(bundle, compact=True)
+    review = compact.get_reviews_for_user("dev0")[0]
+    assert isinstance(review, LedgerReview) and not hasattr(review, "__dict__")
+    assert review.to_model() == plain.get_reviews_for_user("dev0")[0]
+    assert all(r.user is review.user for r in compact.get_reviews_for_user("dev0"))
+    comments = [c for comments in compact.pr_comments.values() for c in comments]
+    assert comments and all(isinstance(c, LedgerComment) for c in comments)
+    with pytest.raises(AttributeError):
+        review.body = "edited"
+
+    for metric_class in get_metrics().values():
+        results = [
+            metric_class().run(MetricContext(ledger=ledger, user_login="dev0", start_date=None, end_date=None)).details
+            for ledger in (plain, compact)
+        ]
+        assert results[0] == results[1]
+
+
+def test_bisect_windows_match_linear_filters(synthetic_dump):
+    writer = synthetic_dump(developers=6, start="2024-01-01T00:00:00Z", end="2026-12-31T00:00:00Z")
+    bundle = GitHubAdapter().parse_dump(str(writer.base_dir))
+    ledger = Ledger(bundle)
+
+    def inside(ts, start, end):
+        return (start is None or ts >= start) and (end is None or ts <= end)
+
+    rng = random.Random(7)
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    logins = {pr.user.login for pr in bundle.pull_requests} | {r.user.login for r in bundle.reviews}
+    for _ in range(50):
+        start = base + timedelta(days=rng.randint(0, 300))
+        end = start + timedelta(days=rng.randint(0, 120))
+        if rng.random() < 0.3:
+            start = None
+        elif rng.random() < 0.3:
+            start = start.replace(tzinfo=None)  # naive bounds are read as the records' timezone
+        for login in logins:
+            prs = ledger.user_prs.get(login, [])
+            lo = start.replace(tzinfo=timezone.utc) if start and start.tzinfo is None else start
+            assert ledger.get_prs_for_user(login, start, end) == [p for p in prs if inside(p.created_at, lo, end)]
+            assert ledger.get_merged_prs_for_user(login, start, end) == [
+                p for p in prs if p.merged and p.merged_at and inside(p.merged_at, lo, end)
+            ]
+            assert ledger.get_reviews_for_user(login, start, end) == [
+                r for r in ledger.user_reviews.get(login, []) if inside(r.submitted_at, lo, end)
+            ]
+            assert ledger.get_commits_for_user(login, start, end) == [
+                c for c in ledger.user_commits.get(login, []) if inside(c.date, lo, end)
+            ]
+
+
+def test_indexes_are_built_lazily_once_and_can_be_warmed(monkeypatch):
+    user = User(id=1, login="alice")
+    repo = Repository(id=1, name="repo", full_name="org/repo", owner=User(id=2, login="org"))
+    branch = Branch(label="b", ref="main", sha="s", user=user, repo=repo)
+    prs = [
+        PullRequest(
+            id=i, number=i, title=f"PR {i}", state=PullRequestState.CLOSED, user=user,
+            created_at=datetime(2024, 12, i, tzinfo=timezone.utc), merged_at=datetime(2024, 12, i + 1, tzinfo=timezone.utc),
+            merged=True, repository=repo, base=branch, head=branch, commits=1, additions=1, deletions=0,
+            changed_files=1, comments=0, review_comments=0,
+        )
+        for i in range(1, 5)
+    ]
+    bundle = CanonicalBundle(users=[user], repositories=[repo], pull_requests=prs, commits=[], reviews=[], comments=[], files=[], timeline=[])
+
+    ledger = Ledger(bundle)
+    assert ledger.index_build_seconds == {}
+    PRThroughput().run(MetricContext(ledger=ledger, user_login="alice"))
+    assert "_build_pr_reviews" not in ledger.index_build_seconds
+    assert "_build_pr_timeline" not in ledger.index_build_seconds
+    assert "_build_user_prs" in ledger.index_build_seconds
+
+    calls = []
+    real = Ledger._build_pr_reviews
+    monkeypatch.setattr(Ledger, "_build_pr_reviews", lambda self: calls.append(1) or real(self))
+    fresh = Ledger(bundle)
+    threads = [threading.Thread(target=fresh.get_reviews_for_pr, args=(1,)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert calls == [1]
+
+    timings = fresh.warm()
+    assert set(timings) == set(Ledger._BUILDERS.values())
+    assert len(fresh.get_merged_prs_for_user("alice", datetime(2024, 12, 3, tzinfo=timezone.utc))) == 3
+    with pytest.raises(ValueError, match="Unknown ledger index"):
+        fresh.warm(["nope"])